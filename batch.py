@@ -0,0 +1,293 @@
+"""
+Модуль для пакетного сбора и анализа данных с hh.ru без графического интерфейса.
+
+Читает файл заданий со списком пар (запрос, город), выполняет поиск по всем
+заданиям параллельно, затем для каждого задания строит стандартные графики
+(без вывода на экран, backend Agg, в пуле процессов) и текстовые отчеты. Результаты каждого
+задания сохраняются в отдельную директорию:
+<output>/<номер>_<запрос>_<город>/{data, graphics, output}.
+
+Количество одновременных запросов к API ограничено общим для всех заданий
+лимитом; дополнительно можно ограничить общее количество запросов.
+
+Формат файла заданий:
+- JSON: список объектов {"query": "...", "city": "...", "count": 100, "incremental": true};
+- текстовый файл: по одному заданию в строке в виде "запрос;город".
+
+Пример запуска:
+python batch.py jobs.json --output batch_output --jobs 4 --max-requests 8
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib
+matplotlib.use('Agg')
+from tabulate import tabulate
+import library.parser
+import library.graph_generator
+import library.chart_renderer
+import library.chart_data
+import library.text_report_generator
+import library.hh_client
+from scripts.config import read_config
+
+
+class RequestBudgetExceeded(Exception):
+    """
+    Исключение, которое возникает, когда исчерпан общий лимит запросов.
+
+    Автор:
+    - Глинник Егор
+    """
+
+
+class RequestBudget:
+    """
+    Общий для всех заданий лимит запросов к API.
+
+    Входные данные:
+    - max_in_flight: Максимальное количество одновременных запросов.
+    - max_total: Максимальное общее количество запросов (None - без ограничения).
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, max_in_flight, max_total=None):
+        self.semaphore = threading.BoundedSemaphore(max_in_flight)
+        self.max_total = max_total
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def session(self):
+        """
+        Создает HTTP-сессию, запросы которой учитываются в лимите.
+        """
+        session = library.parser.create_session()
+        send = session.request
+
+        def request(*args, **kwargs):
+            with self.lock:
+                if self.max_total is not None and self.used >= self.max_total:
+                    raise RequestBudgetExceeded("Исчерпан общий лимит запросов")
+                self.used += 1
+            with self.semaphore:
+                return send(*args, **kwargs)
+
+        session.request = request
+        return session
+
+
+def read_jobs(path):
+    """
+    Читает файл заданий.
+
+    Входные данные:
+    - path: Путь к файлу заданий (JSON или текстовый файл "запрос;город").
+
+    Выходные данные:
+    - Список словарей с ключами query, city и, возможно, count.
+
+    Автор:
+    - Глинник Егор
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            jobs = json.load(f)
+        else:
+            jobs = []
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    query, _, city = line.partition(';')
+                    jobs.append({"query": query.strip(), "city": city.strip()})
+    for job in jobs:
+        job.setdefault("city", "")
+    return jobs
+
+
+def job_directory(output, number, job):
+    """
+    Возвращает директорию для результатов задания.
+
+    Входные данные:
+    - output: Общая директория результатов.
+    - number: Порядковый номер задания.
+    - job: Словарь задания.
+
+    Выходные данные:
+    - Путь к директории задания.
+
+    Автор:
+    - Глинник Егор
+    """
+    name = f"{number:03d}_{job['query']}_{job['city'] or 'все'}"
+    return os.path.join(output, re.sub(r'[^\w\-]+', '_', name))
+
+
+def crawl(job, directory, budget, search_options):
+    """
+    Выполняет поиск по заданию и сохраняет данные в директорию задания.
+
+    Входные данные:
+    - job: Словарь задания.
+    - directory: Директория задания.
+    - budget: Объект RequestBudget.
+    - search_options: Параметры library.parser.main по умолчанию.
+
+    Выходные данные:
+    - Словарь с результатами поиска и временем выполнения.
+
+    Автор:
+    - Глинник Егор
+    """
+    options = dict(search_options)
+    if "count" in job:
+        options["target_count"] = job["count"]
+    if "incremental" in job:
+        options["incremental"] = job["incremental"]
+    if "enrich" in job:
+        options["enrich"] = job["enrich"]
+    start = time.perf_counter()
+    with budget.session() as session:
+        grades, posts = library.parser.main(
+            job["query"], job["city"], data_dir=os.path.join(directory, 'data'),
+            session=session, **options
+        )
+    return {"grades": grades, "posts": posts, "crawl": time.perf_counter() - start}
+
+
+def render(job, directory, result):
+    """
+    Строит графики и текстовые отчеты по данным задания.
+
+    Входные данные:
+    - job: Словарь задания.
+    - directory: Директория задания.
+    - result: Результат crawl; в него добавляются время построения
+      графиков и отчетов и количество вакансий.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    data_dir = os.path.join(directory, 'data')
+    graphics_dir = os.path.join(directory, 'graphics')
+    reports_dir = os.path.join(directory, 'output')
+
+    start = time.perf_counter()
+    df = library.graph_generator.main(data_dir, graphics_dir)
+    library.chart_renderer.render_all(
+        df, job["query"], result["grades"], result["posts"], directory=graphics_dir
+    )
+    result["charts"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for generate in (library.text_report_generator.generate_vacancy_reports,
+                     library.text_report_generator.generate_pivot_table_report,
+                     library.text_report_generator.generate_statistical_report):
+        generate(data_dir, reports_dir, open_report=False)
+    library.text_report_generator.generate_history_report(
+        data_dir, reports_dir, open_report=False, query=job["query"]
+    )
+    result["reports"] = time.perf_counter() - start
+    result["rows"] = len(df)
+
+
+def main():
+    """
+    Разбирает аргументы командной строки и выполняет все задания.
+
+    Поиск выполняется параллельно в пуле потоков; графики каждого задания
+    строятся параллельно в пуле процессов (library.chart_renderer), так как
+    matplotlib не рассчитан на одновременное построение графиков из разных
+    потоков.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    config = read_config(os.path.join(os.path.dirname(__file__), 'scripts', 'config.ini'))
+    arg_parser = argparse.ArgumentParser(description="Пакетный сбор и анализ данных с hh.ru")
+    arg_parser.add_argument("jobs", help="файл заданий (JSON или 'запрос;город' по строкам)")
+    arg_parser.add_argument("--output", default="batch_output", help="директория результатов")
+    arg_parser.add_argument("--jobs", dest="workers", type=int, default=4,
+                            help="количество одновременно выполняемых заданий")
+    arg_parser.add_argument("--max-requests", type=int, default=8,
+                            help="общий лимит одновременных запросов к API")
+    arg_parser.add_argument("--request-budget", type=int, default=None,
+                            help="общий лимит количества запросов к API")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="дополнять сохраненные данные только новыми вакансиями")
+    arg_parser.add_argument("--enrich", action="store_true",
+                            help="загружать ключевые навыки и описания вакансий")
+    args = arg_parser.parse_args()
+
+    search_options = {
+        "target_count": config.getint('Search', 'count', fallback=100),
+        "per_page": config.getint('Search', 'per_page', fallback=100),
+        "max_depth": config.getint('Search', 'max_depth', fallback=2000),
+        "incremental": args.incremental
+        or config.getboolean('Search', 'incremental', fallback=False),
+        "enrich": args.enrich or config.getboolean('Search', 'enrich', fallback=False),
+    }
+    library.hh_client.configure(
+        rate=config.getfloat('Client', 'rate', fallback=None),
+        burst=config.getint('Client', 'burst', fallback=None),
+        max_concurrency=config.getint('Client', 'max_concurrency', fallback=None),
+        connect_timeout=config.getfloat('Client', 'connect_timeout', fallback=None),
+        read_timeout=config.getfloat('Client', 'read_timeout', fallback=None),
+        max_retries=config.getint('Client', 'max_retries', fallback=None)
+    )
+    if config.has_option('Charts', 'salary_bins'):
+        library.chart_data.configure(
+            salary_edges=library.chart_data.parse_edges(config.get('Charts', 'salary_bins'))
+        )
+    budget = RequestBudget(args.max_requests, args.request_budget)
+    jobs = read_jobs(args.jobs)
+    directories = [job_directory(args.output, number, job)
+                   for number, job in enumerate(jobs, 1)]
+
+    total_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(crawl, job, directory, budget, search_options)
+                   for job, directory in zip(jobs, directories)]
+
+    summary = []
+    for job, directory, future in zip(jobs, directories, futures):
+        row = [job["query"], job["city"] or "-"]
+        try:
+            result = future.result()
+            render(job, directory, result)
+        except Exception as e:
+            summary.append(row + ["-", "-", "-", "-", f"ошибка: {e}"])
+            continue
+        summary.append(row + [
+            result["rows"], f"{result['crawl']:.2f}", f"{result['charts']:.2f}",
+            f"{result['reports']:.2f}", directory
+        ])
+
+    print(tabulate(summary, headers=[
+        "Запрос", "Город", "Вакансий", "Поиск, с", "Графики, с", "Отчеты, с", "Результаты"
+    ], tablefmt="pretty"))
+    library.chart_renderer.shutdown()
+    print(f"Всего: {time.perf_counter() - total_start:.2f} с, запросов к API: {budget.used}")
+
+
+if __name__ == "__main__":
+    main()
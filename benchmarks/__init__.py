@@ -0,0 +1,6 @@
+"""
+Замеры производительности сбора и анализа данных с hh.ru.
+
+Автор:
+- Глинник Егор
+"""
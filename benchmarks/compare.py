@@ -0,0 +1,113 @@
+"""
+Сравнение двух результатов замеров производительности (benchmarks.run).
+
+Для каждого замера, который есть в обоих файлах, выводятся медианы
+времени и их отношение. Замеры, которые стали медленнее больше чем на
+заданный порог, отмечаются; с флагом --fail программа завершается с
+кодом 1, если такие замеры есть (для проверки в CI).
+
+Функции:
+- load_results(path): Загружает результаты замеров.
+- compare(baseline, current, threshold): Сравнивает результаты замеров.
+- main(): Разбирает аргументы командной строки и выводит таблицу сравнения.
+
+Пример запуска:
+python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+
+Автор:
+- Глинник Егор
+"""
+
+import sys
+import json
+import argparse
+from tabulate import tabulate
+
+
+def load_results(path):
+    """
+    Загружает результаты замеров.
+
+    Входные данные:
+    - path: Путь к JSON-файлу benchmarks.run.
+
+    Выходные данные:
+    - Словарь с полями meta и results.
+
+    Автор:
+    - Глинник Егор
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Сравнивает результаты замеров.
+
+    Входные данные:
+    - baseline: Результаты базового запуска.
+    - current: Результаты нового запуска.
+    - threshold: Допустимое относительное замедление (0.2 - на 20%).
+
+    Выходные данные:
+    - rows: Строки таблицы [замер, было, стало, отношение, оценка].
+    - regressions: Список замеров, которые стали медленнее больше чем на threshold.
+
+    Автор:
+    - Глинник Егор
+    """
+    rows = []
+    regressions = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None:
+            continue
+        ratio = new["median"] / old["median"] if old["median"] else float('inf')
+        if ratio > 1 + threshold:
+            verdict = "медленнее"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            verdict = "быстрее"
+        else:
+            verdict = "без изменений"
+        rows.append([name, f"{old['median']:.3f}", f"{new['median']:.3f}",
+                     f"{ratio:.2f}", verdict])
+    return rows, regressions
+
+
+def main():
+    """
+    Разбирает аргументы командной строки и выводит таблицу сравнения.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    arg_parser = argparse.ArgumentParser(description="Сравнение результатов замеров")
+    arg_parser.add_argument("baseline", help="файл результатов базового запуска")
+    arg_parser.add_argument("current", help="файл результатов нового запуска")
+    arg_parser.add_argument("--threshold", type=float, default=0.2,
+                            help="допустимое относительное замедление")
+    arg_parser.add_argument("--fail", action="store_true",
+                            help="завершиться с кодом 1 при замедлении")
+    args = arg_parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"Было: {baseline['meta'].get('commit')} ({baseline['meta'].get('date')}), "
+          f"стало: {current['meta'].get('commit')} ({current['meta'].get('date')})")
+    print(tabulate(rows, headers=["Замер", "Было, с", "Стало, с", "Отношение", "Оценка"],
+                   tablefmt="pretty"))
+    if regressions and args.fail:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
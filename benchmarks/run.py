@@ -0,0 +1,308 @@
+"""
+Замеры производительности поиска, построения графиков и текстовых отчетов.
+
+Поиск выполняется через локальный заменитель API (benchmarks.stub_server),
+поэтому замеры не зависят от сети и от текущей выдачи hh.ru. Дисковый кэш
+ответов API и кэш графиков на время замеров отключаются. Каждая операция
+выполняется несколько раз; в результатах сохраняются все замеры, минимум
+и медиана. Результаты записываются в JSON-файл, который можно сравнить с
+другим запуском (benchmarks.compare).
+
+Замеряются:
+- pipeline: полный поиск (library.parser.main) с записью файлов;
+- dataset.load: чтение сохраненной таблицы и ее размер в памяти (memory_bytes);
+- chart.*: каждый стандартный и пользовательский график (без вывода на экран);
+- report.*: каждый текстовый отчет (без открытия в редакторе).
+
+Функции:
+- measure(func, repeat): Замеряет время выполнения функции.
+- bench_pipeline(server_options, search_options, data_dir, repeat): Замеряет поиск.
+- bench_charts(data_dir, query, directory, repeat): Замеряет построение графиков.
+- bench_reports(data_dir, directory, repeat): Замеряет построение текстовых отчетов.
+- run(args): Выполняет все замеры и возвращает результаты.
+- main(): Разбирает аргументы командной строки и сохраняет результаты.
+
+Пример запуска:
+python -m benchmarks.run --repeat 5 --latency 0.05 --pages 20 --count 1000
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+import matplotlib
+matplotlib.use('Agg')
+from library import areas
+from library import parser
+from library import dataset
+from library import classifier
+from library import http_cache
+from library import chart_cache
+from library import graph_generator
+from library import user_graph
+from library import text_report_generator
+from benchmarks import stub_server
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+USER_CHARTS = [
+    ('Зарплата', 'Опыт работы', 'Столбчатая диаграмма'),
+    ('Зарплата', 'Опыт работы', 'Категоризированная гистограмма'),
+    ('Зарплата', 'Тип занятости', 'Диаграмма Бокса-Вискера'),
+    ('Опыт работы', 'График работы', 'Диаграмма рассеивания'),
+]
+
+
+def measure(func, repeat):
+    """
+    Замеряет время выполнения функции.
+
+    Входные данные:
+    - func: Функция без аргументов.
+    - repeat: Количество запусков.
+
+    Выходные данные:
+    - Словарь с полями runs (время каждого запуска в секундах), min, median
+      и result (результат последнего запуска).
+
+    Автор:
+    - Глинник Егор
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        runs.append(time.perf_counter() - start)
+    return {"runs": runs, "min": min(runs), "median": statistics.median(runs), "result": result}
+
+
+def bench_pipeline(server_options, search_options, data_dir, repeat):
+    """
+    Замеряет полный поиск через локальный заменитель API.
+
+    Входные данные:
+    - server_options: Настройки заменителя API (см. stub_server.DEFAULT_OPTIONS).
+    - search_options: Параметры library.parser.main (query, query_city, target_count, ...).
+    - data_dir: Директория для сохранения данных.
+    - repeat: Количество запусков.
+
+    Выходные данные:
+    - Словарь с результатами замера, количеством строк и запросов к серверу.
+
+    Автор:
+    - Глинник Егор
+    """
+    server, base_url = stub_server.start_server(**server_options)
+    saved_urls = parser.API_URL, areas.AREAS_URL
+    parser.API_URL = base_url + "/vacancies"
+    areas.AREAS_URL = base_url + "/areas"
+    try:
+        result = measure(lambda: parser.main(data_dir=data_dir, **search_options), repeat)
+    finally:
+        parser.API_URL, areas.AREAS_URL = saved_urls
+        server.shutdown()
+    result["rows"] = len(dataset.load_dataset(data_dir))
+    result["requests"] = server.requests / repeat
+    return result
+
+
+def bench_charts(data_dir, query, directory, repeat):
+    """
+    Замеряет построение каждого графика.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - query: Поисковый запрос (для графика требований).
+    - directory: Директория для сохранения графиков.
+    - repeat: Количество запусков.
+
+    Выходные данные:
+    - Словарь {название замера: результаты}.
+
+    Автор:
+    - Глинник Егор
+    """
+    df = dataset.get_dataset(data_dir)
+    grades, posts = classifier.classify_dataset(df)
+    charts = {
+        "salary": lambda: graph_generator.create_salary_vs_vacancies_plot(
+            df, directory, show=False),
+        "experience": lambda: graph_generator.create_experience_vs_vacancies_plot(
+            df, directory, show=False),
+        "employment_type": lambda: graph_generator.create_employment_type_vs_vacancies_plot(
+            df, directory, show=False),
+        "requirements": lambda: graph_generator.create_requirements_vs_vacancies_plot(
+            df, query.lower(), directory, show=False),
+        "level": lambda: graph_generator.create_level_vs_vacancies_plot(
+            grades, directory, show=False),
+        "specialty": lambda: graph_generator.create_specialty_vs_vacancies_plot(
+            posts, directory, show=False),
+    }
+    for col1, col2, plot_type in USER_CHARTS:
+        charts[f"user.{plot_type}"] = (
+            lambda col1=col1, col2=col2, plot_type=plot_type: user_graph.main(
+                col1, col2, plot_type, data_dir, directory, show=False)
+        )
+    return {f"chart.{name}": measure(func, repeat) for name, func in charts.items()}
+
+
+def bench_reports(data_dir, directory, repeat):
+    """
+    Замеряет построение каждого текстового отчета.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - directory: Директория для сохранения отчетов.
+    - repeat: Количество запусков.
+
+    Выходные данные:
+    - Словарь {название замера: результаты}.
+
+    Автор:
+    - Глинник Егор
+    """
+    reports = {
+        "vacancies": text_report_generator.generate_vacancy_reports,
+        "pivot_table": text_report_generator.generate_pivot_table_report,
+        "statistical": text_report_generator.generate_statistical_report,
+        "history": text_report_generator.generate_history_report,
+    }
+    return {
+        f"report.{name}": measure(
+            lambda generate=generate: generate(data_dir, directory, open_report=False), repeat
+        )
+        for name, generate in reports.items()
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(__file__), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """
+    Выполняет все замеры.
+
+    Входные данные:
+    - args: Аргументы командной строки (см. main).
+
+    Выходные данные:
+    - Словарь с описанием запуска (meta) и результатами замеров (results).
+
+    Автор:
+    - Глинник Егор
+    """
+    server_options = {
+        "pages": args.pages, "latency": args.latency, "error_rate": args.error_rate,
+        "seed": args.seed,
+        "fixtures": stub_server.load_fixtures(args.fixtures) if args.fixtures else None,
+    }
+    search_options = {
+        "query": args.query, "query_city": args.city, "target_count": args.count,
+        "per_page": args.per_page,
+    }
+    work_dir = tempfile.mkdtemp(prefix='py_ds_hh_bench_')
+    http_cache.configure(ttl=0)
+    chart_cache.configure(max_size=0, directory=os.path.join(work_dir, 'chart_cache'))
+    data_dir = os.path.join(work_dir, 'data')
+    graphics_dir = os.path.join(work_dir, 'graphics')
+    reports_dir = os.path.join(work_dir, 'output')
+    os.makedirs(graphics_dir)
+    results = {}
+    try:
+        results["pipeline"] = bench_pipeline(server_options, search_options, data_dir,
+                                             args.repeat)
+        results["dataset.load"] = measure(lambda: dataset.load_dataset(data_dir), args.repeat)
+        # Размер таблицы в памяти с типами library.schema
+        results["dataset.load"]["memory_bytes"] = int(
+            results["dataset.load"]["result"].memory_usage(deep=True).sum())
+        results.update(bench_charts(data_dir, args.query, graphics_dir, args.repeat))
+        results.update(bench_reports(data_dir, reports_dir, args.repeat))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        dataset.invalidate(data_dir)
+
+    for result in results.values():
+        result.pop("result", None)
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec='seconds'),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "server": {k: v for k, v in server_options.items() if k != "fixtures"},
+            "fixtures": args.fixtures,
+            "search": search_options,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main():
+    """
+    Разбирает аргументы командной строки, выполняет замеры и сохраняет результаты.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    arg_parser = argparse.ArgumentParser(description="Замеры производительности py_ds_hh")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="количество запусков")
+    arg_parser.add_argument("--query", default="python")
+    arg_parser.add_argument("--city", default="")
+    arg_parser.add_argument("--count", type=int, default=1000,
+                            help="количество собираемых вакансий")
+    arg_parser.add_argument("--per-page", type=int, default=100)
+    arg_parser.add_argument("--pages", type=int, default=20,
+                            help="количество страниц на заменителе API")
+    arg_parser.add_argument("--latency", type=float, default=0.05,
+                            help="задержка ответа заменителя API, с")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0,
+                            help="доля ошибочных ответов заменителя API")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--fixtures", default=None,
+                            help="директория с записанными страницами API")
+    arg_parser.add_argument("--output", default=None,
+                            help="файл результатов (по умолчанию benchmarks/results/<дата>.json)")
+    args = arg_parser.parse_args()
+
+    report = run(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.now().strftime('%Y%m%d_%H%M%S') + '.json'
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    width = max(len(name) for name in report["results"])
+    for name, result in report["results"].items():
+        print(f"{name:<{width}}  медиана {result['median']:.3f} с  минимум {result['min']:.3f} с")
+    print(f"Результаты сохранены: {output}")
+
+
+if __name__ == "__main__":
+    main()
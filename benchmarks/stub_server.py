@@ -0,0 +1,391 @@
+"""
+Локальный заменитель API hh.ru для замеров производительности без сети.
+
+Сервер отвечает на запросы /vacancies (страницы результатов поиска),
+/vacancies/<id> (подробные сведения о вакансии, с ETag и ответом 304)
+и /areas (справочник регионов). Страницы берутся из записанных ранее файлов
+(fixtures) или генерируются детерминированно по номеру страницы. Задержка
+ответа, доля ошибочных ответов и количество страниц настраиваются, поэтому
+можно воспроизводимо сравнивать скорость поиска между версиями программы.
+
+Программа подключается к серверу через переменную окружения HH_API_URL
+(см. library.areas), например:
+HH_API_URL=http://127.0.0.1:8765 python main.py
+
+Функции:
+- synthetic_page(page, per_page, pages, params, seed, new_pages): Генерирует страницу результатов поиска.
+- synthetic_vacancy(vacancy_id, seed): Генерирует подробные сведения о вакансии.
+- load_fixtures(directory): Загружает записанные страницы.
+- start_server(host, port, **options): Запускает сервер в фоновом потоке.
+- record_fixtures(query, pages, directory, per_page): Записывает страницы реального API.
+- main(): Запускает сервер или запись страниц из командной строки.
+
+Пример запуска:
+python -m benchmarks.stub_server serve --port 8765 --latency 0.2 --error-rate 0.05
+python -m benchmarks.stub_server record python --pages 5
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import requests
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+DEFAULT_OPTIONS = {
+    # Количество страниц в выдаче
+    "pages": 20,
+    # Количество страниц вакансий, "опубликованных" после запуска сервера:
+    # они добавляются в начало выдачи, остальные вакансии не меняются
+    "new_pages": 0,
+    # Задержка ответа в секундах
+    "latency": 0.05,
+    # Доля ответов с ошибкой (от 0 до 1)
+    "error_rate": 0.0,
+    # Код ответа с ошибкой
+    "error_status": 503,
+    # Значение заголовка Retry-After для ошибочных ответов (None - без заголовка)
+    "retry_after": None,
+    # Записанные страницы {номер страницы: JSON} (None - генерировать страницы)
+    "fixtures": None,
+    "seed": 0,
+}
+
+AREAS = [{
+    "id": "113", "name": "Россия", "areas": [
+        {"id": "1", "name": "Москва", "areas": []},
+        {"id": "2", "name": "Санкт-Петербург", "areas": []},
+        {"id": "88", "name": "Казань", "areas": []},
+        {"id": "4", "name": "Новосибирск", "areas": []},
+    ]
+}]
+CITIES = {area["id"]: area["name"] for area in AREAS[0]["areas"]}
+
+# Время публикации вакансий первой страницы; каждая следующая страница на час старше
+BASE_PUBLISHED = datetime(2024, 6, 1, 10, 0, 0, tzinfo=timezone(timedelta(hours=3)))
+PUBLISHED_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+TITLES = [
+    "Junior Python developer", "Middle Backend разработчик", "Senior Java engineer",
+    "QA инженер по тестированию", "Аналитик данных", "Frontend developer (React)",
+    "Android разработчик", "Data Scientist", "Lead DevOps engineer", "Стажер-программист",
+]
+REQUIREMENTS = [
+    "Знание Python, SQL, Django и Docker", "Опыт работы с Linux, Git и PostgreSQL",
+    "JavaScript, TypeScript, React, HTML, CSS", "Java, Spring, Kafka, Kubernetes",
+    "Pandas, NumPy, Machine Learning, Statistics", "Kotlin, Swift, Flutter", None,
+]
+EMPLOYERS = ["Яндекс", "Сбер", "VK", "Тинькофф", "Ozon", "Авито"]
+EXPERIENCE = ["Нет опыта", "От 1 года до 3 лет", "От 3 до 6 лет", "Более 6 лет"]
+EMPLOYMENT = ["Полная занятость", "Частичная занятость", "Стажировка", "Проектная работа"]
+SCHEDULE = ["Полный день", "Удаленная работа", "Гибкий график", "Сменный график"]
+SKILLS = [
+    "Python", "SQL", "Django", "Docker", "Linux", "Git", "PostgreSQL", "JavaScript",
+    "TypeScript", "React", "Java", "Spring", "Kafka", "Kubernetes", "Pandas", "NumPy",
+    "Kotlin", "Swift", "Flutter", "Redis", "FastAPI", "CI/CD",
+]
+
+
+def synthetic_page(page, per_page, pages, params=None, seed=0, new_pages=0):
+    """
+    Генерирует страницу результатов поиска.
+
+    Содержимое страницы зависит только от ее номера, размера и seed,
+    поэтому повторные запуски получают одинаковые данные. Вакансии
+    отсортированы по времени публикации, новые - первыми.
+
+    Входные данные:
+    - page: Номер страницы.
+    - per_page: Количество вакансий на странице.
+    - pages: Количество страниц в выдаче.
+    - params: Параметры запроса (учитываются area, only_with_salary и date_from).
+    - seed: Начальное значение генератора случайных чисел.
+    - new_pages: Количество страниц новых вакансий перед основной выдачей.
+
+    Выходные данные:
+    - Словарь в формате ответа /vacancies.
+
+    Автор:
+    - Глинник Егор
+    """
+    params = params or {}
+    total_pages = pages + new_pages
+    if params.get("date_from"):
+        date_from = datetime.strptime(params["date_from"], PUBLISHED_FORMAT)
+        newer = (BASE_PUBLISHED - date_from) // timedelta(hours=1) + 1
+        total_pages = max(0, min(total_pages, newer + new_pages))
+    # Номер страницы в исходной выдаче (у новых страниц - отрицательный)
+    virtual_page = page - new_pages
+    published_at = (BASE_PUBLISHED - timedelta(hours=virtual_page)).strftime(PUBLISHED_FORMAT)
+    rng = random.Random(seed * 100003 + virtual_page)
+    area = params.get("area", "113")
+    items = []
+    if page < total_pages:
+        for number in range(per_page):
+            salary = None
+            if params.get("only_with_salary") or rng.random() < 0.6:
+                salary = {"from": rng.randint(3, 40) * 10000, "to": None, "currency": "RUR"}
+            city_id = area if area in CITIES else rng.choice(list(CITIES))
+            items.append({
+                "id": str((virtual_page + 10000) * per_page + number + 1),
+                "name": rng.choice(TITLES),
+                "area": {"id": city_id, "name": CITIES[city_id]},
+                "salary": salary,
+                "employer": {"name": rng.choice(EMPLOYERS)},
+                "experience": {"name": rng.choice(EXPERIENCE)},
+                "snippet": {"requirement": rng.choice(REQUIREMENTS)},
+                "employment": {"name": rng.choice(EMPLOYMENT)},
+                "has_test": rng.random() < 0.2,
+                "schedule": {"name": rng.choice(SCHEDULE)},
+                "published_at": published_at,
+            })
+    return {
+        "items": items, "found": total_pages * per_page, "pages": total_pages,
+        "page": page, "per_page": per_page,
+    }
+
+
+def synthetic_vacancy(vacancy_id, seed=0):
+    """
+    Генерирует подробные сведения о вакансии.
+
+    Содержимое зависит только от идентификатора вакансии и seed.
+
+    Входные данные:
+    - vacancy_id: Идентификатор вакансии.
+    - seed: Начальное значение генератора случайных чисел.
+
+    Выходные данные:
+    - Словарь в формате ответа /vacancies/<id>.
+
+    Автор:
+    - Глинник Егор
+    """
+    rng = random.Random(f"{seed}:{vacancy_id}")
+    skills = rng.sample(SKILLS, rng.randint(0, 6))
+    salary_from = rng.randint(3, 40) * 10000
+    paragraphs = [rng.choice([text for text in REQUIREMENTS if text]) for _ in range(3)]
+    return {
+        "id": str(vacancy_id),
+        "name": rng.choice(TITLES),
+        "key_skills": [{"name": skill} for skill in skills],
+        "description": "".join(f"<p><strong>Требования:</strong> {text} &amp; опыт</p>"
+                               for text in paragraphs),
+        "salary": {"from": salary_from, "to": salary_from + rng.randint(0, 20) * 10000,
+                   "currency": rng.choice(["RUR", "RUR", "RUR", "USD"])},
+    }
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """
+    Загружает записанные страницы результатов поиска.
+
+    Входные данные:
+    - directory: Директория с файлами page_<номер>.json.
+
+    Выходные данные:
+    - Словарь {номер страницы: JSON-ответ}.
+
+    Автор:
+    - Глинник Егор
+    """
+    fixtures = {}
+    for name in os.listdir(directory):
+        match = re.fullmatch(r'page_(\d+)\.json', name)
+        if match:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                fixtures[int(match.group(1))] = json.load(f)
+    return fixtures
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов локального заменителя API.
+
+    Настройки берутся из атрибута options сервера (см. DEFAULT_OPTIONS).
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        options = self.server.options
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        time.sleep(options["latency"])
+        with self.server.lock:
+            self.server.requests += 1
+            failed = self.server.rng.random() < options["error_rate"]
+
+        if failed:
+            headers = {}
+            if options["retry_after"] is not None:
+                headers["Retry-After"] = str(options["retry_after"])
+            self._send_json(options["error_status"],
+                            {"errors": [{"type": "stub_error"}]}, headers)
+        elif url.path.rstrip('/') == '/areas':
+            self._send_json(200, AREAS)
+        elif re.fullmatch(r'/vacancies/\d+', url.path.rstrip('/')):
+            vacancy_id = url.path.rstrip('/').rsplit('/', 1)[1]
+            etag = f'"{options["seed"]}-{vacancy_id}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+            else:
+                self._send_json(200, synthetic_vacancy(vacancy_id, options["seed"]),
+                                {"ETag": etag})
+        elif url.path.rstrip('/') == '/vacancies':
+            page = int(params.get("page", 0))
+            per_page = int(params.get("per_page", 20))
+            if options["fixtures"] is not None:
+                body = options["fixtures"].get(page, {
+                    "items": [], "found": 0, "pages": len(options["fixtures"]), "page": page
+                })
+            else:
+                body = synthetic_page(page, per_page, options["pages"], params,
+                                      options["seed"], options["new_pages"])
+            self._send_json(200, body)
+        else:
+            self._send_json(404, {"errors": [{"type": "not_found"}]})
+
+
+def start_server(host='127.0.0.1', port=0, **options):
+    """
+    Запускает сервер в фоновом потоке.
+
+    Входные данные:
+    - host: Адрес сервера.
+    - port: Порт (0 - любой свободный).
+    - options: Настройки сервера (см. DEFAULT_OPTIONS).
+
+    Выходные данные:
+    - server: Объект сервера (server.options можно менять на ходу,
+      server.requests - количество обработанных запросов,
+      server.shutdown() останавливает сервер).
+    - base_url: Адрес сервера для переменной HH_API_URL.
+
+    Автор:
+    - Глинник Егор
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.options = dict(DEFAULT_OPTIONS, **options)
+    server.lock = threading.Lock()
+    server.rng = random.Random(server.options["seed"])
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def record_fixtures(query, pages, directory=FIXTURES_DIR, per_page=100):
+    """
+    Записывает страницы результатов поиска реального API hh.ru.
+
+    Входные данные:
+    - query: Строка с запросом для поиска вакансий.
+    - pages: Количество записываемых страниц.
+    - directory: Директория для файлов page_<номер>.json.
+    - per_page: Количество вакансий на странице.
+
+    Выходные данные:
+    - Количество записанных страниц.
+
+    Автор:
+    - Глинник Егор
+    """
+    os.makedirs(directory, exist_ok=True)
+    recorded = 0
+    for page in range(pages):
+        response = requests.get("https://api.hh.ru/vacancies", params={
+            "text": query, "page": page, "per_page": per_page, "only_with_salary": "true"
+        }, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        with open(os.path.join(directory, f'page_{page}.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        recorded += 1
+        if page + 1 >= data.get("pages", 0):
+            break
+    return recorded
+
+
+def main():
+    """
+    Запускает сервер или запись страниц из командной строки.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    arg_parser = argparse.ArgumentParser(description="Локальный заменитель API hh.ru")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="запустить сервер")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--pages", type=int, default=DEFAULT_OPTIONS["pages"])
+    serve.add_argument("--new-pages", type=int, default=DEFAULT_OPTIONS["new_pages"])
+    serve.add_argument("--latency", type=float, default=DEFAULT_OPTIONS["latency"])
+    serve.add_argument("--error-rate", type=float, default=DEFAULT_OPTIONS["error_rate"])
+    serve.add_argument("--error-status", type=int, default=DEFAULT_OPTIONS["error_status"])
+    serve.add_argument("--retry-after", type=float, default=None)
+    serve.add_argument("--fixtures", default=None,
+                       help="директория с записанными страницами (по умолчанию - генерация)")
+    serve.add_argument("--seed", type=int, default=0)
+
+    record = commands.add_parser("record", help="записать страницы реального API")
+    record.add_argument("query")
+    record.add_argument("--pages", type=int, default=5)
+    record.add_argument("--directory", default=FIXTURES_DIR)
+    args = arg_parser.parse_args()
+
+    if args.command == "record":
+        count = record_fixtures(args.query, args.pages, args.directory)
+        print(f"Записано страниц: {count} ({args.directory})")
+        return
+
+    server, base_url = start_server(
+        args.host, args.port, pages=args.pages, new_pages=args.new_pages, latency=args.latency,
+        error_rate=args.error_rate, error_status=args.error_status,
+        retry_after=args.retry_after, seed=args.seed,
+        fixtures=load_fixtures(args.fixtures) if args.fixtures else None
+    )
+    print(f"Сервер запущен: HH_API_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Модуль для поиска идентификатора региона hh.ru по названию города.
+
+Справочник регионов (https://api.hh.ru/areas) загружается один раз,
+сохраняется в дисковом кэше (library.http_cache) и индексируется по
+нормализованным названиям: регистр, буква "ё", дефисы и лишние пробелы
+не учитываются. Поддерживаются распространенные сокращения
+("мск", "спб", "питер" и т.д.). Найденный идентификатор передается в запрос
+к API, чтобы фильтрация по городу выполнялась на стороне сервера.
+Если справочник не удалось загрузить, resolve_area передает ошибку
+вызывающему коду (одну из LOAD_ERRORS), а справочник загружается
+заново при следующем вызове.
+
+Функции:
+- normalize(name): Приводит название региона к виду для сравнения.
+- load_areas(session): Загружает дерево регионов hh.ru.
+- build_index(areas): Строит индекс "название -> идентификатор региона".
+- resolve_area(city, session): Возвращает идентификатор региона по названию.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import re
+import threading
+from collections import deque
+import requests
+from library import hh_client
+from library import http_cache
+
+
+# Адрес API можно заменить переменной окружения HH_API_URL
+# (например, на локальный заменитель API из benchmarks/stub_server.py)
+API_ROOT = os.environ.get("HH_API_URL", "https://api.hh.ru").rstrip("/")
+AREAS_URL = API_ROOT + "/areas"
+# Справочник регионов меняется редко, поэтому хранится неделю
+AREAS_TTL = 7 * 24 * 3600
+RUSSIA_AREA_ID = "113"
+# Ошибки загрузки справочника: ответ с ошибкой, сбой соединения, неверный JSON
+LOAD_ERRORS = (hh_client.HHApiError, requests.RequestException, ValueError)
+
+# Сокращения и альтернативные названия городов
+ALIASES = {
+    "мск": "Москва",
+    "moscow": "Москва",
+    "спб": "Санкт-Петербург",
+    "питер": "Санкт-Петербург",
+    "saint petersburg": "Санкт-Петербург",
+    "st petersburg": "Санкт-Петербург",
+    "екб": "Екатеринбург",
+    "екат": "Екатеринбург",
+    "нск": "Новосибирск",
+    "новосиб": "Новосибирск",
+    "нн": "Нижний Новгород",
+    "нижний": "Нижний Новгород",
+    "ростов": "Ростов-на-Дону",
+}
+
+_index = None
+_lock = threading.Lock()
+
+
+def normalize(name):
+    """
+    Приводит название региона к виду для сравнения.
+
+    Входные данные:
+    - name: Название региона.
+
+    Выходные данные:
+    - Строка в нижнем регистре без "ё", дефисов и лишних пробелов.
+
+    Автор:
+    - Глинник Егор
+    """
+    name = name.lower().replace("ё", "е")
+    return re.sub(r"[\s\-]+", " ", name).strip()
+
+
+def load_areas(session=None):
+    """
+    Загружает дерево регионов hh.ru (с использованием дискового кэша).
+
+    Входные данные:
+    - session: HTTP-сессия.
+
+    Выходные данные:
+    - Список регионов верхнего уровня с вложенными регионами.
+
+    Автор:
+    - Глинник Егор
+    """
+    return http_cache.cached_get_json(session, AREAS_URL, {}, ttl=AREAS_TTL)
+
+
+def build_index(areas):
+    """
+    Строит индекс "нормализованное название -> идентификатор региона".
+
+    Дерево обходится в ширину, поэтому при совпадении названий
+    предпочтение отдается региону более высокого уровня
+    (например, городу Москва, а не одноименному поселку).
+
+    Входные данные:
+    - areas: Дерево регионов из load_areas.
+
+    Выходные данные:
+    - index: Словарь {название: идентификатор}.
+
+    Автор:
+    - Глинник Егор
+    """
+    index = {}
+    queue = deque(areas)
+    while queue:
+        area = queue.popleft()
+        index.setdefault(normalize(area["name"]), str(area["id"]))
+        queue.extend(area.get("areas") or [])
+    for alias, name in ALIASES.items():
+        if normalize(name) in index:
+            index.setdefault(normalize(alias), index[normalize(name)])
+    return index
+
+
+def resolve_area(city, session=None):
+    """
+    Возвращает идентификатор региона hh.ru по названию города.
+
+    Входные данные:
+    - city: Название города (или сокращение из ALIASES).
+    - session: HTTP-сессия для загрузки справочника.
+
+    Выходные данные:
+    - Строка с идентификатором региона или None, если город не найден.
+
+    Исключения:
+    - LOAD_ERRORS: Справочник регионов не удалось загрузить.
+
+    Автор:
+    - Глинник Егор
+    """
+    global _index
+    with _lock:
+        if _index is None:
+            _index = build_index(load_areas(session))
+    return _index.get(normalize(city))
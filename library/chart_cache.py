@@ -0,0 +1,243 @@
+"""
+Модуль для кэширования построенных графиков на диске.
+
+Ключ записи строится по содержимому данных графика (хэш таблицы вакансий
+или списка значений) и параметрам графика (имя файла, столбцы, тип),
+поэтому при повторном нажатии на кнопку с теми же данными и параметрами
+изображение берется из кэша без повторного построения. Записи хранятся в
+директории graphics/cache в виде PNG-файлов; общий размер кэша ограничен,
+при превышении удаляются записи, которые дольше всего не использовались
+(library.disk_cache).
+Очищать кэш после нового поиска не нужно: график по новым данным получает
+новый ключ, а записи по прежним данным со временем вытесняются.
+
+Кэш используют и файлы графиков (cached_plot), и панель графиков окна
+приложения (library.chart_panel): панель берет изображение из кэша
+функцией load_image и рисует его на своей фигуре, а построенный график
+сохраняет функцией store; ключ панели включает ее размер в пикселях.
+
+Функции:
+- configure(max_size, directory): Изменяет настройки кэша.
+- data_key(value): Возвращает хэш данных графика.
+- make_key(*parts): Возвращает ключ записи кэша.
+- load_image(key): Возвращает изображение графика из кэша.
+- store(key, save): Сохраняет изображение графика в кэш.
+- cached_plot(key, output_path, show, build): Возвращает график из кэша
+или строит его и сохраняет в кэш.
+- draw_image(image, ax): Рисует изображение графика на осях.
+- show_image(path): Показывает сохраненное изображение в окне matplotlib.
+
+Автор:
+- Елисеев Иван
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import pandas as pd
+from library import disk_cache
+
+
+cache_dir = os.path.join(os.path.dirname(__file__), '..', 'graphics', 'cache')
+# Максимальный размер кэша в байтах (0 отключает кэш)
+max_cache_size = 100 * 1024 * 1024
+
+
+def configure(max_size=None, directory=None):
+    """
+    Изменяет настройки кэша.
+
+    Входные данные:
+    max_size (int): Максимальный размер кэша в байтах.
+    directory (str): Директория для хранения записей.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    global max_cache_size, cache_dir
+    if max_size is not None:
+        max_cache_size = max_size
+    if directory is not None:
+        cache_dir = directory
+
+
+def data_key(value):
+    """
+    Возвращает хэш данных графика.
+
+    Входные данные:
+    value: Таблица (pandas.DataFrame), ряд (pandas.Series) или значение,
+    которое можно записать в JSON (строка, число, список).
+
+    Выходные данные:
+    str: Строка с хэшем SHA-256.
+
+    Автор:
+    - Елисеев Иван
+    """
+    digest = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(json.dumps(columns, ensure_ascii=False, default=str).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    else:
+        digest.update(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def make_key(*parts):
+    """
+    Возвращает ключ записи кэша.
+
+    Входные данные:
+    parts: Данные и параметры графика (см. data_key).
+
+    Выходные данные:
+    str: Строка с хэшем всех частей ключа.
+
+    Автор:
+    - Елисеев Иван
+    """
+    return hashlib.sha256(''.join(data_key(part) for part in parts).encode()).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(cache_dir, f"{key}.png")
+
+
+def load_image(key):
+    """
+    Возвращает изображение графика из кэша и отмечает запись как использованную.
+
+    Входные данные:
+    key (str): Ключ записи (make_key).
+
+    Выходные данные:
+    numpy.ndarray: Изображение (RGBA) или None, если записи нет или кэш отключен.
+
+    Автор:
+    - Елисеев Иван
+    """
+    import matplotlib.image
+
+    if max_cache_size <= 0:
+        return None
+    entry_path = _entry_path(key)
+    try:
+        with open(entry_path, 'rb') as f:
+            image = matplotlib.image.imread(f, format='png')
+        os.utime(entry_path)
+    except OSError:
+        return None
+    return image
+
+
+def store(key, save):
+    """
+    Сохраняет изображение графика в кэш и удаляет давно не использованные записи.
+
+    Входные данные:
+    key (str): Ключ записи (make_key).
+    save: Функция, которая записывает изображение в формате PNG по переданному пути.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    if max_cache_size <= 0:
+        return
+    entry_path = _entry_path(key)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Запись появляется под своим именем целиком, поэтому читатели не видят неполный файл
+    tmp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+    save(tmp_path)
+    os.replace(tmp_path, entry_path)
+    disk_cache.evict(cache_dir, max_cache_size, '.png')
+
+
+def cached_plot(key, output_path, show, build):
+    """
+    Возвращает график из кэша или строит его и сохраняет в кэш.
+
+    Входные данные:
+    key (str): Ключ записи (make_key).
+    output_path (str): Путь, по которому должен находиться файл графика.
+    show (bool): Показывать ли график на экране.
+    build: Функция без аргументов, которая строит график, сохраняет его
+    в output_path, при необходимости показывает и возвращает путь к файлу.
+
+    Выходные данные:
+    str: Путь к файлу графика.
+
+    Автор:
+    - Елисеев Иван
+    """
+    if max_cache_size <= 0:
+        return build()
+
+    entry_path = _entry_path(key)
+    try:
+        shutil.copyfile(entry_path, output_path)
+        os.utime(entry_path)
+    except OSError:
+        pass
+    else:
+        if show:
+            show_image(output_path)
+        return output_path
+
+    output_path = build()
+    store(key, lambda tmp_path: shutil.copyfile(output_path, tmp_path))
+    return output_path
+
+
+def draw_image(image, ax):
+    """
+    Рисует изображение графика на осях, занимающих всю фигуру.
+
+    Входные данные:
+    image: Изображение (numpy.ndarray или PIL.Image).
+    ax (matplotlib.axes.Axes): Оси.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    ax.imshow(image)
+    ax.axis('off')
+
+
+def show_image(path):
+    """
+    Показывает сохраненное изображение графика в окне matplotlib.
+
+    Входные данные:
+    path (str): Путь к PNG-файлу.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    with Image.open(path) as image:
+        dpi = image.info.get('dpi', (100, 100))[0] or 100
+        width, height = image.size
+        pixels = image.copy()
+    fig = plt.figure(figsize=(width / dpi, height / dpi))
+    draw_image(pixels, fig.add_axes([0, 0, 1, 1]))
+    plt.show()
+    plt.close(fig)
+
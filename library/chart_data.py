@@ -0,0 +1,314 @@
+"""
+Модуль для подготовки агрегированных данных графиков.
+
+seaborn получает все строки таблицы и агрегирует их заново при каждом
+построении графика, поэтому время построения растет вместе с количеством
+вакансий. Функции этого модуля заранее сводят таблицу к небольшим
+таблицам (количество вакансий по корзинам и категориям, средние значения,
+статистики для диаграммы Бокса-Вискера), а графики рисуются по ним
+примитивами matplotlib; время рисования зависит только от количества
+корзин и категорий.
+
+Числовые столбцы разбиваются на корзины. Корзина задается нижней границей:
+значения от границы до следующей границы попадают в нее, последняя корзина
+открыта сверху, значения меньше первой границы попадают в первую корзину.
+Границы корзин зарплаты задаются в config.ini ([Charts] salary_bins),
+для остальных числовых столбцов границы выбираются автоматически
+(NUMERIC_BINS корзин равной ширины).
+
+Функции:
+- configure(salary_edges): Изменяет границы корзин зарплаты.
+- parse_edges(text): Разбирает список границ корзин из строки.
+- bin_edges(column, values): Возвращает нижние границы корзин столбца.
+- bin_labels(edges): Возвращает подписи корзин.
+- to_bins(values, edges): Разбивает числовые значения на корзины.
+- is_numeric(series): Проверяет, является ли столбец числовым.
+- as_categories(df, column): Возвращает значения столбца как категории.
+- binned_counts(df, column): Количество вакансий в каждой корзине столбца.
+- crosstab(df, row, col): Количество вакансий для каждой пары категорий.
+- group_means(df, value, group): Среднее значение столбца по категориям.
+- box_stats(df, value, group): Статистики диаграммы Бокса-Вискера по категориям.
+
+Автор:
+- Елисеев Иван
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Столбцы, для которых используются границы корзин зарплаты
+SALARY_COLUMNS = ('Зарплата', 'Зарплата до')
+# Нижние границы корзин зарплаты по умолчанию
+SALARY_EDGES = (0, 30000, 50000, 70000, 100000, 150000, 200000, 250000, 300000, 400000,
+                500000)
+# Количество корзин для остальных числовых столбцов
+NUMERIC_BINS = 20
+COUNT_LABEL = 'Количество вакансий'
+
+salary_bins = SALARY_EDGES
+
+
+def configure(salary_edges=None):
+    """
+    Изменяет границы корзин зарплаты.
+
+    Входные данные:
+    salary_edges: Нижние границы корзин (пустой список - автоматический выбор).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    global salary_bins
+    if salary_edges is not None:
+        salary_bins = tuple(salary_edges)
+
+
+def parse_edges(text):
+    """
+    Разбирает список границ корзин, записанных через запятую.
+
+    Входные данные:
+    text (str): Строка вида "0, 30000, 50000".
+
+    Выходные данные:
+    tuple: Границы по возрастанию без повторов.
+
+    Исключения:
+    ValueError: Граница не является числом.
+
+    Автор:
+    - Елисеев Иван
+    """
+    return tuple(sorted({float(part) for part in text.split(',') if part.strip()}))
+
+
+def bin_edges(column, values):
+    """
+    Возвращает нижние границы корзин числового столбца.
+
+    Входные данные:
+    column (str): Название столбца.
+    values (pandas.Series): Значения столбца.
+
+    Выходные данные:
+    numpy.ndarray: Нижние границы корзин по возрастанию.
+
+    Автор:
+    - Елисеев Иван
+    """
+    if column in SALARY_COLUMNS and salary_bins:
+        return np.asarray(salary_bins, dtype=float)
+    values = values.dropna().to_numpy(dtype=float)
+    if len(values) == 0:
+        return np.zeros(1)
+    # Верхняя граница последней корзины не нужна: последняя корзина открыта
+    edges = np.histogram_bin_edges(values, bins=NUMERIC_BINS)[:-1]
+    return np.unique(edges)
+
+
+def _format_number(value):
+    if float(value).is_integer():
+        return f"{int(value):,}".replace(',', ' ')
+    return f"{value:,.2f}".replace(',', ' ')
+
+
+def bin_labels(edges):
+    """
+    Возвращает подписи корзин.
+
+    Входные данные:
+    edges: Нижние границы корзин.
+
+    Выходные данные:
+    list: Подписи вида "30 000–50 000"; последняя - "от 500 000".
+
+    Автор:
+    - Елисеев Иван
+    """
+    labels = [f"{_format_number(low)}–{_format_number(high)}"
+              for low, high in zip(edges[:-1], edges[1:])]
+    return labels + [f"от {_format_number(edges[-1])}"]
+
+
+def to_bins(values, edges):
+    """
+    Разбивает числовые значения на корзины.
+
+    Входные данные:
+    values (pandas.Series): Числовые значения (пропуски допускаются).
+    edges: Нижние границы корзин.
+
+    Выходные данные:
+    pandas.Series: Упорядоченные категории с подписями bin_labels(edges);
+    пропуски остаются пропусками.
+
+    Автор:
+    - Елисеев Иван
+    """
+    numbers = values.to_numpy(dtype=float, na_value=np.nan)
+    codes = np.maximum(np.searchsorted(edges, numbers, side='right') - 1, 0)
+    codes[np.isnan(numbers)] = -1
+    categories = pd.Categorical.from_codes(codes, categories=bin_labels(edges), ordered=True)
+    return pd.Series(categories, index=values.index, name=values.name)
+
+
+def is_numeric(series):
+    """
+    Проверяет, является ли столбец числовым (такой столбец разбивается на корзины).
+
+    Входные данные:
+    series (pandas.Series): Столбец таблицы.
+
+    Выходные данные:
+    bool: True для числовых столбцов, кроме логических.
+
+    Автор:
+    - Елисеев Иван
+    """
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(
+        series.dtype)
+
+
+def as_categories(df, column):
+    """
+    Возвращает значения столбца как категории: числовой столбец
+    разбивается на корзины, остальные возвращаются без изменений.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    column (str): Название столбца.
+
+    Выходные данные:
+    pandas.Series: Значения для группировки.
+
+    Автор:
+    - Елисеев Иван
+    """
+    values = df[column]
+    if is_numeric(values):
+        return to_bins(values, bin_edges(column, values))
+    return values
+
+
+def _complete(counts, groups, axis):
+    """
+    Добавляет пустые корзины между заполненными, чтобы ось не прерывалась.
+    """
+    if not (isinstance(groups.dtype, pd.CategoricalDtype) and groups.dtype.ordered):
+        return counts
+    counts = counts.reindex(groups.cat.categories, axis=axis, fill_value=0)
+    totals = counts.to_numpy() if counts.ndim == 1 else counts.to_numpy().sum(axis=1 - axis)
+    filled = np.flatnonzero(totals)
+    if len(filled) == 0:
+        return counts
+    # Пустые корзины по краям отбрасываются
+    return counts.take(np.arange(filled[0], filled[-1] + 1), axis=axis)
+
+
+def binned_counts(df, column):
+    """
+    Считает количество вакансий в каждой корзине (категории) столбца.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    column (str): Название столбца.
+
+    Выходные данные:
+    pandas.DataFrame: Столбцы column (подпись корзины) и COUNT_LABEL
+    в порядке корзин.
+
+    Автор:
+    - Елисеев Иван
+    """
+    groups = as_categories(df, column)
+    counts = _complete(groups.value_counts(sort=False), groups, axis=0)
+    counts.index = counts.index.astype(object)
+    return counts.rename_axis(column).reset_index(name=COUNT_LABEL)
+
+
+def crosstab(df, row, col):
+    """
+    Считает количество вакансий для каждой пары категорий двух столбцов.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    row (str): Столбец, значения которого становятся строками.
+    col (str): Столбец, значения которого становятся столбцами.
+
+    Выходные данные:
+    pandas.DataFrame: Количество вакансий (индекс - категории row,
+    столбцы - категории col).
+
+    Автор:
+    - Елисеев Иван
+    """
+    rows, cols = as_categories(df, row), as_categories(df, col)
+    counts = pd.DataFrame({row: rows, col: cols}).groupby(
+        [row, col], observed=True).size().unstack(fill_value=0)
+    counts = _complete(_complete(counts, rows, axis=0), cols, axis=1)
+    counts.index, counts.columns = counts.index.astype(object), counts.columns.astype(object)
+    return counts.rename_axis(index=row, columns=col)
+
+
+def _grouped_values(df, value, group):
+    frame = pd.DataFrame({
+        group: as_categories(df, group),
+        value: df[value].to_numpy(dtype=float, na_value=np.nan),
+    })
+    return frame.dropna()
+
+
+def group_means(df, value, group):
+    """
+    Считает среднее значение числового столбца для каждой категории другого столбца.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    value (str): Числовой столбец.
+    group (str): Столбец категорий (числовой разбивается на корзины).
+
+    Выходные данные:
+    pandas.DataFrame: Один столбец value, индекс - категории group.
+
+    Автор:
+    - Елисеев Иван
+    """
+    means = _grouped_values(df, value, group).groupby(group, observed=True)[value].mean()
+    means.index = means.index.astype(object)
+    return means.to_frame(value)
+
+
+def box_stats(df, value, group):
+    """
+    Считает статистики диаграммы Бокса-Вискера для каждой категории:
+    квартили и границы усов (крайние значения в пределах 1.5 межквартильного
+    размаха от квартилей, как в seaborn.boxplot). Выбросы не хранятся.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    value (str): Числовой столбец.
+    group (str): Столбец категорий (числовой разбивается на корзины).
+
+    Выходные данные:
+    pandas.DataFrame: Столбцы q1, med, q3, whislo, whishi (аргументы
+    matplotlib.axes.Axes.bxp), индекс - категории group.
+
+    Автор:
+    - Елисеев Иван
+    """
+    frame = _grouped_values(df, value, group)
+    grouped = frame.groupby(group, observed=True)[value]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'med', 'q3']
+    iqr = stats['q3'] - stats['q1']
+    low = (stats['q1'] - 1.5 * iqr).reindex(frame[group]).to_numpy()
+    high = (stats['q3'] + 1.5 * iqr).reindex(frame[group]).to_numpy()
+    inside = frame[(frame[value].to_numpy() >= low) & (frame[value].to_numpy() <= high)]
+    whiskers = inside.groupby(group, observed=True)[value].agg(['min', 'max'])
+    stats['whislo'], stats['whishi'] = whiskers['min'], whiskers['max']
+    stats.index = stats.index.astype(object)
+    return stats
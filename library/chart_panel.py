@@ -0,0 +1,136 @@
+"""
+Модуль для показа графиков внутри окна приложения.
+
+Раньше каждый график строился на новой фигуре pyplot и показывался
+в отдельном окне через plt.show(), который блокирует интерфейс; фигуры
+накапливались в памяти при каждом нажатии кнопки. Панель ChartPanel
+создает одну фигуру matplotlib (без pyplot, поэтому фигура не попадает
+в список фигур pyplot) и встраивает ее в окно Tk через FigureCanvasTkAgg.
+Каждый новый график рисуется на той же фигуре: фигура очищается,
+создаются новые оси, и функция draw_* рисует на них. Поэтому в памяти
+всегда находится одна фигура, сколько бы графиков ни строилось.
+
+Повторный показ того же графика (тот же ключ) не перерисовывает фигуру.
+Если передан ключ кэша графиков (library.chart_cache), график, уже
+построенный ранее с теми же данными и того же размера, не строится
+заново: его изображение берется из кэша и рисуется на фигуре панели,
+а новый график после рисования сохраняется в кэш.
+Оформление графика (настройки rcParams) передается аргументом style и
+действует только на время рисования, поэтому оформление одного графика
+не переходит на следующие.
+Сохранить показанный график в файл можно кнопкой панели инструментов.
+
+Классы:
+- ChartPanel: Встроенная в окно панель графика.
+
+Автор:
+- Глинник Егор
+"""
+
+import warnings
+import numpy as np
+import matplotlib
+import matplotlib.image
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from library import chart_cache
+
+
+# Размер фигуры в дюймах и разрешение на экране
+FIGSIZE = (8, 5)
+DPI = 100
+
+
+class ChartPanel:
+    """
+    Встроенная в окно панель графика с панелью инструментов matplotlib.
+
+    Входные данные:
+    - master: Родительский виджет Tk.
+    - figsize: Размер фигуры в дюймах.
+    - dpi: Разрешение фигуры.
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, master, figsize=FIGSIZE, dpi=DPI):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, master, pack_toolbar=False)
+        self.toolbar.pack(side='bottom', fill='x')
+        self.canvas.get_tk_widget().pack(side='top', fill='both', expand=True)
+        self.key = None
+
+    @property
+    def size(self):
+        """
+        Размер фигуры панели в пикселях (ширина, высота).
+        """
+        width, height = self.figure.get_size_inches() * self.figure.dpi
+        return int(round(width)), int(round(height))
+
+    def show(self, key, draw, *args, style=None, cache_key=None):
+        """
+        Рисует график на фигуре панели вместо предыдущего.
+
+        Входные данные:
+        - key: Ключ графика (например, название и параметры); если он совпадает
+          с ключом показанного графика, фигура не перерисовывается.
+        - draw: Функция draw_* модулей graph_generator или user_graph,
+          принимающая оси аргументом ax.
+        - args: Аргументы функции draw (подготовленные данные).
+        - style: Словарь настроек matplotlib (например, user_graph.STYLE),
+          действующих при создании осей и рисовании.
+        - cache_key: Ключ записи кэша графиков (chart_cache.make_key) или None,
+          если кэш не используется; должен учитывать данные графика и size.
+
+        Выходные данные:
+        -
+        """
+        if key is not None and key == self.key:
+            return
+        self.figure.clear()
+        image = chart_cache.load_image(cache_key) if cache_key is not None else None
+        if image is not None:
+            chart_cache.draw_image(image, self.figure.add_axes([0, 0, 1, 1]))
+        else:
+            with matplotlib.rc_context(style), warnings.catch_warnings():
+                # tight_layout предупреждает, если подписи не помещаются в окно
+                warnings.simplefilter('ignore', UserWarning)
+                ax = self.figure.add_subplot()
+                draw(*args, ax=ax)
+        self.key = key
+        self.toolbar.update()
+        if image is None and cache_key is not None:
+            # Фигура рисуется сразу, и в кэш сохраняется уже готовое изображение
+            self.canvas.draw()
+            chart_cache.store(cache_key, self._save_image)
+        else:
+            self.canvas.draw_idle()
+
+    def _save_image(self, path):
+        matplotlib.image.imsave(path, np.asarray(self.canvas.buffer_rgba()), format='png')
+
+    def clear(self):
+        """
+        Убирает показанный график (например, после нового поиска).
+
+        Выходные данные:
+        -
+        """
+        self.figure.clear()
+        self.key = None
+        self.canvas.draw_idle()
+
+    def destroy(self):
+        """
+        Освобождает фигуру и удаляет виджеты панели.
+
+        Выходные данные:
+        -
+        """
+        self.figure.clear()
+        self.toolbar.destroy()
+        self.canvas.get_tk_widget().destroy()
+        self.key = None
@@ -0,0 +1,179 @@
+"""
+Модуль для параллельного построения набора графиков в пуле процессов.
+
+Построение графиков matplotlib выполняется в одном потоке и занимает
+основную часть времени анализа, поэтому стандартный набор графиков
+строится параллельно в отдельных процессах. Данные агрегируются в
+основном процессе (функции aggregate_* модулей graph_generator и
+user_graph), и в процессы передаются только небольшие таблицы, а не вся
+база вакансий. Каждый процесс использует backend Agg (без окон);
+оформление графиков задается на время рисования (user_graph.STYLE).
+
+Пул процессов создается один раз и переиспользуется. Процессы запускаются
+методом spawn, поэтому запускаемый скрипт должен вызывать построение из
+блока if __name__ == "__main__".
+
+Функции:
+- standard_chart_tasks(df, query, grades, posts): Возвращает задания для
+стандартного набора графиков.
+- get_pool(max_workers): Возвращает общий пул процессов.
+- shutdown(): Останавливает пул процессов.
+- render_all(df, query, grades, posts, custom_charts, directory, max_workers, as_bytes):
+Строит все графики параллельно и возвращает пути к файлам или PNG-данные.
+
+Автор:
+- Елисеев Иван
+"""
+
+import io
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from library import graph_generator
+from library import user_graph
+
+
+STANDARD_DPI = 300
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def standard_chart_tasks(df, query, grades, posts):
+    """
+    Возвращает задания для стандартного набора графиков.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    query (str): Поисковый запрос (определяет стек технологий).
+    grades (list): Количество вакансий по уровням.
+    posts (list): Количество вакансий по специальностям.
+
+    Выходные данные:
+    list: Кортежи (функция draw_*, аргументы, имя файла, dpi).
+
+    Автор:
+    - Елисеев Иван
+    """
+    charts = (
+        (graph_generator.draw_salary, graph_generator.aggregate_salary(df),
+         'salary_vs_vacancies.png'),
+        (graph_generator.draw_experience, graph_generator.aggregate_experience(df),
+         'experience_vs_vacancies.png'),
+        (graph_generator.draw_employment_type, graph_generator.aggregate_employment_type(df),
+         'employment_type_vs_vacancies.png'),
+        (graph_generator.draw_requirements,
+         graph_generator.aggregate_requirements(df, query.lower()),
+         'requirements_vs_vacancies.png'),
+        (graph_generator.draw_levels, graph_generator.aggregate_levels(grades),
+         'level_vs_vacancies.png'),
+        (graph_generator.draw_specialties, graph_generator.aggregate_specialties(posts),
+         'specialty_vs_vacancies.png'),
+    )
+    return [(draw, (data,), filename, STANDARD_DPI) for draw, data, filename in charts]
+
+
+def _init_worker():
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+
+
+def _render(draw, args, path, dpi, as_bytes):
+    import matplotlib
+    import matplotlib.pyplot as plt
+    with matplotlib.rc_context():
+        draw(*args)
+        if as_bytes:
+            buffer = io.BytesIO()
+            plt.savefig(buffer, format='png', dpi=dpi)
+            result = buffer.getvalue()
+        else:
+            plt.savefig(path, dpi=dpi)
+            result = path
+        plt.close('all')
+    return result
+
+
+def get_pool(max_workers=None):
+    """
+    Возвращает общий пул процессов, создавая его при первом обращении.
+
+    Входные данные:
+    max_workers (int): Количество процессов (по умолчанию по числу ядер, не больше 6).
+
+    Выходные данные:
+    concurrent.futures.ProcessPoolExecutor: Пул процессов.
+
+    Автор:
+    - Елисеев Иван
+    """
+    global _pool, _pool_workers
+    max_workers = max_workers or min(6, os.cpu_count() or 1)
+    with _pool_lock:
+        if _pool is None or _pool_workers != max_workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+            _pool_workers = max_workers
+        return _pool
+
+
+def shutdown():
+    """
+    Останавливает общий пул процессов.
+
+    Автор:
+    - Елисеев Иван
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_workers = None
+
+
+def render_all(df, query, grades, posts, custom_charts=(), directory=None,
+               max_workers=None, as_bytes=False):
+    """
+    Строит стандартный набор графиков и пользовательские графики параллельно.
+
+    Входные данные:
+    df (pandas.DataFrame): Таблица вакансий.
+    query (str): Поисковый запрос.
+    grades (list): Количество вакансий по уровням.
+    posts (list): Количество вакансий по специальностям.
+    custom_charts: Пары (col1, col2, plot_type) для графиков user_graph.
+    directory (str): Директория для сохранения графиков (по умолчанию 'graphics').
+    max_workers (int): Количество процессов.
+    as_bytes (bool): Возвращать PNG-данные вместо сохранения в файлы.
+
+    Выходные данные:
+    dict: {имя файла: путь к файлу или PNG-данные (bytes)}.
+
+    Автор:
+    - Елисеев Иван
+    """
+    directory = directory or graph_generator.output_dir
+    if not as_bytes:
+        os.makedirs(directory, exist_ok=True)
+    tasks = standard_chart_tasks(df, query, grades, posts)
+    for col1, col2, plot_type in custom_charts:
+        task = user_graph.chart_task(df, col1, col2, plot_type)
+        if task is not None:
+            draw, args, filename = task
+            tasks.append((draw, args, filename, 'figure'))
+
+    pool = get_pool(max_workers)
+    futures = {
+        filename: pool.submit(_render, draw, args, os.path.join(directory, filename),
+                              dpi, as_bytes)
+        for draw, args, filename, dpi in tasks
+    }
+    return {filename: future.result() for filename, future in futures.items()}
@@ -0,0 +1,158 @@
+"""
+Модуль для классификации вакансий по уровням и специальностям по названию.
+
+Категории и ключевые слова задаются в файле scripts/taxonomy.json.
+Каждая группа категорий ("grades", "posts") имеет режим:
+- "first": вакансия попадает в первую подходящую категорию,
+  остальные учитываются в категории default;
+- "all": вакансия учитывается во всех подходящих категориях.
+Категория может содержать список exclude: при совпадении с ним вакансия
+в категорию не попадает.
+
+Ключевые слова категории объединяются в одно регулярное выражение,
+которое применяется сразу ко всей пачке названий (pandas .str.contains),
+поэтому скорость не зависит от количества категорий в Python-цикле,
+а уже сохраненную таблицу можно переклассифицировать без новой загрузки.
+
+Функции:
+- load_taxonomy(path): Загружает описание категорий.
+- category_names(group, taxonomy): Возвращает названия категорий группы.
+- classify_titles(titles, taxonomy): Подсчитывает вакансии по категориям всех групп.
+- classify(titles, taxonomy): Возвращает списки grades и posts.
+- classify_dataset(df, taxonomy): Классифицирует вакансии из таблицы.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import re
+import json
+from functools import lru_cache
+import pandas as pd
+
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'taxonomy.json')
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path=TAXONOMY_PATH):
+    """
+    Загружает описание категорий и компилирует регулярные выражения.
+
+    Входные данные:
+    - path: Путь к файлу taxonomy.json.
+
+    Выходные данные:
+    - taxonomy: Словарь групп категорий; у каждой категории добавлены
+      скомпилированные выражения pattern и exclude_pattern.
+
+    Автор:
+    - Глинник Егор
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    for group in taxonomy.values():
+        for category in group['categories']:
+            category['pattern'] = _compile(category['keywords'])
+            category['exclude_pattern'] = _compile(category.get('exclude', []))
+    return taxonomy
+
+
+def _compile(keywords):
+    if not keywords:
+        return None
+    alternation = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+    return re.compile(alternation)
+
+
+def category_names(group, taxonomy=None):
+    """
+    Возвращает названия категорий группы в порядке счетчиков.
+
+    Входные данные:
+    - group: Название группы ("grades" или "posts").
+    - taxonomy: Описание категорий (по умолчанию из scripts/taxonomy.json).
+
+    Выходные данные:
+    - Список названий категорий (для режима "first" последней идет default).
+
+    Автор:
+    - Глинник Егор
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    spec = taxonomy[group]
+    names = [category['name'] for category in spec['categories']]
+    if spec.get('mode') == 'first':
+        names.append(spec['default'])
+    return names
+
+
+def classify_titles(titles, taxonomy=None):
+    """
+    Подсчитывает вакансии по категориям всех групп.
+
+    Входные данные:
+    - titles: Последовательность названий вакансий.
+    - taxonomy: Описание категорий (по умолчанию из scripts/taxonomy.json).
+
+    Выходные данные:
+    - Словарь {группа: список количеств в порядке category_names(группа)}.
+
+    Автор:
+    - Глинник Егор
+    """
+    taxonomy = taxonomy or load_taxonomy()
+    names = pd.Series(titles, dtype=object).fillna('').astype(str).str.lower()
+    result = {}
+    for group, spec in taxonomy.items():
+        counts = []
+        assigned = pd.Series(False, index=names.index)
+        for category in spec['categories']:
+            mask = names.str.contains(category['pattern'], regex=True)
+            if category['exclude_pattern'] is not None:
+                mask &= ~names.str.contains(category['exclude_pattern'], regex=True)
+            if spec.get('mode') == 'first':
+                mask &= ~assigned
+                assigned |= mask
+            counts.append(int(mask.sum()))
+        if spec.get('mode') == 'first':
+            counts.append(int((~assigned).sum()))
+        result[group] = counts
+    return result
+
+
+def classify(titles, taxonomy=None):
+    """
+    Возвращает количество вакансий по уровням и специальностям.
+
+    Входные данные:
+    - titles: Последовательность названий вакансий.
+    - taxonomy: Описание категорий (по умолчанию из scripts/taxonomy.json).
+
+    Выходные данные:
+    - grades: Список с количеством вакансий по уровням.
+    - posts: Список с количеством вакансий по специальностям.
+
+    Автор:
+    - Глинник Егор
+    """
+    counts = classify_titles(titles, taxonomy)
+    return counts['grades'], counts['posts']
+
+
+def classify_dataset(df, taxonomy=None):
+    """
+    Классифицирует вакансии из сохраненной таблицы без повторной загрузки.
+
+    Входные данные:
+    - df (pandas.DataFrame): Таблица вакансий со столбцом 'Название вакансии'.
+    - taxonomy: Описание категорий (по умолчанию из scripts/taxonomy.json).
+
+    Выходные данные:
+    - grades, posts: Списки с количеством вакансий по уровням и специальностям.
+
+    Автор:
+    - Глинник Егор
+    """
+    return classify(df['Название вакансии'], taxonomy)
@@ -0,0 +1,346 @@
+"""
+Модуль для сохранения и загрузки таблицы вакансий.
+
+Основным форматом хранения является колоночный файл Parquet (data/data.parquet):
+он читается во много раз быстрее, чем Excel, и сохраняет типы столбцов.
+Файл data/data.xlsx остается для выгрузки и просмотра в Excel; если файла
+Parquet нет или он записан в несовместимой версии схемы, данные читаются
+из Excel.
+
+При загрузке столбцы приводятся к типам library.schema (категории,
+целые числа с пропусками, строки Arrow).
+
+Загруженная таблица хранится в памяти процесса: графики и отчеты получают ее
+через get_dataset() без повторного разбора файла, а iter_batches отдает
+пачки строк из этой таблицы, если она уже загружена и файл с тех пор
+не менялся. Кэш сбрасывается, когда
+меняется время изменения или содержимое (хэш) файла данных. Вызывающий код
+получает представление таблицы только для чтения: добавление, удаление и
+замена столбцов в нем не затрагивают общую таблицу, а данные столбцов не
+копируются. Массивы numpy общей таблицы (коды категорий, значения и маски
+Int64) защищены от записи, поэтому изменение значений на месте
+(df.loc[...] = ..., inplace=True) вызывает ValueError; строковые столбцы
+Arrow неизменяемы и при таком изменении копируются. Для изменения значений
+нужна полная копия df.copy().
+
+Функции:
+- make_schema(columns, metadata): Создает схему Arrow для таблицы вакансий.
+- coerce_columns(data): Приводит значения целочисленных столбцов к int.
+- read_metadata(path): Читает метаданные файла Parquet.
+- load_dataset(data_dir): Загружает таблицу вакансий с диска.
+- iter_batches(data_dir, columns, batch_size): Читает таблицу вакансий пачками строк.
+- get_dataset(data_dir): Возвращает таблицу вакансий из кэша процесса.
+- dataset_hash(data_dir): Возвращает хэш содержимого файла данных.
+- invalidate(data_dir): Сбрасывает кэш таблицы.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from library import schema
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+XLSX_NAME = 'data.xlsx'
+PARQUET_NAME = 'data.parquet'
+# Версия схемы таблицы; увеличивается при изменении набора или типов столбцов
+SCHEMA_VERSION = 1
+# Количество строк в пачке при чтении таблицы по частям
+BATCH_ROWS = 65536
+METADATA_KEY = b'py_ds_hh'
+# Столбцы с целочисленными значениями; остальные хранятся как строки
+INTEGER_COLUMNS = schema.INTEGER_COLUMNS
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def coerce_columns(data):
+    """
+    Приводит значения целочисленных столбцов к int (нечисловые значения - к None).
+
+    Входные данные:
+    - data: Словарь {название столбца: список значений}.
+
+    Выходные данные:
+    - data: Тот же словарь с преобразованными значениями.
+
+    Автор:
+    - Глинник Егор
+    """
+    for column in INTEGER_COLUMNS:
+        if column in data:
+            data[column] = [_to_int(value) for value in data[column]]
+    return data
+
+
+def make_schema(columns, metadata=None):
+    """
+    Создает схему Arrow для таблицы вакансий с метаданными версии схемы.
+
+    Входные данные:
+    - columns: Список названий столбцов.
+    - metadata: Словарь с дополнительными сведениями (запрос, город).
+
+    Выходные данные:
+    - schema (pyarrow.Schema): Схема таблицы.
+
+    Автор:
+    - Глинник Егор
+    """
+    fields = [
+        pa.field(column, pa.int64() if column in INTEGER_COLUMNS else pa.string())
+        for column in columns
+    ]
+    info = dict(metadata or {})
+    info.update({'schema_version': SCHEMA_VERSION, 'columns': list(columns)})
+    return pa.schema(fields, metadata={
+        METADATA_KEY: json.dumps(info, ensure_ascii=False).encode('utf-8')
+    })
+
+
+def read_metadata(path):
+    """
+    Читает метаданные файла Parquet, записанные приемником library.sinks.ParquetSink
+    (схема make_schema).
+
+    Входные данные:
+    - path: Путь к файлу Parquet.
+
+    Выходные данные:
+    - Словарь метаданных или None, если файл отсутствует или поврежден.
+
+    Автор:
+    - Глинник Егор
+    """
+    try:
+        schema_metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+    raw = schema_metadata.get(METADATA_KEY)
+    if raw is None:
+        return None
+    return json.loads(raw.decode('utf-8'))
+
+
+def _source_path(data_dir):
+    """
+    Возвращает путь к файлу, из которого следует читать таблицу.
+    """
+    parquet_path = os.path.join(data_dir, PARQUET_NAME)
+    metadata = read_metadata(parquet_path)
+    if metadata is not None and metadata.get('schema_version') == SCHEMA_VERSION:
+        return parquet_path
+    return os.path.join(data_dir, XLSX_NAME)
+
+
+def _read(path):
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, read_dictionary=schema.dictionary_columns(
+            pq.read_schema(path).names))
+        return schema.apply_schema(table.to_pandas(types_mapper=schema.arrow_dtype))
+    return schema.apply_schema(pd.read_excel(path))
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_dataset(data_dir=DATA_DIR):
+    """
+    Загружает таблицу вакансий с диска.
+
+    Читает файл Parquet, если он существует и его версия схемы совпадает
+    с текущей; иначе читает файл Excel.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+
+    Выходные данные:
+    - df (pandas.DataFrame): Таблица вакансий.
+
+    Автор:
+    - Глинник Егор
+    """
+    return _read(_source_path(data_dir))
+
+
+def iter_batches(data_dir=DATA_DIR, columns=None, batch_size=BATCH_ROWS):
+    """
+    Читает таблицу вакансий пачками строк.
+
+    Если таблица уже загружена в кэш процесса (get_dataset) и файл с тех пор
+    не менялся, пачки берутся из нее без чтения файла (представления только
+    для чтения, данные не копируются). Иначе файл Parquet читается по
+    частям, поэтому в памяти находится только одна пачка, а файл Excel
+    (если Parquet нет) читается целиком и отдается одной пачкой.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - columns: Список нужных столбцов (None - все; отсутствующие в файле
+      столбцы пропускаются).
+    - batch_size: Количество строк в пачке.
+
+    Выходные данные:
+    - Генератор pandas.DataFrame.
+
+    Автор:
+    - Глинник Егор
+    """
+    path = _source_path(data_dir)
+    entry = _loaded_entry(data_dir, path)
+    if entry is not None:
+        df = _view(entry['df'], columns)
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size]
+        return
+    if not path.endswith('.parquet'):
+        df = _read(path)
+        yield df if columns is None else df[[c for c in columns if c in df.columns]]
+        return
+    names = pq.read_schema(path).names
+    parquet_file = pq.ParquetFile(path, read_dictionary=schema.dictionary_columns(names))
+    if columns is not None:
+        columns = [column for column in columns if column in names]
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield schema.apply_schema(batch.to_pandas(types_mapper=schema.arrow_dtype))
+
+
+def _freeze(df):
+    """
+    Защищает от записи массивы numpy столбцов таблицы и возвращает ее.
+    """
+    for _, column in df.items():
+        values = column.array
+        if isinstance(values, pd.Categorical):
+            buffers = [values._ndarray]
+        elif isinstance(values, (pd.arrays.IntegerArray, pd.arrays.FloatingArray,
+                                 pd.arrays.BooleanArray)):
+            buffers = [values._data, values._mask]
+        elif isinstance(values, pd.arrays.NumpyExtensionArray):
+            buffers = [values._ndarray]
+        else:
+            # Строки Arrow неизменяемы
+            buffers = []
+        for buffer in buffers:
+            if isinstance(buffer, np.ndarray):
+                buffer.flags.writeable = False
+    return df
+
+
+def _view(df, columns=None):
+    """
+    Возвращает новую таблицу с теми же (защищенными от записи) данными столбцов.
+    """
+    if columns is None:
+        columns = df.columns
+    # view() создает новые объекты массивов: изменение строкового столбца Arrow
+    # заменяет массив только в этом представлении, а не в общей таблице
+    return pd.DataFrame({name: df[name].array.view() for name in columns
+                         if name in df.columns}, index=df.index, copy=False)
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def _loaded_entry(data_dir, path):
+    """
+    Возвращает запись кэша, если таблица уже загружена и файл не менялся, иначе None.
+    """
+    with _cache_lock:
+        entry = _cache.get(os.path.abspath(data_dir))
+    if entry is not None and entry['signature'] == _signature(path):
+        return entry
+    return None
+
+
+def _cached_entry(data_dir):
+    path = _source_path(data_dir)
+    signature = _signature(path)
+    key = os.path.abspath(data_dir)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None or entry['signature'] != signature:
+            content_hash = _file_hash(path)
+            if entry is None or entry['hash'] != content_hash:
+                entry = {'df': _freeze(_read(path)), 'hash': content_hash}
+            entry['signature'] = signature
+            _cache[key] = entry
+        return entry
+
+
+def get_dataset(data_dir=DATA_DIR):
+    """
+    Возвращает таблицу вакансий из кэша процесса.
+
+    Файл читается только при первом обращении или после его изменения.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+
+    Выходные данные:
+    - df (pandas.DataFrame): Представление таблицы только для чтения:
+      столбцы можно добавлять, удалять и заменять, не меняя кэш; изменение
+      значений на месте вызывает ValueError.
+
+    Автор:
+    - Глинник Егор
+    """
+    return _view(_cached_entry(data_dir)['df'])
+
+
+def dataset_hash(data_dir=DATA_DIR):
+    """
+    Возвращает хэш содержимого файла данных.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+
+    Выходные данные:
+    - Строка с хэшем SHA-256.
+
+    Автор:
+    - Глинник Егор
+    """
+    return _cached_entry(data_dir)['hash']
+
+
+def invalidate(data_dir=None):
+    """
+    Сбрасывает кэш таблицы для указанной директории (или для всех директорий).
+
+    Входные данные:
+    - data_dir: Директория с данными.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    with _cache_lock:
+        if data_dir is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(data_dir), None)
@@ -0,0 +1,218 @@
+"""
+Модуль для дополнения таблицы вакансий подробными сведениями о вакансиях.
+
+В результатах поиска hh.ru есть только фрагмент требований
+(snippet.requirement), обрезанный и с разметкой подсветки. Подробные
+сведения (ключевые навыки, полное описание, верхняя граница зарплаты
+и валюта) отдает только запрос /vacancies/<id>, по одному на вакансию.
+
+Сведения загружаются параллельно (не больше max_workers запросов
+одновременно, с ограничениями library.hh_client) и хранятся в кэше
+cache/vacancies по идентификатору вакансии, поэтому каждая вакансия
+загружается один раз для всех поисков. Записи читаются и сохраняются
+функциями library.http_cache. Устаревшая запись кэша перепроверяется
+условным запросом (If-None-Match); при ответе 304 сведения берутся из кэша.
+В кэше хранятся только извлеченные поля, а не весь ответ. Удаленные
+вакансии (ответ 404) тоже кэшируются - с пустыми полями, чтобы не
+запрашивать их при каждом поиске.
+
+Функции:
+- configure(ttl, max_size, directory): Изменяет настройки кэша.
+- extract_fields(vacancy): Извлекает нужные поля из ответа /vacancies/<id>.
+- get_details(vacancy_id, session, cancel_event): Возвращает сведения об одной вакансии.
+- fetch_details(ids, session, max_workers, cancel_event): Возвращает сведения
+  о нескольких вакансиях.
+- detail_row(fields): Преобразует сведения о вакансии в значения столбцов DETAIL_COLUMNS.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import re
+import html
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from library import areas
+from library import hh_client
+from library import http_cache
+from library import disk_cache
+
+
+API_URL = areas.API_ROOT + "/vacancies"
+# Столбцы, добавляемые в таблицу вакансий
+DETAIL_COLUMNS = ["Ключевые навыки", "Описание", "Зарплата до", "Валюта"]
+# Количество одновременно загружаемых вакансий
+MAX_WORKERS = 8
+# Интервал проверки отмены при ожидании ответов сервера, в секундах
+CANCEL_POLL_INTERVAL = 0.1
+# Коды ответа для удаленных вакансий; такой ответ кэшируется с пустыми полями
+MISSING_STATUSES = (404,)
+
+cache_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'vacancies')
+# Время жизни записи в секундах; после него запись перепроверяется на сервере
+ttl_seconds = 7 * 24 * 3600
+# Максимальный размер кэша в байтах
+max_cache_size = 100 * 1024 * 1024
+
+EMPTY_FIELDS = {"key_skills": None, "description": None, "salary_to": None, "currency": None}
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def configure(ttl=None, max_size=None, directory=None):
+    """
+    Изменяет настройки кэша.
+
+    Входные данные:
+    - ttl: Время жизни записи в секундах.
+    - max_size: Максимальный размер кэша в байтах.
+    - directory: Директория для хранения записей.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global ttl_seconds, max_cache_size, cache_dir
+    if ttl is not None:
+        ttl_seconds = ttl
+    if max_size is not None:
+        max_cache_size = max_size
+    if directory is not None:
+        cache_dir = directory
+
+
+def _clean_text(value):
+    if not value:
+        return None
+    return ' '.join(html.unescape(TAG_PATTERN.sub(' ', value)).split())
+
+
+def extract_fields(vacancy):
+    """
+    Извлекает нужные поля из ответа /vacancies/<id>.
+
+    Входные данные:
+    - vacancy: JSON-ответ с подробными сведениями о вакансии.
+
+    Выходные данные:
+    - Словарь с полями key_skills (навыки через запятую), description
+      (описание без HTML-разметки), salary_to и currency.
+
+    Автор:
+    - Глинник Егор
+    """
+    salary = vacancy.get("salary") or {}
+    skills = [skill["name"] for skill in vacancy.get("key_skills") or [] if skill.get("name")]
+    return {
+        "key_skills": ", ".join(skills) or None,
+        "description": _clean_text(vacancy.get("description")),
+        "salary_to": salary.get("to"),
+        "currency": salary.get("currency"),
+    }
+
+
+def get_details(vacancy_id, session=None, cancel_event=None):
+    """
+    Возвращает сведения об одной вакансии из кэша или с сервера.
+
+    Входные данные:
+    - vacancy_id: Идентификатор вакансии hh.ru.
+    - session: HTTP-сессия (requests.Session или None).
+    - cancel_event: Событие отмены, передаваемое hh_client.get.
+
+    Выходные данные:
+    - Словарь полей (см. extract_fields). Если вакансия удалена или
+      сервер вернул ошибку, все поля равны None (ответ для удаленной
+      вакансии сохраняется в кэш, ошибки - нет).
+
+    Исключения:
+    - hh_client.RequestCancelled: Событие отмены установлено.
+
+    Автор:
+    - Глинник Егор
+    """
+    entry = http_cache.load_entry(vacancy_id, cache_dir)
+    headers = {}
+    if entry is not None:
+        if time.time() - entry.get('stored_at', 0) < ttl_seconds:
+            return entry['fields']
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+
+    try:
+        response = hh_client.get(session, f"{API_URL}/{vacancy_id}", headers=headers,
+                                 cancel_event=cancel_event)
+    except hh_client.HHApiError as e:
+        if e.status not in MISSING_STATUSES:
+            return entry['fields'] if entry is not None else dict(EMPTY_FIELDS)
+        # Вакансия удалена: пустые поля кэшируются, чтобы не запрашивать ее снова
+        entry = {'etag': None, 'stored_at': time.time(), 'fields': dict(EMPTY_FIELDS)}
+    else:
+        if response.status_code == 304 and entry is not None:
+            entry['stored_at'] = time.time()
+        else:
+            entry = {
+                'etag': response.headers.get('ETag'),
+                'stored_at': time.time(),
+                'fields': extract_fields(response.json()),
+            }
+    http_cache.store_entry(vacancy_id, entry, cache_dir)
+    return entry['fields']
+
+
+def fetch_details(ids, session=None, max_workers=MAX_WORKERS, cancel_event=None):
+    """
+    Возвращает сведения о нескольких вакансиях, загружая их параллельно.
+
+    Входные данные:
+    - ids: Список идентификаторов вакансий.
+    - session: HTTP-сессия, общая для всех потоков.
+    - max_workers: Максимальное количество одновременных запросов.
+    - cancel_event: Событие threading.Event; если оно установлено, ожидающие
+      запросы отменяются, а загрузка прерывается исключением
+      hh_client.RequestCancelled, не дожидаясь запросов в работе.
+
+    Выходные данные:
+    - Словарь {идентификатор: словарь полей}.
+
+    Исключения:
+    - hh_client.RequestCancelled: Событие отмены установлено.
+
+    Автор:
+    - Глинник Егор
+    """
+    ids = [vacancy_id for vacancy_id in dict.fromkeys(ids) if vacancy_id is not None]
+    if not ids:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ids))))
+    try:
+        futures = {vacancy_id: executor.submit(get_details, vacancy_id, session, cancel_event)
+                   for vacancy_id in ids}
+        details = {}
+        for vacancy_id, future in futures.items():
+            while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise hh_client.RequestCancelled()
+            details[vacancy_id] = future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    disk_cache.evict(cache_dir, max_cache_size, '.json')
+    return details
+
+
+def detail_row(fields):
+    """
+    Преобразует сведения о вакансии в значения столбцов DETAIL_COLUMNS.
+
+    Входные данные:
+    - fields: Словарь полей (см. extract_fields).
+
+    Выходные данные:
+    - Список значений в порядке DETAIL_COLUMNS.
+
+    Автор:
+    - Глинник Егор
+    """
+    return [fields["key_skills"], fields["description"], fields["salary_to"], fields["currency"]]
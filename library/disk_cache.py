@@ -0,0 +1,65 @@
+"""
+Модуль с общими функциями дисковых кэшей.
+
+Кэш ответов API (library.http_cache), кэш подробных сведений о вакансиях
+(library.details) и кэш графиков (library.chart_cache) хранят записи
+отдельными файлами в своих директориях. Размер каждого кэша ограничен:
+при превышении удаляются файлы, которые дольше всего не использовались.
+Время использования - время изменения файла, поэтому при чтении записи
+время изменения файла обновляется (os.utime).
+
+Функции:
+- evict(directory, max_size, suffix): Удаляет самые давно использованные файлы кэша.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import threading
+
+
+_lock = threading.Lock()
+
+
+def evict(directory, max_size, suffix):
+    """
+    Удаляет самые давно использованные файлы кэша, пока их общий размер
+    больше max_size.
+
+    Входные данные:
+    - directory: Директория кэша.
+    - max_size: Допустимый размер кэша в байтах.
+    - suffix: Окончание имен файлов записей (например, '.json');
+      остальные файлы (в том числе временные) не учитываются.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    with _lock:
+        try:
+            names = [name for name in os.listdir(directory) if name.endswith(suffix)]
+        except OSError:
+            return
+        files = []
+        total = 0
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -2,27 +2,33 @@
 Модуль для анализа данных о вакансиях и создания различных графиков.
 
 Этот модуль включает функции для:
-- Создания графиков зависимости количества вакансий от зарплаты.
+- Создания графиков зависимости количества вакансий от зарплаты (по корзинам зарплаты).
 - Создания графиков распределения количества вакансий по опыту работы, типу занятости и требованиям.
 - Возвращения списка технологий в зависимости от запроса.
 - Создания графиков распределения количества вакансий по уровням и специальностям.
 
 Функции:
-- create_salary_vs_vacancies_plot(df):
+- aggregate_*(...): Подготавливают небольшие таблицы данных для графиков
+(salary, experience, employment_type, requirements, levels, specialties).
+- draw_*(data, ax): Рисуют соответствующие графики по подготовленным данным
+(на переданных осях, например library.chart_panel, или на новой фигуре).
+- create_salary_vs_vacancies_plot(df, directory, show):
 Создает и сохраняет график зависимости количества вакансий от зарплаты.
-- create_experience_vs_vacancies_plot(df):
+- create_experience_vs_vacancies_plot(df, directory, show):
 Создает и сохраняет график распределения количества вакансий по опыту работы.
-- create_employment_type_vs_vacancies_plot(df):
+- create_employment_type_vs_vacancies_plot(df, directory, show):
 Создает и сохраняет график распределения количества вакансий по типу занятости.
 - stack(query):
 Возвращает список технологий в зависимости от запроса.
-- create_requirements_vs_vacancies_plot(df, query):
+- requirement_texts(df):
+Возвращает тексты требований вакансий с учетом подробных сведений.
+- create_requirements_vs_vacancies_plot(df, query, directory, show):
 Создает и сохраняет график распределения количества вакансий по требованиям.
-- create_level_vs_vacancies_plot(level_counts):
+- create_level_vs_vacancies_plot(level_counts, directory, show):
 Создает и сохраняет график распределения количества вакансий по уровням.
-- create_specialty_vs_vacancies_plot(specialty_counts):
+- create_specialty_vs_vacancies_plot(specialty_counts, directory, show):
 Создает и сохраняет график распределения количества вакансий по специальностям.
-- main():
+- main(data_dir, directory):
 Основная функция для анализа данных о вакансиях.
 
 Авторы:
@@ -31,6 +37,11 @@
 """
 import os
 import pandas as pd
+from library import dataset
+from library import chart_data
+from library import classifier
+from library import keyword_matcher
+from library import chart_cache
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -39,117 +50,303 @@ import seaborn as sns
 output_dir = os.path.join(os.path.dirname(__file__), '..', 'graphics')
 
 
-def create_salary_vs_vacancies_plot(df):
+def _finish_plot(filename, directory=None, show=True):
     """
-    Создает график зависимости количества вакансий от зарплаты.
+    Сохраняет текущий график, при необходимости показывает его и закрывает фигуру.
+
+    Входные данные:
+    filename (str): Имя файла графика.
+    directory (str): Директория для сохранения (по умолчанию output_dir).
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    str: Путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    output_path = os.path.join(directory or output_dir, filename)
+    plt.savefig(output_path, dpi=300)
+    if show:
+        plt.show()
+    plt.close()
+    return output_path
+
+
+def _axes(ax=None, figsize=(10, 6)):
+    """
+    Возвращает оси для рисования графика: переданные оси (например, оси
+    встроенной в окно фигуры library.chart_panel) или оси новой фигуры pyplot.
+
+    Входные данные:
+    ax (matplotlib.axes.Axes): Оси или None.
+    figsize (tuple): Размер новой фигуры в дюймах.
+
+    Выходные данные:
+    matplotlib.axes.Axes: Оси для рисования.
+
+    Автор:
+    - Елисеев Иван
+    """
+    if ax is None:
+        plt.figure(figsize=figsize)
+        ax = plt.gca()
+    return ax
+
+
+def _cached_plot(filename, key_parts, directory, show, draw):
+    """
+    Строит график с использованием кэша графиков (library.chart_cache).
+
+    Входные данные:
+    filename (str): Имя файла графика.
+    key_parts (tuple): Данные и параметры, от которых зависит график.
+    directory (str): Директория для сохранения (по умолчанию output_dir).
+    show (bool): Показывать ли график на экране.
+    draw: Функция без аргументов, которая рисует график.
+
+    Выходные данные:
+    str: Путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    def build():
+        draw()
+        return _finish_plot(filename, directory, show)
+
+    key = chart_cache.make_key(filename, *key_parts)
+    output_path = os.path.join(directory or output_dir, filename)
+    return chart_cache.cached_plot(key, output_path, show, build)
+
+
+def _count_values(series):
+    """
+    Считает количество вакансий для каждого значения столбца по убыванию.
+    """
+    counts = series.value_counts()
+    # У категориального столбца value_counts возвращает и неиспользуемые категории
+    # с нулевым количеством, а seaborn упорядочивает столбцы диаграммы по списку
+    # категорий; поэтому нули отбрасываются, а значения становятся обычными строками
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(object)
+    return counts
+
+
+def aggregate_salary(df):
+    """
+    Подготавливает данные для графика зависимости количества вакансий от зарплаты.
 
     Входные данные:
     df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
     Ожидается наличие столбца 'Зарплата'.
 
     Выходные данные:
-    Создается и сохраняется график в файле 'salary_vs_vacancies.png' в директории output.
-    График также отображается на экране.
+    pandas.DataFrame: Количество вакансий в каждой корзине зарплаты
+    (столбцы 'Зарплата' - подпись корзины, 'Количество вакансий');
+    границы корзин задаются в library.chart_data.
 
     Автор:
     - Елисеев Иван
     """
-    # Преобразование данных по зарплате в числовой формат
-    df['Зарплата'] = pd.to_numeric(df['Зарплата'], errors='coerce')
-    df.dropna(subset=['Зарплата'], inplace=True)
+    # Вместо каждого отдельного значения зарплаты - количество вакансий по корзинам
+    return chart_data.binned_counts(df, 'Зарплата')
 
-    # Подсчёт количества вакансий для каждой зарплаты
-    salary_counts = df['Зарплата'].value_counts().reset_index()
-    salary_counts.columns = ['Зарплата', 'Количество вакансий']
 
-    # Создание графика
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='Зарплата', y='Количество вакансий', data=salary_counts,
-                    s=100, color='blue', alpha=0.6, edgecolor='w')
+def draw_salary(salary_counts, ax=None):
+    """
+    Рисует гистограмму количества вакансий по корзинам зарплаты
+    на переданных осях (или новой фигуре) по подготовленным данным.
+
+    Входные данные:
+    salary_counts (pandas.DataFrame): Результат aggregate_salary.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Создание графика: по одному столбцу на корзину
+    ax = _axes(ax)
+    positions = range(len(salary_counts))
+    ax.bar(positions, salary_counts['Количество вакансий'], width=0.9, color='blue',
+           alpha=0.6, edgecolor='w')
+    ax.set_xticks(positions, salary_counts['Зарплата'], rotation=45, ha='right')
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по зарплате', fontsize=16)
-    plt.xlabel('Зарплата', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'salary_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по зарплате', fontsize=16)
+    ax.set_xlabel('Зарплата', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True, axis='y')
+    ax.figure.tight_layout()
 
 
-def create_experience_vs_vacancies_plot(df):
+def create_salary_vs_vacancies_plot(df, directory=None, show=True):
     """
-    Создает график распределения количества вакансий по опыту работы.
+    Создает график зависимости количества вакансий от зарплаты.
+
+    Входные данные:
+    df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
+    Ожидается наличие столбца 'Зарплата'.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    Создается и сохраняется график в файле 'salary_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если корзины зарплаты не изменились)
+    salary_counts = aggregate_salary(df)
+    return _cached_plot('salary_vs_vacancies.png', (salary_counts,), directory, show,
+                        lambda: draw_salary(salary_counts))
+
+
+def aggregate_experience(df):
+    """
+    Подготавливает данные для графика распределения количества вакансий по опыту работы.
 
     Входные данные:
     df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
     Ожидается наличие столбца 'Опыт работы'.
 
     Выходные данные:
-    Создается и сохраняется график в файле 'experience_vs_vacancies.png' в директории output.
-    График отображается на экране.
+    pandas.DataFrame: Количество вакансий для каждого значения опыта работы.
 
     Автор:
     - Елисеев Иван
     """
-    experience_counts = df['Опыт работы'].value_counts().reset_index()
+    experience_counts = _count_values(df['Опыт работы']).reset_index()
     experience_counts.columns = ['Опыт работы', 'Количество вакансий']
+    return experience_counts
 
+
+def draw_experience(experience_counts, ax=None):
+    """
+    Рисует график распределения количества вакансий по опыту работы
+    на переданных осях (или новой фигуре) по подготовленным данным.
+
+    Входные данные:
+    experience_counts (pandas.DataFrame): Результат aggregate_experience.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
     # Создание графика
-    plt.figure(figsize=(10, 6))
+    ax = _axes(ax)
     sns.barplot(x='Опыт работы', y='Количество вакансий', data=experience_counts,
-                hue='Опыт работы', dodge=False, palette='viridis', legend=False)
+                hue='Опыт работы', dodge=False, ax=ax, palette='viridis', legend=False)
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по опыту работы', fontsize=16)
-    plt.xlabel('Опыт работы', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'experience_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по опыту работы', fontsize=16)
+    ax.set_xlabel('Опыт работы', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True)
+    ax.figure.tight_layout()
 
 
-def create_employment_type_vs_vacancies_plot(df):
+def create_experience_vs_vacancies_plot(df, directory=None, show=True):
     """
-    Создает график распределения количества вакансий по типу занятости.
+    Создает график распределения количества вакансий по опыту работы.
+
+    Входные данные:
+    df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
+    Ожидается наличие столбца 'Опыт работы'.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    Создается и сохраняется график в файле 'experience_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если количество вакансий по опыту не изменилось)
+    experience_counts = aggregate_experience(df)
+    return _cached_plot('experience_vs_vacancies.png', (experience_counts,), directory, show,
+                        lambda: draw_experience(experience_counts))
+
+
+def aggregate_employment_type(df):
+    """
+    Подготавливает данные для графика распределения количества вакансий по типу занятости.
 
     Входные данные:
     df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
     Ожидается наличие столбца 'Тип занятости'.
 
     Выходные данные:
-    Создается и сохраняется график в файле 'employment_type_vs_vacancies.png' в директории output.
-    График отображается на экране.
+    pandas.DataFrame: Количество вакансий для каждого типа занятости.
 
     Автор:
     - Елисеев Иван
     """
-    employment_counts = df['Тип занятости'].value_counts().reset_index()
+    employment_counts = _count_values(df['Тип занятости']).reset_index()
     employment_counts.columns = ['Тип занятости', 'Количество вакансий']
+    return employment_counts
 
+
+def draw_employment_type(employment_counts, ax=None):
+    """
+    Рисует график распределения количества вакансий по типу занятости
+    на переданных осях (или новой фигуре) по подготовленным данным.
+
+    Входные данные:
+    employment_counts (pandas.DataFrame): Результат aggregate_employment_type.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
     # Создание графика
-    plt.figure(figsize=(10, 6))
+    ax = _axes(ax)
     sns.barplot(x='Тип занятости', y='Количество вакансий', data=employment_counts,
-                hue='Тип занятости', dodge=False, palette='plasma', legend=False)
+                hue='Тип занятости', dodge=False, ax=ax, palette='plasma', legend=False)
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по типу занятости', fontsize=16)
-    plt.xlabel('Тип занятости', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'employment_type_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по типу занятости', fontsize=16)
+    ax.set_xlabel('Тип занятости', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True)
+    ax.figure.tight_layout()
+
+
+def create_employment_type_vs_vacancies_plot(df, directory=None, show=True):
+    """
+    Создает график распределения количества вакансий по типу занятости.
+
+    Входные данные:
+    df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
+    Ожидается наличие столбца 'Тип занятости'.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    Создается и сохраняется график в файле 'employment_type_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если количество вакансий по типу занятости не изменилось)
+    employment_counts = aggregate_employment_type(df)
+    return _cached_plot('employment_type_vs_vacancies.png', (employment_counts,), directory,
+                        show, lambda: draw_employment_type(employment_counts))
 
 
 def stack(query: str) -> list:
@@ -206,132 +403,268 @@ def stack(query: str) -> list:
     return res_stack
 
 
-def create_requirements_vs_vacancies_plot(df, query):
+# Столбцы с текстами, в которых ищутся требования (подробные сведения есть,
+# если при поиске включена загрузка описаний вакансий)
+REQUIREMENT_COLUMNS = ['Требования', 'Ключевые навыки', 'Описание']
+
+
+def requirement_texts(df):
     """
-    Создает график распределения количества вакансий по требованиям.
+    Возвращает тексты требований вакансий с учетом подробных сведений.
 
     Входные данные:
     df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
-    Ожидается наличие столбца 'Требования'.
+    Ожидается наличие столбца 'Требования'; столбцы 'Ключевые навыки'
+    и 'Описание' учитываются, если они есть.
+
+    Выходные данные:
+    pandas.Series: Объединенный текст требований каждой вакансии.
+
+    Автор:
+    - Елисеев Иван
+    """
+    columns = [column for column in REQUIREMENT_COLUMNS if column in df.columns]
+    if len(columns) == 1:
+        return df[columns[0]]
+    return df[columns].fillna('').astype(str).agg(' '.join, axis=1)
+
+
+def aggregate_requirements(df, query):
+    """
+    Подготавливает данные для графика распределения количества вакансий по требованиям.
+
+    Входные данные:
+    df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
+    Ожидается наличие столбца 'Требования' (см. requirement_texts).
     query (str): Запрос, определяющий стек технологий для анализа.
 
     Выходные данные:
-    Создается и сохраняется график в файле 'requirements_vs_vacancies.png' в директории output.
-    График отображается на экране.
+    pandas.DataFrame: Количество вакансий для каждого требования.
 
     Автор:
     - Елисеев Иван
     """
     keywords = stack(query)
-    requirements_cnts = {keyword: df['Требования'].str.contains(keyword, case=False, na=False).sum()
-                           for keyword in keywords}
+    # Все ключевые слова ищутся за один проход по каждому тексту требований
+    requirements_cnts = keyword_matcher.keyword_counts(requirement_texts(df), keywords)
     requirements_cnts = pd.DataFrame(list(requirements_cnts.items()),
                                      columns=['Требование', 'Количество вакансий'])
+    return requirements_cnts
+
+
+def draw_requirements(requirements_cnts, ax=None):
+    """
+    Рисует график распределения количества вакансий по требованиям
+    на переданных осях (или новой фигуре) по подготовленным данным.
+
+    Входные данные:
+    requirements_cnts (pandas.DataFrame): Результат aggregate_requirements.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
 
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
     # Создание графика
-    plt.figure(figsize=(10, 6))
+    ax = _axes(ax)
     sns.barplot(x='Требование', y='Количество вакансий', data=requirements_cnts,
-                hue='Требование', dodge=False, palette='magma', legend=False)
+                hue='Требование', dodge=False, ax=ax, palette='magma', legend=False)
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по требованиям', fontsize=16)
-    plt.xlabel('Требование', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'requirements_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по требованиям', fontsize=16)
+    ax.set_xlabel('Требование', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True)
+    ax.figure.tight_layout()
 
 
-def create_level_vs_vacancies_plot(level_counts):
+def create_requirements_vs_vacancies_plot(df, query, directory=None, show=True):
     """
-    Создает график распределения количества вакансий по уровням.
+    Создает график распределения количества вакансий по требованиям.
+
+    Входные данные:
+    df (pandas.DataFrame): DataFrame, содержащий данные о вакансиях.
+    Ожидается наличие столбца 'Требования'.
+    query (str): Запрос, определяющий стек технологий для анализа.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    Создается и сохраняется график в файле 'requirements_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если количество вакансий по требованиям не изменилось)
+    requirements_cnts = aggregate_requirements(df, query)
+    return _cached_plot('requirements_vs_vacancies.png', (requirements_cnts,), directory, show,
+                        lambda: draw_requirements(requirements_cnts))
+
+
+def aggregate_levels(level_counts):
+    """
+    Подготавливает данные для графика распределения количества вакансий по уровням.
 
     Входные данные:
-    level_counts (dict): Словарь, содержащий количество вакансий для каждого уровня.
+    level_counts (list): Количество вакансий для каждого уровня
+    в порядке classifier.category_names('grades').
 
     Выходные данные:
-    Создается и сохраняется график в файле 'level_vs_vacancies.png' в директории output.
-    График отображается на экране.
+    pandas.DataFrame: Количество вакансий для каждого уровня.
 
     Автор:
     - Елисеев Иван
     """
-    levels = ['Junior-разработчик', 'Middle-разработчик', 'Senior-разработчик', 'Не указано']
+    levels = classifier.category_names('grades')
     level_data = pd.DataFrame({'Уровень': levels, 'Количество вакансий': level_counts})
+    return level_data
+
 
+def draw_levels(level_data, ax=None):
+    """
+    Рисует график распределения количества вакансий по уровням
+    на переданных осях (или новой фигуре) по подготовленным данным.
+
+    Входные данные:
+    level_data (pandas.DataFrame): Результат aggregate_levels.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
     # Создание графика
-    plt.figure(figsize=(10, 6))
+    ax = _axes(ax)
     sns.barplot(x='Уровень', y='Количество вакансий', data=level_data,
-                hue='Уровень', dodge=False, palette='coolwarm', legend=False)
+                hue='Уровень', dodge=False, ax=ax, palette='coolwarm', legend=False)
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по уровням', fontsize=16)
-    plt.xlabel('Уровень', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'level_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по уровням', fontsize=16)
+    ax.set_xlabel('Уровень', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True)
+    ax.figure.tight_layout()
 
 
-def create_specialty_vs_vacancies_plot(specialty_counts):
+def create_level_vs_vacancies_plot(level_counts, directory=None, show=True):
     """
-    Создает график распределения количества вакансий по специальностям.
+    Создает график распределения количества вакансий по уровням.
+
+    Входные данные:
+    level_counts (list): Количество вакансий для каждого уровня
+    в порядке classifier.category_names('grades').
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+
+    Выходные данные:
+    Создается и сохраняется график в файле 'level_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если данные и параметры не изменились)
+    return _cached_plot('level_vs_vacancies.png',
+                        (level_counts, classifier.category_names('grades')), directory, show,
+                        lambda: draw_levels(aggregate_levels(level_counts)))
+
+
+def aggregate_specialties(specialty_counts):
+    """
+    Подготавливает данные для графика распределения количества вакансий по специальностям.
 
     Входные данные:
-    specialty_counts (dict): Словарь, содержащий количество вакансий для каждой специальности.
+    specialty_counts (list): Количество вакансий для каждой специальности
+    в порядке classifier.category_names('posts').
 
     Выходные данные:
-    Создается и сохраняется график в файле 'specialty_vs_vacancies.png' в директории output.
-    График отображается на экране.
+    pandas.DataFrame: Количество вакансий для каждой специальности.
 
     Автор:
     - Елисеев Иван
     """
-    specialties = ['Backend-разработчик', 'Frontend-разработчик',
-                   'QA-инженер', 'Аналитик', 'Mobile-разработчик']
+    specialties = classifier.category_names('posts')
     specialty_data = pd.DataFrame({'Специальность': specialties,
                                    'Количество вакансий': specialty_counts})
+    return specialty_data
+
+
+def draw_specialties(specialty_data, ax=None):
+    """
+    Рисует график распределения количества вакансий по специальностям
+    на переданных осях (или новой фигуре) по подготовленным данным.
 
+    Входные данные:
+    specialty_data (pandas.DataFrame): Результат aggregate_specialties.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
     # Создание графика
-    plt.figure(figsize=(10, 6))
+    ax = _axes(ax)
     sns.barplot(x='Специальность', y='Количество вакансий', data=specialty_data,
-                hue='Специальность', dodge=False, palette='cubehelix', legend=False)
+                hue='Специальность', dodge=False, ax=ax, palette='cubehelix', legend=False)
 
     # Настройка графика
-    plt.title('Распределение количества вакансий по специальностям', fontsize=16)
-    plt.xlabel('Специальность', fontsize=14)
-    plt.ylabel('Количество вакансий', fontsize=14)
-    plt.grid(True)
-    plt.tight_layout()
-
-    # Сохранение графика
-    output_path = os.path.join(output_dir, 'specialty_vs_vacancies.png')
-    plt.savefig(output_path, dpi=300)
-    plt.show()
+    ax.set_title('Распределение количества вакансий по специальностям', fontsize=16)
+    ax.set_xlabel('Специальность', fontsize=14)
+    ax.set_ylabel('Количество вакансий', fontsize=14)
+    ax.grid(True)
+    ax.figure.tight_layout()
+
 
+def create_specialty_vs_vacancies_plot(specialty_counts, directory=None, show=True):
+    """
+    Создает график распределения количества вакансий по специальностям.
+
+    Входные данные:
+    specialty_counts (list): Количество вакансий для каждой специальности
+    в порядке classifier.category_names('posts').
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
-def main():
+    Выходные данные:
+    Создается и сохраняется график в файле 'specialty_vs_vacancies.png' в директории directory.
+    Если show=True, график отображается на экране.
+    Возвращается путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если данные и параметры не изменились)
+    return _cached_plot('specialty_vs_vacancies.png',
+                        (specialty_counts, classifier.category_names('posts')), directory, show,
+                        lambda: draw_specialties(aggregate_specialties(specialty_counts)))
+
+
+def main(data_dir=dataset.DATA_DIR, directory=None):
     """
     Основная функция для анализа данных о вакансиях.
 
-    Возвращает DataFrame, содержащий данные о вакансиях из файла 'data.xlsx'.
+    Входные данные:
+    data_dir (str): Директория с данными.
+    directory (str): Директория для сохранения графиков (по умолчанию 'graphics').
+
+    Возвращает DataFrame, содержащий данные о вакансиях из файла 'data.parquet'
+    (или 'data.xlsx', если колоночного файла нет).
 
     Автор:
     - Елисеев Иван
     """
-    # Чтение данных из файла Excel
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.xlsx')
-    df = pd.read_excel(file_path)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Чтение данных (Parquet, при его отсутствии - Excel)
+    df = dataset.get_dataset(data_dir)
+    os.makedirs(directory or output_dir, exist_ok=True)
     return df
 
 
@@ -0,0 +1,341 @@
+"""
+Модуль для отправки запросов к API hh.ru с ограничением частоты и повторами.
+
+Все запросы к API проходят через функцию get, которая:
+- задает таймауты на установку соединения и чтение ответа;
+- ограничивает частоту запросов "корзиной токенов" (TokenBucket):
+  в среднем не больше rate запросов в секунду, кратковременно - до burst;
+- ограничивает количество одновременных запросов адаптивно (AIMD):
+  после каждого успешного ответа (2xx или 304) допустимое количество
+  плавно растет, после ответа 429 или 503 уменьшается вдвое, а после
+  ошибок соединения, таймаутов и остальных ошибок не меняется;
+- повторяет запросы при ответах 429 и 5xx и ошибках соединения с
+  экспоненциально растущей паузой со случайным разбросом (jitter);
+  если сервер прислал заголовок Retry-After, пауза не меньше указанной.
+  Если передано событие отмены, пауза прерывается при его установке.
+
+Ограничители общие для всех потоков и сессий процесса, поэтому несколько
+параллельных поисков (например, в batch.py) вместе не превышают лимит API.
+
+Функции:
+- configure(...): Изменяет настройки клиента.
+- retry_after(response): Возвращает паузу из заголовка Retry-After.
+- backoff_delay(attempt): Возвращает паузу перед повторной попыткой.
+- get(session, url, params, headers, cancel_event): Выполняет GET-запрос с повторами.
+
+Классы:
+- TokenBucket: Ограничитель частоты запросов.
+- AdaptiveLimiter: Адаптивный ограничитель количества одновременных запросов.
+
+Исключения:
+- HHApiError: Сервер вернул ошибку или повторные попытки исчерпаны.
+- RequestCancelled: Запрос отменен событием отмены.
+
+Автор:
+- Глинник Егор
+"""
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+
+
+# Таймауты на установку соединения и чтение ответа, в секундах
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+# Средняя и пиковая частота запросов
+RATE = 10
+BURST = 10
+# Пределы количества одновременных запросов
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+# Количество повторных попыток и пределы паузы между ними, в секундах
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+# Коды ответа, при которых запрос повторяется
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Коды ответа, означающие перегрузку: количество одновременных запросов уменьшается
+THROTTLE_STATUSES = (429, 503)
+# Результаты запроса для AdaptiveLimiter.release
+OK = 'ok'
+THROTTLED = 'throttled'
+FAILED = 'failed'
+
+
+class HHApiError(Exception):
+    """
+    Исключение, которое возникает, если сервер вернул ошибку
+    или повторные попытки исчерпаны.
+
+    Атрибуты:
+    - status: Код ответа (None при ошибке соединения).
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RequestCancelled(Exception):
+    """
+    Исключение, которое возникает, если запрос отменен событием отмены
+    (до отправки запроса или во время паузы перед повторной попыткой).
+
+    Автор:
+    - Глинник Егор
+    """
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты запросов ("корзина токенов").
+
+    Входные данные:
+    - rate: Количество токенов, добавляемых в секунду.
+    - capacity: Максимальное количество накопленных токенов.
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Забирает токен, при необходимости ожидая его появления.
+        """
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """
+    Адаптивный ограничитель количества одновременных запросов (AIMD).
+
+    Допустимое количество одновременных запросов увеличивается на
+    1/limit после каждого успешного ответа (примерно на 1 за "окно"
+    запросов) и уменьшается вдвое при перегрузке сервера, но не чаще
+    одного раза в cooldown секунд: ответы на запросы, отправленные до
+    уменьшения, не уменьшают его повторно. Неудачные запросы (ошибки
+    соединения, таймауты, остальные коды ошибок) лимит не меняют.
+
+    Входные данные:
+    - minimum: Минимальное количество одновременных запросов.
+    - maximum: Максимальное количество одновременных запросов.
+    - cooldown: Минимальный интервал между уменьшениями, в секундах.
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, minimum, maximum, cooldown=1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Занимает место для запроса, ожидая, пока количество запросов меньше лимита.
+        """
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, outcome=OK):
+        """
+        Освобождает место и изменяет лимит по результату запроса.
+
+        Входные данные:
+        - outcome: Результат запроса: OK (ответ 2xx или 304) увеличивает лимит,
+          THROTTLED (сервер сообщил о перегрузке, 429 или 503) уменьшает его,
+          FAILED (остальные ошибки) оставляет без изменений.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == THROTTLED:
+                if now - self.last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.last_decrease = now
+            elif outcome == OK:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+
+_bucket = TokenBucket(RATE, BURST)
+_limiter = AdaptiveLimiter(MIN_CONCURRENCY, MAX_CONCURRENCY)
+
+
+def configure(rate=None, burst=None, max_concurrency=None, connect_timeout=None,
+              read_timeout=None, max_retries=None):
+    """
+    Изменяет настройки клиента.
+
+    Входные данные:
+    - rate: Средняя частота запросов в секунду (0 - без ограничения).
+    - burst: Пиковое количество запросов подряд.
+    - max_concurrency: Максимальное количество одновременных запросов.
+    - connect_timeout: Таймаут установки соединения, в секундах.
+    - read_timeout: Таймаут чтения ответа, в секундах.
+    - max_retries: Количество повторных попыток.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global _bucket, _limiter, CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES
+    if rate is not None or burst is not None:
+        _bucket = TokenBucket(_bucket.rate if rate is None else rate,
+                              _bucket.capacity if burst is None else burst)
+    if max_concurrency is not None:
+        _limiter = AdaptiveLimiter(MIN_CONCURRENCY, max_concurrency)
+    if connect_timeout is not None:
+        CONNECT_TIMEOUT = connect_timeout
+    if read_timeout is not None:
+        READ_TIMEOUT = read_timeout
+    if max_retries is not None:
+        MAX_RETRIES = max_retries
+
+
+def retry_after(response):
+    """
+    Возвращает паузу из заголовка Retry-After.
+
+    Входные данные:
+    - response: Ответ сервера.
+
+    Выходные данные:
+    - Пауза в секундах или None, если заголовка нет или он некорректен.
+
+    Автор:
+    - Глинник Егор
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt):
+    """
+    Возвращает паузу перед повторной попыткой.
+
+    Пауза выбирается случайно от 0 до BACKOFF_BASE * 2^attempt
+    (но не больше BACKOFF_MAX), чтобы повторные запросы из разных потоков
+    не приходили на сервер одновременно.
+
+    Входные данные:
+    - attempt: Номер попытки, начиная с 0.
+
+    Выходные данные:
+    - Пауза в секундах.
+
+    Автор:
+    - Глинник Егор
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise RequestCancelled()
+
+
+def get(session, url, params=None, headers=None, cancel_event=None):
+    """
+    Выполняет GET-запрос с таймаутами, ограничением частоты и повторами.
+
+    Входные данные:
+    - session: HTTP-сессия (requests.Session или модуль requests).
+    - url: Адрес запроса.
+    - params: Словарь параметров запроса.
+    - headers: Словарь заголовков запроса.
+    - cancel_event: Событие threading.Event; проверяется перед каждой
+      попыткой, а пауза перед повторной попыткой прерывается при его установке.
+
+    Выходные данные:
+    - response: Ответ сервера с кодом 2xx или 304.
+
+    Исключения:
+    - HHApiError: Ответ с ошибкой, которую не имеет смысла повторять,
+      или повторные попытки исчерпаны.
+    - RequestCancelled: Событие отмены установлено.
+
+    Автор:
+    - Глинник Егор
+    """
+    client = session if session is not None else requests
+    attempt = 0
+    while True:
+        _check_cancel(cancel_event)
+        _bucket.acquire()
+        limiter = _limiter
+        limiter.acquire()
+        # Любой выход без ответа 2xx или 304 (в том числе исключение) - неудача
+        outcome = FAILED
+        try:
+            response = client.get(url, params=params, headers=headers,
+                                  timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = HHApiError(f"Ошибка соединения с {url}: {e}")
+            delay = None
+        else:
+            if response.ok or response.status_code == 304:
+                outcome = OK
+                return response
+            if response.status_code in THROTTLE_STATUSES:
+                outcome = THROTTLED
+            error = HHApiError(f"Сервер вернул код {response.status_code} для {url}",
+                               response.status_code)
+            if response.status_code not in RETRY_STATUSES:
+                raise error
+            delay = retry_after(response)
+        finally:
+            limiter.release(outcome)
+
+        if attempt >= MAX_RETRIES:
+            raise error
+        pause = backoff_delay(attempt)
+        if delay is not None:
+            pause = max(pause, min(delay, BACKOFF_MAX))
+        if cancel_event is None:
+            time.sleep(pause)
+        elif cancel_event.wait(pause):
+            raise RequestCancelled()
+        attempt += 1
@@ -0,0 +1,518 @@
+"""
+Модуль для хранения истории поисков в базе данных SQLite.
+
+Файлы data/data.* перезаписываются при каждом поиске, а история
+(data/history.sqlite) пополняется: каждый поиск добавляет запись в таблицу
+runs и снимок всех полученных вакансий в таблицу snapshots с временем
+загрузки. Инкрементальный поиск (library.refresh) записывает снимок всей
+объединенной таблицы - новых и ранее сохраненных вакансий, поэтому
+количество вакансий и зарплаты в сводках не падают после обновления
+только новыми вакансиями. По истории строятся сводки (динамика зарплат, количество
+вакансий, активность работодателей), которые считаются запросами SQL,
+поэтому для них не нужно загружать всю историю в pandas.
+
+Строки записываются пачками: одна пачка - одна транзакция (executemany).
+Таблица snapshots проиндексирована по (query, fetched_at), vacancy_id
+и employer. Запрос хранится в нормализованном виде (нижний регистр,
+одиночные пробелы), чтобы поиски "Python" и "python " попадали в одну историю.
+
+Время загрузки (fetched_at) хранится в UTC, поэтому строки времени можно
+сравнивать и сортировать как строки; по периодам (день, неделя, месяц)
+снимки группируются по местному времени. Сводки и чтение снимков учитывают
+только завершенные поиски (runs.status = 'done'): снимки поиска, который
+прервался ошибкой ('failed') или аварийно и остался в состоянии 'running',
+хранятся, но в них не попадают.
+
+Функции:
+- normalize_query(query): Приводит запрос к виду, в котором он хранится в истории.
+- connect(path): Открывает базу данных истории и создает таблицы и индексы.
+- utc_timestamp(value): Возвращает время в формате TIMESTAMP_FORMAT в UTC.
+- runs(path, query, limit): Возвращает последние поиски.
+- salary_trend(path, query, city, period): Возвращает динамику зарплат.
+- vacancy_counts(path, query, city, period): Возвращает количество новых
+  и всех вакансий по периодам.
+- employer_activity(path, query, since, limit): Возвращает работодателей
+  с наибольшим количеством новых вакансий.
+- vacancy_history(path, vacancy_id): Возвращает все снимки одной вакансии.
+- iter_batches(path, query, batch_size): Читает снимки вакансий пачками строк
+  со столбцами таблицы вакансий.
+
+Классы:
+- HistoryWriter: Запись снимка вакансий одного поиска.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+import pandas as pd
+from library import schema
+
+
+HISTORY_NAME = 'history.sqlite'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+# Форматы strftime для группировки по периодам
+PERIODS = {
+    'day': '%Y-%m-%d',
+    'week': '%Y-%W',
+    'month': '%Y-%m',
+}
+
+# Столбцы таблицы вакансий и соответствующие им поля снимков
+DATASET_COLUMNS = {
+    'Город': 'vacancy_city',
+    'Название вакансии': 'title',
+    'Зарплата': 'salary',
+    'Название работодателя': 'employer',
+    'Опыт работы': 'experience',
+    'Требования': 'requirements',
+    'Тип занятости': 'employment_type',
+    'Наличие теста для кандидатов': 'has_test',
+    'График работы': 'schedule',
+    'ПК': 'vacancy_id',
+}
+# Количество строк в пачке при чтении истории по частям
+BATCH_ROWS = 65536
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    city TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    vacancy_id INTEGER,
+    query TEXT NOT NULL,
+    city TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    vacancy_city TEXT,
+    title TEXT,
+    salary INTEGER,
+    employer TEXT,
+    experience TEXT,
+    requirements TEXT,
+    employment_type TEXT,
+    has_test TEXT,
+    schedule TEXT,
+    published_at TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_query_fetched ON snapshots(query, fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_vacancy ON snapshots(vacancy_id);
+CREATE INDEX IF NOT EXISTS snapshots_employer ON snapshots(employer);
+CREATE INDEX IF NOT EXISTS runs_query_fetched ON runs(query, fetched_at);
+"""
+
+# Снимки завершенных поисков; используется вместо таблицы snapshots в запросах чтения
+DONE_SNAPSHOTS = (
+    "(SELECT snapshots.* FROM snapshots JOIN runs ON runs.run_id = snapshots.run_id"
+    " WHERE runs.status = 'done')"
+)
+
+INSERT_SNAPSHOT = """
+INSERT INTO snapshots (
+    run_id, vacancy_id, query, city, fetched_at, vacancy_city, title, salary, employer,
+    experience, requirements, employment_type, has_test, schedule, published_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def normalize_query(query):
+    """
+    Приводит запрос к виду, в котором он хранится в истории.
+
+    Входные данные:
+    - query: Строка с запросом.
+
+    Выходные данные:
+    - Строка в нижнем регистре без лишних пробелов.
+
+    Автор:
+    - Глинник Егор
+    """
+    return ' '.join(query.lower().split())
+
+
+def connect(path):
+    """
+    Открывает базу данных истории и создает таблицы и индексы, если их нет.
+
+    Используется журнал WAL: чтение сводок не блокирует запись нового поиска.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+
+    Выходные данные:
+    - conn (sqlite3.Connection): Соединение с базой данных.
+
+    Автор:
+    - Глинник Егор
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def utc_timestamp(value=None):
+    """
+    Возвращает время в формате TIMESTAMP_FORMAT в UTC.
+
+    Входные данные:
+    - value: datetime (без часового пояса - местное время) или строка
+      в формате TIMESTAMP_FORMAT; None - текущее время.
+
+    Выходные данные:
+    - Строка вида 2024-01-31T07:00:00+0000.
+
+    Автор:
+    - Глинник Егор
+    """
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.strptime(value, TIMESTAMP_FORMAT)
+    return value.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class HistoryWriter:
+    """
+    Запись снимка вакансий одного поиска.
+
+    При создании добавляет запись о поиске в таблицу runs со статусом
+    'running'; close отмечает поиск как завершенный, abort удаляет поиск
+    вместе с уже записанными вакансиями или отмечает его как прерванный.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом.
+    - city: Строка с названием города (пустая строка - любой город).
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, path, query, city):
+        self.conn = connect(path)
+        self.query = normalize_query(query)
+        self.city = city
+        self.fetched_at = utc_timestamp()
+        self.rows = 0
+        with self.conn:
+            self.run_id = self.conn.execute(
+                'INSERT INTO runs (query, city, fetched_at, status) VALUES (?, ?, ?, ?)',
+                (self.query, self.city, self.fetched_at, 'running')
+            ).lastrowid
+
+    def write(self, records):
+        """
+        Записывает пачку вакансий одной транзакцией.
+
+        Входные данные:
+        - records: Список словарей с полями вакансии (library.parser.iter_vacancies).
+        """
+        if not records:
+            return
+        with self.conn:
+            self.conn.executemany(INSERT_SNAPSHOT, [
+                (self.run_id, _to_int(record["id"]), self.query, self.city, self.fetched_at,
+                 record["city"], record["title"], _to_int(record["salary"]),
+                 record["employer_name"], record["experience"], record["requirements"],
+                 record["employment_type"], record["has_test"], record["schedule"],
+                 record.get("published_at"))
+                for record in records
+            ])
+        self.rows += len(records)
+
+    def write_rows(self, rows, columns):
+        """
+        Записывает пачку строк таблицы вакансий одной транзакцией (например,
+        ранее сохраненные вакансии, которыми дополнен инкрементальный поиск).
+
+        Входные данные:
+        - rows: Список строк таблицы вакансий.
+        - columns: Названия столбцов в порядке значений строки; столбцы не из
+          DATASET_COLUMNS пропускаются, без столбца "Город" используется
+          город поиска. Время публикации в таблице не хранится и не записывается.
+        """
+        if not rows:
+            return
+        positions = {DATASET_COLUMNS[column]: i for i, column in enumerate(columns)
+                     if column in DATASET_COLUMNS}
+
+        def field(row, name, default=None):
+            return row[positions[name]] if name in positions else default
+
+        with self.conn:
+            self.conn.executemany(INSERT_SNAPSHOT, [
+                (self.run_id, _to_int(field(row, 'vacancy_id')), self.query, self.city,
+                 self.fetched_at, field(row, 'vacancy_city', self.city), field(row, 'title'),
+                 _to_int(field(row, 'salary')), field(row, 'employer'), field(row, 'experience'),
+                 field(row, 'requirements'), field(row, 'employment_type'),
+                 field(row, 'has_test'), field(row, 'schedule'), None)
+                for row in rows
+            ])
+        self.rows += len(rows)
+
+    def close(self):
+        """
+        Отмечает поиск как завершенный и закрывает соединение.
+        """
+        try:
+            with self.conn:
+                self.conn.execute('UPDATE runs SET rows = ?, status = ? WHERE run_id = ?',
+                                  (self.rows, 'done', self.run_id))
+        finally:
+            self.conn.close()
+
+    def abort(self, keep_partial=False):
+        """
+        Удаляет поиск вместе с записанными вакансиями и закрывает соединение.
+        При keep_partial записанные вакансии сохраняются, а поиск отмечается
+        статусом 'failed' (в сводки такие поиски не попадают).
+        """
+        try:
+            with self.conn:
+                if keep_partial:
+                    self.conn.execute('UPDATE runs SET rows = ?, status = ? WHERE run_id = ?',
+                                      (self.rows, 'failed', self.run_id))
+                else:
+                    self.conn.execute('DELETE FROM runs WHERE run_id = ?', (self.run_id,))
+        finally:
+            self.conn.close()
+
+
+def _query(path, sql, params):
+    if not os.path.exists(path):
+        return []
+    conn = connect(path)
+    try:
+        conn.row_factory = sqlite3.Row
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def _city_filter(city, params):
+    if city is None:
+        return ''
+    params['city'] = city
+    return ' AND city = :city'
+
+
+def runs(path, query=None, limit=20):
+    """
+    Возвращает последние завершенные поиски.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом (None - все запросы).
+    - limit: Максимальное количество поисков.
+
+    Выходные данные:
+    - Список словарей {run_id, query, city, fetched_at, rows}, новые первыми.
+
+    Автор:
+    - Глинник Егор
+    """
+    params = {'limit': limit}
+    where = "status = 'done'"
+    if query is not None:
+        params['query'] = normalize_query(query)
+        where += ' AND query = :query'
+    return _query(
+        path,
+        f'SELECT run_id, query, city, fetched_at, rows FROM runs WHERE {where} '
+        'ORDER BY fetched_at DESC, run_id DESC LIMIT :limit',
+        params
+    )
+
+
+def salary_trend(path, query, city=None, period='day'):
+    """
+    Возвращает динамику зарплат по периодам.
+
+    Вакансия, попавшая в несколько поисков одного периода, учитывается один раз.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом.
+    - city: Строка с названием города (None - все поиски по запросу).
+    - period: Период группировки ('day', 'week', 'month').
+
+    Выходные данные:
+    - Список словарей {period, vacancies, salary_min, salary_avg, salary_max}.
+
+    Автор:
+    - Глинник Егор
+    """
+    params = {'format': PERIODS[period], 'query': normalize_query(query)}
+    city_sql = _city_filter(city, params)
+    return _query(
+        path,
+        'SELECT period, COUNT(*) AS vacancies, MIN(salary) AS salary_min, '
+        'AVG(salary) AS salary_avg, MAX(salary) AS salary_max FROM ('
+        "  SELECT strftime(:format, substr(fetched_at, 1, 19), 'localtime') AS period,"
+        '         vacancy_id, MAX(salary) AS salary'
+        f'  FROM {DONE_SNAPSHOTS} WHERE query = :query{city_sql}'
+        '  GROUP BY period, vacancy_id'
+        ') GROUP BY period ORDER BY period',
+        params
+    )
+
+
+def vacancy_counts(path, query, city=None, period='day'):
+    """
+    Возвращает количество вакансий по периодам: всего и впервые замеченных.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом.
+    - city: Строка с названием города (None - все поиски по запросу).
+    - period: Период группировки ('day', 'week', 'month').
+
+    Выходные данные:
+    - Список словарей {period, vacancies, new_vacancies}.
+
+    Автор:
+    - Глинник Егор
+    """
+    params = {'format': PERIODS[period], 'query': normalize_query(query)}
+    city_sql = _city_filter(city, params)
+    return _query(
+        path,
+        'WITH seen AS ('
+        "  SELECT strftime(:format, substr(fetched_at, 1, 19), 'localtime') AS period,"
+        '         vacancy_id'
+        f'  FROM {DONE_SNAPSHOTS} WHERE query = :query{city_sql}'
+        '  GROUP BY period, vacancy_id'
+        '), first AS ('
+        "  SELECT vacancy_id,"
+        "         strftime(:format, substr(MIN(fetched_at), 1, 19), 'localtime') AS period"
+        f'  FROM {DONE_SNAPSHOTS} WHERE query = :query{city_sql}'
+        '  GROUP BY vacancy_id'
+        ') '
+        'SELECT seen.period AS period, COUNT(*) AS vacancies,'
+        '       SUM(first.period = seen.period) AS new_vacancies '
+        'FROM seen JOIN first USING (vacancy_id) GROUP BY seen.period ORDER BY seen.period',
+        params
+    )
+
+
+def employer_activity(path, query=None, since=None, limit=10):
+    """
+    Возвращает работодателей с наибольшим количеством новых вакансий
+    (скорость найма).
+
+    Новой считается вакансия, впервые замеченная не раньше since.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом (None - все запросы).
+    - since: Время в формате TIMESTAMP_FORMAT или datetime (None - вся история);
+      сравнивается со временем загрузки после перевода в UTC.
+    - limit: Максимальное количество работодателей.
+
+    Выходные данные:
+    - Список словарей {employer, new_vacancies, salary_avg, first_seen, last_seen}.
+
+    Автор:
+    - Глинник Егор
+    """
+    params = {'limit': limit}
+    where = having = ''
+    if query is not None:
+        params['query'] = normalize_query(query)
+        where = 'WHERE query = :query'
+    if since is not None:
+        params['since'] = utc_timestamp(since)
+        having = 'HAVING MIN(fetched_at) >= :since'
+    return _query(
+        path,
+        'SELECT employer, COUNT(*) AS new_vacancies, AVG(salary) AS salary_avg,'
+        '       MIN(first_seen) AS first_seen, MAX(last_seen) AS last_seen FROM ('
+        '  SELECT vacancy_id, employer, MAX(salary) AS salary,'
+        '         MIN(fetched_at) AS first_seen, MAX(fetched_at) AS last_seen'
+        f'  FROM {DONE_SNAPSHOTS} {where} GROUP BY vacancy_id, employer {having}'
+        ') GROUP BY employer ORDER BY new_vacancies DESC, employer LIMIT :limit',
+        params
+    )
+
+
+def vacancy_history(path, vacancy_id):
+    """
+    Возвращает все снимки одной вакансии (например, для отслеживания
+    изменения зарплаты).
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - vacancy_id: Идентификатор вакансии hh.ru.
+
+    Выходные данные:
+    - Список словарей {fetched_at, query, city, title, salary, employer} по времени загрузки.
+
+    Автор:
+    - Глинник Егор
+    """
+    return _query(
+        path,
+        f'SELECT fetched_at, query, city, title, salary, employer FROM {DONE_SNAPSHOTS} '
+        'WHERE vacancy_id = ? ORDER BY fetched_at',
+        (_to_int(vacancy_id),)
+    )
+
+
+def iter_batches(path, query=None, batch_size=BATCH_ROWS):
+    """
+    Читает снимки вакансий пачками строк со столбцами таблицы вакансий.
+
+    В памяти находится только одна пачка, поэтому по всей истории можно
+    считать статистику (library.streaming_stats) без загрузки ее целиком.
+    Столбцы приводятся к типам library.schema.
+
+    Входные данные:
+    - path: Путь к файлу базы данных.
+    - query: Строка с запросом (None - вся история).
+    - batch_size: Количество строк в пачке.
+
+    Выходные данные:
+    - Генератор pandas.DataFrame со столбцами DATASET_COLUMNS.
+
+    Автор:
+    - Глинник Егор
+    """
+    if not os.path.exists(path):
+        return
+    columns = list(DATASET_COLUMNS)
+    sql = 'SELECT ' + ', '.join(DATASET_COLUMNS.values()) + ' FROM ' + DONE_SNAPSHOTS
+    params = {}
+    if query is not None:
+        sql += ' WHERE query = :query'
+        params['query'] = normalize_query(query)
+    conn = connect(path)
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield schema.apply_schema(pd.DataFrame.from_records(rows, columns=columns))
+    finally:
+        conn.close()
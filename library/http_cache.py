@@ -0,0 +1,190 @@
+"""
+Модуль для кэширования ответов API hh.ru на диске.
+
+Ответы хранятся в виде JSON-файлов в директории cache/http. Ключ записи
+строится по адресу и параметрам запроса (текст запроса, страница, регион),
+поэтому повторный поиск с теми же параметрами читается с диска без обращения
+к сети. Свежесть записи определяется временем жизни (TTL); устаревшая запись
+перепроверяется на сервере условным запросом (If-None-Match /
+If-Modified-Since), и при ответе 304 тело берется из кэша. Общий размер кэша
+ограничен: при превышении удаляются записи, которые дольше всего не читались.
+
+Функции:
+- configure(ttl, max_size, cache_dir): Изменяет настройки кэша.
+- make_key(url, params): Возвращает ключ записи кэша для запроса.
+- load_entry(key, directory): Читает запись кэша.
+- store_entry(key, entry, directory): Сохраняет запись кэша.
+- cached_get_json(session, url, params, ttl, cancel_event): Выполняет GET-запрос
+  с использованием кэша.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from library import hh_client
+from library import disk_cache
+
+
+cache_dir = os.path.join(os.path.dirname(__file__), '..', 'cache', 'http')
+# Время жизни записи в секундах (0 отключает кэш)
+ttl_seconds = 3600
+# Максимальный размер кэша в байтах
+max_cache_size = 50 * 1024 * 1024
+
+
+def configure(ttl=None, max_size=None, directory=None):
+    """
+    Изменяет настройки кэша.
+
+    Входные данные:
+    - ttl: Время жизни записи в секундах.
+    - max_size: Максимальный размер кэша в байтах.
+    - directory: Директория для хранения записей.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global ttl_seconds, max_cache_size, cache_dir
+    if ttl is not None:
+        ttl_seconds = ttl
+    if max_size is not None:
+        max_cache_size = max_size
+    if directory is not None:
+        cache_dir = directory
+
+
+def make_key(url, params):
+    """
+    Возвращает ключ записи кэша для запроса.
+
+    Входные данные:
+    - url: Адрес запроса.
+    - params: Словарь параметров запроса.
+
+    Выходные данные:
+    - key: Строка с хэшем адреса и отсортированных параметров.
+
+    Автор:
+    - Глинник Егор
+    """
+    raw = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _entry_path(key, directory=None):
+    return os.path.join(directory or cache_dir, f"{key}.json")
+
+
+def load_entry(key, directory=None):
+    """
+    Читает запись кэша и отмечает ее как недавно использованную.
+
+    Входные данные:
+    - key: Ключ записи.
+    - directory: Директория кэша (по умолчанию кэш ответов API).
+
+    Выходные данные:
+    - entry: Словарь с полями body, etag, last_modified, stored_at
+      или None, если записи нет.
+
+    Автор:
+    - Глинник Егор
+    """
+    path = _entry_path(key, directory)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def store_entry(key, entry, directory=None):
+    """
+    Сохраняет запись кэша (атомарно: через временный файл).
+
+    Входные данные:
+    - key: Ключ записи.
+    - entry: Словарь с данными записи (записывается в JSON).
+    - directory: Директория кэша (по умолчанию кэш ответов API).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    directory = directory or cache_dir
+    os.makedirs(directory, exist_ok=True)
+    path = _entry_path(key, directory)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def cached_get_json(session, url, params, ttl=None, cancel_event=None):
+    """
+    Выполняет GET-запрос с использованием дискового кэша.
+
+    Свежая запись возвращается без обращения к сети. Для устаревшей записи
+    отправляется условный запрос с ETag и Last-Modified; при ответе 304
+    запись продлевается и возвращается из кэша. Запросы отправляются через
+    library.hh_client (таймауты, ограничение частоты, повторы).
+
+    Входные данные:
+    - session: HTTP-сессия (requests.Session или модуль requests).
+    - url: Адрес запроса.
+    - params: Словарь параметров запроса.
+    - ttl: Время жизни записи в секундах (по умолчанию из настроек модуля).
+    - cancel_event: Событие отмены, передаваемое hh_client.get.
+
+    Выходные данные:
+    - JSON-ответ сервера.
+
+    Автор:
+    - Глинник Егор
+    """
+    if ttl is None:
+        ttl = ttl_seconds
+    if ttl <= 0:
+        return hh_client.get(session, url, params, cancel_event=cancel_event).json()
+
+    key = make_key(url, params)
+    entry = load_entry(key)
+    headers = {}
+    if entry is not None:
+        if time.time() - entry.get('stored_at', 0) < ttl:
+            return entry['body']
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = hh_client.get(session, url, params, headers, cancel_event)
+    if response.status_code == 304 and entry is not None:
+        entry['stored_at'] = time.time()
+        store_entry(key, entry)
+        return entry['body']
+
+    body = response.json()
+    if response.ok:
+        store_entry(key, {
+            'url': url,
+            'params': params,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'stored_at': time.time(),
+            'body': body,
+        })
+        disk_cache.evict(cache_dir, max_cache_size, '.json')
+    return body
@@ -0,0 +1,184 @@
+"""
+Модуль для поиска множества ключевых слов в текстах требований за один проход.
+
+Ключевые слова собираются в префиксное дерево, которое превращается в одно
+регулярное выражение вида (?=java()(?:script())?|sql()|...). Пустые группы
+отмечают концы слов, а опережающая проверка (?=...) позволяет найти все
+вхождения, в том числе пересекающиеся (например, "Java" внутри
+"JavaScript"). Каждый текст просматривается один раз, независимо от
+количества ключевых слов; поиск не зависит от регистра, ключевые слова
+ищутся как обычные подстроки (без интерпретации как регулярных выражений).
+
+Функции:
+- compile_keywords(keywords): Компилирует список ключевых слов в одно выражение.
+- find_keywords(text, compiled): Возвращает номера ключевых слов, найденных в тексте.
+- match_keywords(texts, keywords): Возвращает количество текстов для каждого
+  ключевого слова и разреженную матрицу совпадений.
+- keyword_counts(texts, keywords): Возвращает словарь "ключевое слово -> количество текстов".
+- keyword_matrix(texts, keywords): Возвращает разреженную таблицу "вакансия x ключевое слово".
+
+Автор:
+- Елисеев Иван
+"""
+
+import re
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+
+_END = ''
+
+
+def _build_trie(keywords):
+    trie = {}
+    for index, keyword in enumerate(keywords):
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(index)
+    return trie
+
+
+def _trie_to_regex(node, group_keywords):
+    parts = []
+    if _END in node:
+        group_keywords.append(node[_END])
+        parts.append('()')
+    branches = [
+        re.escape(char) + _trie_to_regex(child, group_keywords)
+        for char, child in sorted(node.items()) if char != _END
+    ]
+    if branches:
+        alternation = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if _END in node:
+            # Более длинное слово проверяется жадно, короткое уже отмечено группой
+            alternation = '(?:' + alternation + ')?' if len(branches) == 1 else alternation + '?'
+        parts.append(alternation)
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=32)
+def compile_keywords(keywords):
+    """
+    Компилирует список ключевых слов в одно регулярное выражение.
+
+    Входные данные:
+    - keywords (tuple): Ключевые слова.
+
+    Выходные данные:
+    - pattern: Скомпилированное выражение.
+    - group_keywords: Список, где для каждой группы выражения указаны
+      номера соответствующих ей ключевых слов.
+
+    Автор:
+    - Елисеев Иван
+    """
+    group_keywords = []
+    body = _trie_to_regex(_build_trie([k for k in keywords if k]), group_keywords)
+    pattern = re.compile('(?=' + body + ')', re.IGNORECASE) if body else None
+    # Номера групп строились по непустым словам; переводим их в номера исходного списка
+    positions = [i for i, k in enumerate(keywords) if k]
+    group_keywords = [[positions[i] for i in group] for group in group_keywords]
+    return pattern, group_keywords
+
+
+def find_keywords(text, compiled):
+    """
+    Возвращает номера ключевых слов, найденных в тексте.
+
+    Входные данные:
+    - text (str): Текст требований.
+    - compiled: Результат compile_keywords.
+
+    Выходные данные:
+    - Множество номеров найденных ключевых слов.
+
+    Автор:
+    - Елисеев Иван
+    """
+    pattern, group_keywords = compiled
+    found = set()
+    if pattern is None or not isinstance(text, str):
+        return found
+    for match in pattern.finditer(text):
+        for group, span in enumerate(match.regs[1:]):
+            if span[0] != -1:
+                found.update(group_keywords[group])
+    return found
+
+
+def match_keywords(texts, keywords):
+    """
+    Находит ключевые слова во всех текстах за один проход по каждому тексту.
+
+    Входные данные:
+    - texts: Последовательность текстов (значения, не являющиеся строками, пропускаются).
+    - keywords: Список ключевых слов.
+
+    Выходные данные:
+    - counts (numpy.ndarray): Количество текстов, содержащих каждое ключевое слово.
+    - rows (numpy.ndarray): Номера текстов для ненулевых элементов матрицы совпадений.
+    - cols (numpy.ndarray): Номера ключевых слов для ненулевых элементов матрицы.
+
+    Автор:
+    - Елисеев Иван
+    """
+    compiled = compile_keywords(tuple(keywords))
+    rows = []
+    cols = []
+    for row, text in enumerate(texts):
+        for col in find_keywords(text, compiled):
+            rows.append(row)
+            cols.append(col)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    counts = np.bincount(cols, minlength=len(keywords))
+    return counts, rows, cols
+
+
+def keyword_counts(texts, keywords):
+    """
+    Возвращает количество текстов, содержащих каждое ключевое слово.
+
+    Входные данные:
+    - texts: Последовательность текстов.
+    - keywords: Список ключевых слов.
+
+    Выходные данные:
+    - Словарь {ключевое слово: количество текстов}.
+
+    Автор:
+    - Елисеев Иван
+    """
+    counts, _, _ = match_keywords(texts, keywords)
+    return {keyword: int(count) for keyword, count in zip(keywords, counts)}
+
+
+def keyword_matrix(texts, keywords):
+    """
+    Возвращает разреженную таблицу совпадений "вакансия x ключевое слово".
+
+    Входные данные:
+    - texts: Последовательность текстов (например, столбец 'Требования').
+    - keywords: Список ключевых слов.
+
+    Выходные данные:
+    - pandas.DataFrame с разреженными столбцами (Sparse[int32]): 1, если ключевое
+      слово встречается в тексте, иначе 0. Индекс совпадает с индексом texts,
+      если texts - pandas.Series.
+
+    Автор:
+    - Елисеев Иван
+    """
+    index = texts.index if isinstance(texts, pd.Series) else None
+    texts = list(texts)
+    _, rows, cols = match_keywords(texts, keywords)
+    order = np.argsort(cols, kind='stable')
+    bounds = np.searchsorted(cols[order], np.arange(len(keywords) + 1))
+    columns = {}
+    for col, keyword in enumerate(keywords):
+        hits = np.zeros(len(texts), dtype=np.int32)
+        hits[rows[order[bounds[col]:bounds[col + 1]]]] = 1
+        columns[keyword] = pd.arrays.SparseArray(hits, fill_value=0)
+    return pd.DataFrame(columns, index=index)
@@ -1,17 +1,34 @@
 """
 Модуль для получения данных о вакансиях с сайта hh.ru,
-сохранения их в файл Excel и подсчета статистики.
+сохранения их в файлы (Excel, Parquet, CSV, JSON Lines), в историю поисков
+(library.history) и подсчета статистики.
+
+Данные обрабатываются потоково: страницы ответа API разбираются на записи
+о вакансиях, записи фильтруются и пачками передаются приемникам
+(library.sinks), поэтому расход памяти не зависит от объема выгрузки.
 
 Автор:
 - Глинник Егор
 
 Функции:
-- get_data(query, page): Отправляет запрос на сервер hh.ru
-  и получает данные о вакансиях.
-- excel_generator(ws, data, query_city): Генерирует содержимое Excel-файла
-  на основе полученных данных о вакансиях.
-- main(query, query_city): Основная функция, вызывает остальные функции
-  для получения данных, генерации Excel и подсчета статистики.
+- create_session(max_workers): Создает HTTP-сессию с пулом keep-alive соединений.
+- get_data(query, page, session, per_page, area, only_with_salary, date_from, order_by,
+  cancel_event): Отправляет запрос на сервер hh.ru и получает данные о вакансиях.
+- plan_pages(first, per_page, max_depth): Определяет количество страниц для загрузки.
+- fetch_pages(query, session, max_workers, per_page, max_depth, limit, cancel_event,
+  **filters):
+  Параллельно загружает страницы результатов поиска и отдает их в порядке номеров страниц.
+- iter_vacancies(pages): Извлекает записи о вакансиях из страниц ответа.
+- filter_vacancies(records, query_city): Отбирает вакансии по городу и наличию зарплаты.
+- get_columns(query_city, enrich): Возвращает заголовки столбцов таблицы.
+- record_row(record, query_city): Преобразует запись о вакансии в строку таблицы.
+- main(query, query_city, target_count, per_page, max_depth, outputs, data_dir,
+  progress, cancel_event, session, incremental, keep_history, enrich):
+  Основная функция, вызывает остальные функции
+  для получения данных, записи файлов и подсчета статистики.
+
+Исключения:
+- SearchCancelled: Поиск отменен пользователем.
 
 Переменные:
 - count: Счетчик количества обработанных вакансий.
@@ -26,107 +43,378 @@
 """
 
 import os
+import math
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
-import openpyxl
+from requests.adapters import HTTPAdapter
+from library import http_cache
+from library import hh_client
+from library import areas
+from library import dataset
+from library import sinks
+from library import classifier
+from library import refresh
+from library import history
+from library import details
+
+
+API_URL = areas.API_ROOT + "/vacancies"
+# Количество одновременно загружаемых страниц
+MAX_WORKERS = 8
+# Ограничения API: вакансий на странице и глубина выдачи по одному запросу
+API_MAX_PER_PAGE = 100
+API_MAX_DEPTH = 2000
+# Количество вакансий, собираемых по умолчанию
+TARGET_COUNT = 100
+# Количество строк, передаваемых приемникам за один раз
+BATCH_SIZE = 100
+# Форматы файлов, сохраняемых по умолчанию
+DEFAULT_OUTPUTS = ('xlsx', 'parquet')
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+# Интервал проверки отмены при ожидании ответа сервера, в секундах
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class SearchCancelled(hh_client.RequestCancelled):
+    """
+    Исключение, которое возникает, когда поиск отменен пользователем.
+
+    Автор:
+    - Глинник Егор
+    """
+
+
+def create_session(max_workers=MAX_WORKERS):
+    """
+    Создает HTTP-сессию с пулом keep-alive соединений к api.hh.ru.
 
+    Входные данные:
+    - max_workers: Максимальное количество одновременных запросов.
+
+    Выходные данные:
+    - session: Объект requests.Session.
+
+    Автор:
+    - Глинник Егор
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-def get_data(query, page):
+
+def get_data(query, page, session=None, per_page=API_MAX_PER_PAGE,
+             area=areas.RUSSIA_AREA_ID, only_with_salary=False, date_from=None, order_by=None,
+             cancel_event=None):
     """
     Отправляет запрос на сервер hh.ru и получает данные о вакансиях.
 
     Входные данные:
     - query: Строка с запросом для поиска вакансий.
     - page: Номер страницы с результатами поиска.
+    - session: HTTP-сессия (если не указана, используется отдельный запрос).
+    - per_page: Количество вакансий на странице (не более 100).
+    - area: Идентификатор региона hh.ru (по умолчанию вся Россия).
+    - only_with_salary: Запрашивать только вакансии с указанной зарплатой.
+    - date_from: Запрашивать только вакансии, опубликованные не раньше
+      указанного времени (строка published_at в формате API).
+    - order_by: Порядок сортировки (например, "publication_time").
+    - cancel_event: Событие отмены: запрос и паузы перед повторными
+      попытками прерываются исключением hh_client.RequestCancelled.
 
     Выходные данные:
-    - response.json(): JSON-ответ с данными о вакансиях.
+    - JSON-ответ с данными о вакансиях (из дискового кэша, если он свежий).
+      Запрос выполняется через library.hh_client: с таймаутами, ограничением
+      частоты и повторами при ответах 429 и 5xx.
 
     Автор:
     - Глинник Егор
     """
-    response = requests.get(
-        f"https://api.hh.ru/vacancies?text={query}&page={page}&area=113"
-    )
-    return response.json()
+    params = {"text": query, "page": page, "per_page": per_page, "area": area}
+    if only_with_salary:
+        params["only_with_salary"] = "true"
+    if date_from is not None:
+        params["date_from"] = date_from
+    if order_by is not None:
+        params["order_by"] = order_by
+    return http_cache.cached_get_json(session, API_URL, params, cancel_event=cancel_event)
 
 
-def excel_generator(ws, data, query_city, count, grades, posts):
+def plan_pages(first, per_page, max_depth=API_MAX_DEPTH):
     """
-    Генерирует содержимое Excel-файла на основе полученных данных о вакансиях.
+    Определяет количество страниц, которые имеет смысл запрашивать.
+
+    Учитываются количество страниц и найденных вакансий из первого ответа,
+    а также ограничение API на глубину выдачи: вакансии дальше max_depth
+    (не более 2000) не возвращаются, поэтому такие страницы не запрашиваются.
 
     Входные данные:
-    - ws: Объект рабочего листа Excel-файла.
-    - data: JSON-данные о вакансиях.
-    - query_city: Строка с названием города для фильтрации вакансий.
+    - first: JSON-ответ для первой страницы.
+    - per_page: Количество вакансий на странице.
+    - max_depth: Максимальное количество просматриваемых вакансий.
 
     Выходные данные:
-    -
+    - Количество страниц, включая первую.
 
     Автор:
     - Глинник Егор
     """
-    for vacancy in data["items"]:
-        title = vacancy["name"]
-        city = vacancy["area"]["name"]
-        salary_data = vacancy.get("salary", {})
-        salary = salary_data.get("from", "-") if salary_data else "-"
-        employer_name = vacancy["employer"]["name"]
-        experience_data = vacancy.get("experience", {})
-        experience = experience_data.get("name", "-") if experience_data else "-"
-        requirements = vacancy["snippet"]["requirement"]
-        employment_type = vacancy["employment"]["name"]
-        has_test = "Есть" if vacancy.get("has_test", False) else "Нет"
-        schedule = vacancy.get("schedule", {}).get("name", "-")
-        id = vacancy.get("id")
-
-        if (query_city == city or query_city == "") and salary != "-":
-            if query_city != "":
-                ws.append([
-                    title, salary, employer_name, experience,
-                    requirements, employment_type, has_test, schedule, id
-                ])
-            else:
-                ws.append([
-                    city, title, salary, employer_name, experience,
-                    requirements, employment_type, has_test, schedule, id
-                ])
-            count += 1
-
-            name = title.lower()
-            # grades
-            if "junior" in name:
-                grades[0] += 1
-            elif "middle" in name:
-                grades[1] += 1
-            elif "senior" in name:
-                grades[2] += 1
-            else:
-                grades[3] += 1
-            # posts
-            if any(keyword in name for keyword in ["android", "ios", "мобильный"]):
-                posts[4] += 1
-            if "frontend" in name:
-                posts[1] += 1
-            elif any(keyword in name for keyword in [
-                "backend", "разработчик", "программист", "developer"
-            ]):
-                posts[0] += 1
-            if any(keyword in name for keyword in ["qa", "тестировщик"]):
-                posts[2] += 1
-            if any(keyword in name for keyword in ["analyst", "аналитик"]):
-                posts[3] += 1
-
-    return count, grades, posts
-
-
-def main(query, query_city):
+    found = first.get("found", 0)
+    pages = first.get("pages", 1)
+    depth = min(max_depth, API_MAX_DEPTH, found)
+    return min(pages, math.ceil(depth / per_page))
+
+
+def fetch_pages(query, session, max_workers=MAX_WORKERS, per_page=API_MAX_PER_PAGE,
+                max_depth=API_MAX_DEPTH, limit=None, cancel_event=None, **filters):
+    """
+    Загружает страницы результатов поиска параллельно и отдает их по порядку.
+
+    Первая страница загружается отдельно: из нее берется количество
+    найденных вакансий и страниц (см. plan_pages), после чего остальные
+    страницы загружаются в пуле потоков. Одновременно в работе находится
+    не более max_workers страниц, поэтому при досрочной остановке лишние
+    запросы не отправляются. Если указан limit, заранее запрашивается не
+    больше страниц, чем нужно, чтобы набрать limit вакансий.
+
+    Входные данные:
+    - query: Строка с запросом для поиска вакансий.
+    - session: HTTP-сессия, общая для всех потоков.
+    - max_workers: Максимальное количество одновременных запросов.
+    - per_page: Количество вакансий на странице (не более 100).
+    - max_depth: Максимальное количество просматриваемых вакансий.
+    - limit: Ожидаемое количество нужных вакансий (если все вакансии
+      из ответа будут сохранены).
+    - cancel_event: Событие threading.Event; если оно установлено, загрузка
+      прерывается исключением SearchCancelled, а ожидающие запросы отменяются
+      (в том числе загрузка первой страницы и паузы перед повторными попытками).
+    - filters: Дополнительные параметры get_data (area, only_with_salary,
+      date_from, order_by).
+
+    Выходные данные:
+    - Генератор JSON-ответов в порядке номеров страниц.
+
+    Автор:
+    - Глинник Егор
+    """
+    per_page = max(1, min(per_page, API_MAX_PER_PAGE))
+
+    def fetch(page):
+        return get_data(query, page, session, per_page, cancel_event=cancel_event, **filters)
+
+    try:
+        first = fetch(0)
+    except hh_client.RequestCancelled:
+        raise SearchCancelled() from None
+    if cancel_event is not None and cancel_event.is_set():
+        raise SearchCancelled()
+    yield first
+    if not first.get("found"):
+        return
+
+    remaining = iter(range(1, plan_pages(first, per_page, max_depth)))
+    received = len(first.get("items", []))
+
+    def window_size():
+        if limit is None:
+            return max_workers
+        return max(1, min(max_workers, math.ceil((limit - received) / per_page)))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    window = deque()
+    try:
+        while True:
+            while len(window) < window_size():
+                page = next(remaining, None)
+                if page is None:
+                    break
+                window.append(executor.submit(fetch, page))
+            if not window:
+                break
+            future = window.popleft()
+            while not wait([future], timeout=CANCEL_POLL_INTERVAL).done:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise SearchCancelled()
+            try:
+                data = future.result()
+            except hh_client.RequestCancelled:
+                raise SearchCancelled() from None
+            received += len(data.get("items", []))
+            yield data
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_vacancies(pages):
+    """
+    Извлекает записи о вакансиях из страниц ответа API.
+
+    Входные данные:
+    - pages: Итерируемый объект с JSON-данными страниц.
+
+    Выходные данные:
+    - Генератор словарей с полями вакансии.
+
+    Автор:
+    - Глинник Егор
+    """
+    for data in pages:
+        for vacancy in data["items"]:
+            salary_data = vacancy.get("salary", {})
+            experience_data = vacancy.get("experience", {})
+            yield {
+                "title": vacancy["name"],
+                "city": vacancy["area"]["name"],
+                "salary": salary_data.get("from", "-") if salary_data else "-",
+                "employer_name": vacancy["employer"]["name"],
+                "experience": experience_data.get("name", "-") if experience_data else "-",
+                "requirements": vacancy["snippet"]["requirement"],
+                "employment_type": vacancy["employment"]["name"],
+                "has_test": "Есть" if vacancy.get("has_test", False) else "Нет",
+                "schedule": vacancy.get("schedule", {}).get("name", "-"),
+                "id": vacancy.get("id"),
+                "published_at": vacancy.get("published_at"),
+            }
+
+
+def filter_vacancies(records, query_city):
+    """
+    Отбирает вакансии из указанного города, в которых указана зарплата.
+
+    Входные данные:
+    - records: Итерируемый объект с записями о вакансиях.
+    - query_city: Строка с названием города (пустая строка - любой город).
+
+    Выходные данные:
+    - Генератор отобранных записей.
+
+    Автор:
+    - Глинник Егор
+    """
+    for record in records:
+        if (query_city == record["city"] or query_city == "") and record["salary"] != "-":
+            yield record
+
+
+def get_columns(query_city, enrich=False):
+    """
+    Возвращает заголовки столбцов таблицы вакансий.
+
+    Входные данные:
+    - query_city: Строка с названием города. Если город не указан,
+      в таблицу добавляется столбец "Город".
+    - enrich: Добавить столбцы подробных сведений о вакансии (details.DETAIL_COLUMNS).
+
+    Выходные данные:
+    - Список названий столбцов.
+
+    Автор:
+    - Глинник Егор
+    """
+    columns = [
+        "Название вакансии", "Зарплата", "Название работодателя", "Опыт работы",
+        "Требования", "Тип занятости", "Наличие теста для кандидатов",
+        "График работы", "ПК"
+    ]
+    if query_city == "":
+        columns.insert(0, "Город")
+    if enrich:
+        columns += details.DETAIL_COLUMNS
+    return columns
+
+
+def record_row(record, query_city):
+    """
+    Преобразует запись о вакансии в строку таблицы.
+
+    Входные данные:
+    - record: Словарь с полями вакансии.
+    - query_city: Строка с названием города.
+
+    Выходные данные:
+    - Список значений в порядке столбцов get_columns(query_city).
+
+    Автор:
+    - Глинник Егор
+    """
+    row = [
+        record["title"], record["salary"], record["employer_name"], record["experience"],
+        record["requirements"], record["employment_type"], record["has_test"],
+        record["schedule"], record["id"]
+    ]
+    if query_city == "":
+        row.insert(0, record["city"])
+    return row
+
+
+def _vacancy_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def main(query, query_city, target_count=TARGET_COUNT, per_page=API_MAX_PER_PAGE,
+         max_depth=API_MAX_DEPTH, outputs=DEFAULT_OUTPUTS, data_dir=DATA_DIR,
+         progress=None, cancel_event=None, session=None, incremental=False,
+         keep_history=True, enrich=False):
     """
     Основная функция, вызывает остальные функции для получения данных,
-    генерации Excel и подсчета статистики.
+    записи файлов и подсчета статистики.
+
+    Страницы загружаются и разбираются по мере поступления, отобранные
+    строки передаются приемникам пачками по BATCH_SIZE строк; названия
+    вакансий каждой пачки классифицируются модулем library.classifier.
+
+    В инкрементальном режиме (library.refresh) запрашиваются только вакансии,
+    опубликованные после самой новой вакансии прошлого поиска по тому же
+    запросу и городу; они записываются первыми, за ними - ранее сохраненные
+    вакансии без повторов по столбцу "ПК". Если прошлых данных по этому
+    запросу и городу нет, выполняется полный поиск. Новые вакансии приходят
+    от новых к старым, поэтому загружаются все они (target_count не
+    учитывается), а время самой новой вакансии запоминается, только если
+    выдача не обрезана глубиной max_depth: иначе более старые из новых
+    вакансий не попали бы ни в этот, ни в следующие поиски.
+
+    Записанные строки также добавляются пачками в историю поисков
+    data_dir/history.sqlite (library.history); в инкрементальном режиме
+    в историю попадает вся объединенная таблица, как и при полном поиске.
+
+    При enrich для каждой пачки перед записью загружаются подробные сведения
+    о вакансиях (library.details); уже загруженные ранее вакансии берутся
+    из кэша по идентификатору.
+
+    Если справочник регионов (library.areas) не удалось загрузить, вакансии
+    по городу отбираются среди загруженных, а в progress передается этап
+    с сообщением об этом.
 
     Входные данные:
     - query: Строка с запросом для поиска вакансий.
     - query_city: Строка с названием города для фильтрации вакансий.
+    - target_count: Количество вакансий, которое нужно собрать
+      (в инкрементальном режиме не учитывается).
+    - per_page: Количество вакансий на странице запроса (не более 100).
+    - max_depth: Максимальное количество просматриваемых вакансий (не более 2000).
+    - outputs: Список форматов файлов ('xlsx', 'parquet', 'csv', 'jsonl').
+    - data_dir: Директория для сохранения файлов.
+    - progress: Функция, которой передается словарь с ходом поиска
+      (stage - этап, pages - загружено страниц, rows - отобрано вакансий).
+    - cancel_event: Событие threading.Event для отмены поиска. При отмене
+      временные файлы удаляются, сохраненные ранее данные не меняются,
+      и возникает исключение SearchCancelled. При ошибке загрузки (например,
+      hh_client.HHApiError) сохраненные ранее данные тоже не меняются,
+      а уже полученные вакансии остаются во временных файлах
+      data_dir/data.<формат>.part и в истории (см. sinks.Sink.abort);
+      исключение передается вызывающему коду.
+    - session: HTTP-сессия (если не указана, создается и закрывается новая сессия).
+    - incremental: Дополнить сохраненную таблицу только новыми вакансиями.
+    - keep_history: Добавить полученные вакансии в историю поисков.
+    - enrich: Загрузить для отобранных вакансий подробные сведения
+      (ключевые навыки, описание, верхнюю границу зарплаты и валюту,
+      см. library.details) и добавить их в таблицу отдельными столбцами.
 
     Выходные данные:
     - grades: Список с количеством вакансий
@@ -138,37 +426,153 @@ def main(query, query_city):
     - Глинник Егор
     """
     count = 0
-    grades = [0, 0, 0, 0]  # Junior, Middle, Senior
-    posts = [0, 0, 0, 0, 0]  # Backend, Frontend, QA, Аналитик, Mobile
-
-    page = 0
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    if query_city != "":
-        ws.append([
-            "Название вакансии", "Зарплата", "Название работодателя", "Опыт работы",
-            "Требования", "Тип занятости", "Наличие теста для кандидатов",
-            "График работы", "ПК"
-        ])
-    else:
-        ws.append([
-            "Город", "Название вакансии", "Зарплата", "Название работодателя", "Опыт работы",
-            "Требования", "Тип занятости", "Наличие теста для кандидатов",
-            "График работы", "ПК"
-        ])
-
-    while count < 100:
+    grades = [0] * len(classifier.category_names('grades'))  # Junior, Middle, Senior
+    posts = [0] * len(classifier.category_names('posts'))  # Backend, Frontend, QA, Аналитик, Mobile
+
+    columns = get_columns(query_city, enrich)
+    id_index = columns.index("ПК")
+    title_index = columns.index("Название вакансии")
+
+    # Инкрементальный режим: только вакансии новее сохраненных по этому запросу
+    since = refresh.last_published(data_dir, query, query_city) if incremental else None
+    if since is not None and not refresh.can_extend(data_dir, query, query_city, columns):
+        since = None
+    filters = {"only_with_salary": True}
+    if since is not None:
+        filters.update(date_from=since, order_by="publication_time")
+    newest_published = since
+    # Новые вакансии загружаются все: выдача идет от новых к старым
+    limit = target_count if since is None else None
+    seen_ids = set()
+
+    outputs_sinks = []
+    history_writer = None
+    pages = None
+    batch = []
+
+    pages_count = 0
+    found = 0
+    written = 0
+
+    def report(stage):
+        if progress is not None:
+            progress({"stage": stage, "pages": pages_count, "rows": count})
+
+    def counted(pages):
+        nonlocal pages_count, found
+        for data in pages:
+            if pages_count == 0:
+                found = data.get("found", 0)
+            pages_count += 1
+            report("Загрузка страниц")
+            yield data
+
+    def write_rows(rows):
+        for sink in outputs_sinks:
+            sink.write(rows)
+        batch_grades, batch_posts = classifier.classify([row[title_index] for row in rows])
+        for i, value in enumerate(batch_grades):
+            grades[i] += value
+        for i, value in enumerate(batch_posts):
+            posts[i] += value
+
+    def flush(records):
+        nonlocal newest_published, written
+        rows = []
+        for record in records:
+            newest_published = refresh.newest(newest_published, record["published_at"])
+            rows.append(record_row(record, query_city))
+        if enrich and rows:
+            report("Загрузка описаний вакансий")
+            try:
+                fields = details.fetch_details([row[id_index] for row in rows], session,
+                                               cancel_event=cancel_event)
+            except hh_client.RequestCancelled:
+                raise SearchCancelled() from None
+            for row in rows:
+                row += details.detail_row(fields.get(row[id_index], details.EMPTY_FIELDS))
+        write_rows(rows)
+        if history_writer is not None:
+            history_writer.write(records)
+        written += len(rows)
+
+    # Переданная сессия принадлежит вызывающему коду и здесь не закрывается
+    with (create_session() if session is None else nullcontext(session)) as session:
         try:
-            data = get_data(query, page)
-            count, grades, posts = excel_generator(ws, data, query_city, count, grades, posts)
-            page += 1
-        except Exception as e:
-            print(e)
-            break
-
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-    wb.save(os.path.join(data_dir, "data.xlsx"))
+            outputs_sinks = sinks.create_sinks(
+                outputs, data_dir, columns, {"query": query, "city": query_city}
+            )
+            if keep_history:
+                history_writer = history.HistoryWriter(
+                    os.path.join(data_dir, history.HISTORY_NAME), query, query_city
+                )
+            # Город и наличие зарплаты по возможности фильтруются на сервере
+            area = None
+            if query_city != "":
+                try:
+                    area = areas.resolve_area(query_city, session)
+                except areas.LOAD_ERRORS:
+                    # Без справочника регионов город фильтруется по загруженным вакансиям
+                    report("Справочник регионов недоступен, фильтрация по городу")
+            if area is not None:
+                pages = fetch_pages(query, session, per_page=per_page, max_depth=max_depth,
+                                    limit=limit, cancel_event=cancel_event,
+                                    area=area, **filters)
+                city_filter = ""
+            else:
+                pages = fetch_pages(query, session, per_page=per_page, max_depth=max_depth,
+                                    cancel_event=cancel_event, **filters)
+                city_filter = query_city
+            for record in filter_vacancies(iter_vacancies(counted(pages)), city_filter):
+                # Вакансия может попасть на две страницы, если выдача сдвинулась
+                # во время загрузки; повтор не учитывается в target_count
+                vacancy_id = _vacancy_id(record["id"])
+                if vacancy_id in seen_ids:
+                    continue
+                seen_ids.add(vacancy_id)
+                batch.append(record)
+                count += 1
+                if len(batch) >= BATCH_SIZE:
+                    flush(batch)
+                    batch = []
+                if limit is not None and count >= limit:
+                    break
+                if cancel_event is not None and cancel_event.is_set():
+                    raise SearchCancelled()
+            pages.close()
+            report("Запись файлов")
+            flush(batch)
+            if since is not None:
+                # Ранее сохраненные вакансии, которых нет среди новых
+                for rows in refresh.existing_rows(data_dir, columns, seen_ids, BATCH_SIZE):
+                    write_rows(rows)
+                    if history_writer is not None:
+                        history_writer.write_rows(rows, columns)
+            for sink in outputs_sinks:
+                sink.close()
+            if history_writer is not None:
+                history_writer.close()
+        except Exception as error:
+            # Прерванный поиск не меняет сохраненные данные и время последней
+            # вакансии для инкрементального обновления. При ошибке уже
+            # записанные строки остаются во временных файлах и в истории
+            # (поиск со статусом 'failed'), при отмене - удаляются
+            keep_partial = written > 0 and not isinstance(error, hh_client.RequestCancelled)
+            for sink in outputs_sinks:
+                sink.abort(keep_partial)
+            if history_writer is not None:
+                history_writer.abort(keep_partial)
+            raise
+        finally:
+            if pages is not None:
+                pages.close()
+    if since is None or found <= min(max_depth, API_MAX_DEPTH):
+        refresh.remember_published(data_dir, query, query_city, newest_published)
+    if 'parquet' not in outputs:
+        # Устаревший файл Parquet читался бы вместо новой выгрузки
+        stale_path = os.path.join(data_dir, dataset.PARQUET_NAME)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+        dataset.invalidate(data_dir)
 
     return grades, posts
@@ -0,0 +1,157 @@
+"""
+Модуль для подсчета сводных таблиц количества вакансий по парам столбцов.
+
+Вместо отдельного pandas.pivot_table для каждой пары столбцов значения всех
+нужных столбцов переводятся в целочисленные коды категорий, и каждая пачка
+строк группируется один раз по всем столбцам сразу; счетчики пар получаются
+суммированием этой небольшой таблицы. Для каждой пары хранятся только
+ненулевые сочетания (разреженно), поэтому столбцы с тысячами значений
+(названия вакансий, работодатели) не раздувают память нулями.
+
+Для вывода таблица сокращается до top_n строк с наибольшим количеством
+вакансий; остальные строки объединяются в строку "Другие".
+
+Классы:
+- PivotCounter: Накопитель количества вакансий по парам столбцов.
+
+Функции:
+- count_pairs(batches, pairs): Считает сводные таблицы по пачкам строк.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Название строки, в которую объединяются строки за пределами top_n
+OTHER_LABEL = 'Другие'
+# Название столбца с количеством вакансий в строке
+TOTAL_LABEL = 'Всего'
+
+
+class PivotCounter:
+    """
+    Накопитель количества вакансий по парам столбцов.
+
+    Входные данные:
+    - pairs: Список пар (столбец строк, столбец колонок).
+
+    Автор:
+    - Чибиров Руслан
+    """
+
+    def __init__(self, pairs):
+        self.pairs = [tuple(pair) for pair in pairs]
+        self.columns = list(dict.fromkeys(column for pair in self.pairs for column in pair))
+        # Для каждого столбца: значения категорий в порядке их кодов
+        self.labels = {column: pd.Index([], dtype=object) for column in self.columns}
+        # Для каждой пары: ключи ненулевых сочетаний (код строки << 32 | код столбца)
+        # и количество вакансий для каждого ключа
+        self.keys = {pair: np.empty(0, dtype=np.int64) for pair in self.pairs}
+        self.counts = {pair: np.empty(0, dtype=np.int64) for pair in self.pairs}
+        self.rows = 0
+
+    def _encode(self, column, values):
+        codes, uniques = pd.factorize(values)
+        labels = self.labels[column]
+        global_codes = labels.get_indexer(uniques)
+        new = global_codes < 0
+        # Новые значения получают следующие свободные коды
+        global_codes[new] = len(labels) + np.arange(new.sum())
+        self.labels[column] = labels.append(pd.Index(uniques[new], dtype=object))
+        # Последний элемент соответствует коду -1 (пропуск значения)
+        return np.append(global_codes, -1)[codes]
+
+    def update(self, batch):
+        """
+        Учитывает пачку строк. Строки с пропуском в одном из столбцов пары
+        в таблицу этой пары не попадают (как в pandas.pivot_table).
+
+        Входные данные:
+        - batch: pandas.DataFrame со столбцами всех пар.
+        """
+        if len(batch) == 0:
+            return
+        codes = pd.DataFrame({column: self._encode(column, batch[column])
+                              for column in self.columns})
+        joint = codes.groupby(self.columns, sort=False).size().reset_index(name='count')
+        for pair in self.pairs:
+            row_codes, col_codes = joint[pair[0]].to_numpy(), joint[pair[1]].to_numpy()
+            present = (row_codes >= 0) & (col_codes >= 0)
+            keys = np.concatenate([self.keys[pair],
+                                   (row_codes[present] << 32) | col_codes[present]])
+            counts = np.concatenate([self.counts[pair], joint['count'].to_numpy()[present]])
+            self.keys[pair], inverse = np.unique(keys, return_inverse=True)
+            self.counts[pair] = np.bincount(inverse, weights=counts).astype(np.int64)
+        self.rows += len(batch)
+
+    def table(self, pair, top_n=None):
+        """
+        Возвращает сводную таблицу пары столбцов.
+
+        Входные данные:
+        - pair: Пара (столбец строк, столбец колонок).
+        - top_n: Количество строк с наибольшим количеством вакансий
+          (None - все строки); остальные объединяются в строку OTHER_LABEL.
+
+        Выходные данные:
+        - pandas.DataFrame: первый столбец - значения столбца строк,
+          далее количество вакансий по значениям столбца колонок
+          (по алфавиту) и столбец TOTAL_LABEL. Строки упорядочены
+          по убыванию количества вакансий.
+        """
+        row, col = pair
+        row_names = self.labels[row].to_numpy(dtype=object)
+        col_names = self.labels[col].to_numpy(dtype=object)
+        keys, values = self.keys[tuple(pair)], self.counts[tuple(pair)]
+        if len(keys) == 0:
+            return pd.DataFrame(columns=[row, TOTAL_LABEL])
+        row_codes, col_codes = keys >> 32, keys & 0xFFFFFFFF
+
+        row_totals = np.bincount(row_codes, weights=values, minlength=len(row_names))
+        present_rows = np.flatnonzero(row_totals)
+        order = present_rows[np.lexsort((row_names[present_rows].astype(str),
+                                         -row_totals[present_rows]))]
+        top = order if top_n is None else order[:top_n]
+        has_other = len(top) < len(order)
+
+        present_cols = np.flatnonzero(np.bincount(col_codes, minlength=len(col_names)))
+        present_cols = present_cols[np.argsort(col_names[present_cols].astype(str),
+                                               kind='stable')]
+
+        # Позиции строк и столбцов в итоговой таблице; строки вне top_n - в "Другие"
+        row_position = np.full(len(row_names), len(top))
+        row_position[top] = np.arange(len(top))
+        col_position = np.zeros(len(col_names), dtype=np.int64)
+        col_position[present_cols] = np.arange(len(present_cols))
+        dense = np.zeros((len(top) + has_other, len(present_cols)), dtype=np.int64)
+        np.add.at(dense, (row_position[row_codes], col_position[col_codes]), values)
+
+        labels = list(row_names[top]) + ([OTHER_LABEL] if has_other else [])
+        result = pd.DataFrame(dense, columns=list(col_names[present_cols]))
+        result.insert(0, row, labels)
+        result[TOTAL_LABEL] = dense.sum(axis=1)
+        return result
+
+
+def count_pairs(batches, pairs):
+    """
+    Считает количество вакансий по парам столбцов за один проход по пачкам строк.
+
+    Входные данные:
+    - batches: Итерируемый объект с пачками строк (pandas.DataFrame),
+      например dataset.iter_batches.
+    - pairs: Список пар (столбец строк, столбец колонок).
+
+    Выходные данные:
+    - counter: Объект PivotCounter.
+
+    Автор:
+    - Чибиров Руслан
+    """
+    counter = PivotCounter(pairs)
+    for batch in batches:
+        counter.update(batch)
+    return counter
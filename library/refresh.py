@@ -0,0 +1,209 @@
+"""
+Модуль для инкрементального обновления таблицы вакансий.
+
+Для каждой пары (запрос, город) запоминается время публикации самой новой
+сохраненной вакансии (файл refresh_state.json в директории данных). При
+обновлении запрашиваются только вакансии, опубликованные после этого
+времени (параметры API date_from и order_by=publication_time), и
+объединяются с уже сохраненной таблицей без повторов по столбцу "ПК".
+Обновление возможно, только если сохраненная таблица (файл Parquet)
+получена по тому же запросу и городу; иначе выполняется полный поиск.
+Сохраненная таблица читается пачками строк, поэтому расход памяти
+не зависит от ее размера.
+
+Функции:
+- state_key(query, city): Возвращает ключ пары (запрос, город) в файле состояния.
+- load_state(data_dir): Загружает файл состояния.
+- last_published(data_dir, query, city): Возвращает время публикации
+  самой новой сохраненной вакансии.
+- remember_published(data_dir, query, city, published_at): Запоминает время
+  публикации самой новой вакансии.
+- newest(first, second): Возвращает более позднее из двух значений published_at.
+- can_extend(data_dir, query, city, columns): Проверяет, можно ли дополнить
+  сохраненную таблицу.
+- existing_rows(data_dir, columns, exclude_ids, batch_size): Читает строки
+  сохраненной таблицы пачками.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from library import dataset
+
+
+STATE_NAME = 'refresh_state.json'
+PUBLISHED_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+_lock = threading.Lock()
+
+
+def state_key(query, city):
+    """
+    Возвращает ключ пары (запрос, город) в файле состояния.
+
+    Входные данные:
+    - query: Строка с запросом.
+    - city: Строка с названием города.
+
+    Выходные данные:
+    - Строка "запрос|город" без учета регистра и лишних пробелов.
+
+    Автор:
+    - Глинник Егор
+    """
+    return f"{' '.join(query.lower().split())}|{' '.join(city.lower().split())}"
+
+
+def load_state(data_dir=dataset.DATA_DIR):
+    """
+    Загружает файл состояния.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+
+    Выходные данные:
+    - Словарь {ключ: {"published_at": ..., "updated_at": ...}}.
+
+    Автор:
+    - Глинник Егор
+    """
+    try:
+        with open(os.path.join(data_dir, STATE_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def last_published(data_dir, query, city):
+    """
+    Возвращает время публикации самой новой сохраненной вакансии.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - query: Строка с запросом.
+    - city: Строка с названием города.
+
+    Выходные данные:
+    - Строка published_at в формате API или None, если данных нет.
+
+    Автор:
+    - Глинник Егор
+    """
+    return load_state(data_dir).get(state_key(query, city), {}).get('published_at')
+
+
+def remember_published(data_dir, query, city, published_at):
+    """
+    Запоминает время публикации самой новой сохраненной вакансии.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - query: Строка с запросом.
+    - city: Строка с названием города.
+    - published_at: Строка published_at в формате API.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    if published_at is None:
+        return
+    with _lock:
+        state = load_state(data_dir)
+        state[state_key(query, city)] = {
+            'published_at': published_at,
+            'updated_at': datetime.now().astimezone().strftime(PUBLISHED_FORMAT),
+        }
+        os.makedirs(data_dir, exist_ok=True)
+        path = os.path.join(data_dir, STATE_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+
+def _parse(published_at):
+    try:
+        return datetime.strptime(published_at, PUBLISHED_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def newest(first, second):
+    """
+    Возвращает более позднее из двух значений published_at.
+
+    Входные данные:
+    - first, second: Строки published_at в формате API или None.
+
+    Выходные данные:
+    - Более позднее значение (некорректные значения и None не учитываются).
+
+    Автор:
+    - Глинник Егор
+    """
+    first_time, second_time = _parse(first), _parse(second)
+    if first_time is None:
+        return second if second_time is not None else None
+    if second_time is None or first_time >= second_time:
+        return first
+    return second
+
+
+def can_extend(data_dir, query, city, columns):
+    """
+    Проверяет, что сохраненная таблица (файл Parquet) получена по тому же
+    запросу и городу и имеет те же столбцы, то есть ее можно дополнить.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - query: Строка с запросом.
+    - city: Строка с названием города.
+    - columns: Ожидаемый список столбцов.
+
+    Выходные данные:
+    - True, если таблицу можно дополнить.
+
+    Автор:
+    - Глинник Егор
+    """
+    metadata = dataset.read_metadata(os.path.join(data_dir, dataset.PARQUET_NAME))
+    return (metadata is not None and metadata.get('schema_version') == dataset.SCHEMA_VERSION
+            and state_key(metadata.get('query', ''), metadata.get('city', ''))
+            == state_key(query, city)
+            and metadata.get('columns') == list(columns))
+
+
+def existing_rows(data_dir, columns, exclude_ids=(), batch_size=dataset.BATCH_ROWS):
+    """
+    Читает строки сохраненной таблицы пачками (library.dataset.iter_batches).
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - columns: Список столбцов (порядок значений в строке).
+    - exclude_ids: Идентификаторы вакансий (столбец "ПК"), строки которых
+      пропускаются.
+    - batch_size: Количество строк, читаемых за один раз.
+
+    Выходные данные:
+    - Генератор списков строк.
+
+    Автор:
+    - Глинник Егор
+    """
+    exclude_ids = list(exclude_ids)
+    for batch in dataset.iter_batches(data_dir, columns, batch_size):
+        if exclude_ids:
+            batch = batch[~batch['ПК'].isin(exclude_ids)]
+        if len(batch) == 0:
+            continue
+        data = dataset.coerce_columns({
+            column: batch[column].astype(object).where(batch[column].notna(), None).tolist()
+            for column in columns
+        })
+        yield [list(row) for row in zip(*data.values())]
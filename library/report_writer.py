@@ -0,0 +1,173 @@
+"""
+Модуль для потоковой записи таблиц в текстовые отчеты.
+
+tabulate строит всю таблицу в памяти одной строкой, а для выравнивания
+столбцов просматривает все строки; для таблиц из сотен тысяч строк это
+долго и требует много памяти. Здесь таблица записывается в два прохода
+по данным: первый проход считает ширину столбцов, второй записывает
+строки в файл частями по chunk_size строк. В памяти одновременно
+находится только одна часть.
+
+Форматы:
+- pretty: рамка из символов +-|, значения по центру (как tabulate "pretty");
+- fixed: столбцы фиксированной ширины без рамки;
+- markdown: таблица Markdown (символ | в значениях экранируется как \\|);
+- csv, tsv: значения через запятую или табуляцию (без прохода для ширины).
+
+Для каждой таблицы можно ограничить количество строк (limit) и выбрать
+случайную долю строк (sample); выбор зависит только от seed, поэтому оба
+прохода получают одни и те же строки.
+
+Функции:
+- write_table(f, source, columns, headers, fmt, limit, sample, seed,
+  show_index, chunk_size): Записывает таблицу в открытый файл.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import csv
+import math
+import numpy as np
+import pandas as pd
+
+
+FORMATS = ('pretty', 'fixed', 'markdown', 'csv', 'tsv')
+# Расширения файлов отчетов для каждого формата
+EXTENSIONS = {'pretty': 'txt', 'fixed': 'txt', 'markdown': 'md', 'csv': 'csv', 'tsv': 'tsv'}
+# Количество строк, записываемых в файл за один раз
+CHUNK_ROWS = 10000
+
+
+def _strings(series):
+    """
+    Переводит значения столбца в строки (пропуски - в пустые строки).
+    """
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans:
+        return series.astype(str).tolist()
+    if pd.api.types.is_float_dtype(series.dtype):
+        return ['' if math.isnan(value) else format(value, 'g') for value in series.tolist()]
+    strings = series.astype(str).str.replace('\n', ' ', regex=False)
+    return strings.where(series.notna(), '').tolist()
+
+
+def _chunks(source, columns, limit, sample, seed, show_index, chunk_size):
+    """
+    Отдает части таблицы: для каждого выводимого столбца - список текстовых значений.
+    """
+    batches = source() if callable(source) else (
+        source.iloc[start:start + chunk_size] for start in range(0, len(source), chunk_size)
+    )
+    rng = np.random.default_rng(seed) if sample is not None else None
+    position = 0
+    written = 0
+    for batch in batches:
+        index = (batch.index if not callable(source)
+                 else pd.RangeIndex(position, position + len(batch)))
+        position += len(batch)
+        if rng is not None:
+            keep = rng.random(len(batch)) < sample
+            batch, index = batch[keep], index[keep]
+        if limit is not None:
+            batch, index = batch.iloc[:limit - written], index[:limit - written]
+        for start in range(0, len(batch), chunk_size):
+            part = batch.iloc[start:start + chunk_size]
+            values = [_strings(part[column]) for column in columns]
+            if show_index:
+                values.insert(0, index[start:start + chunk_size].astype(str).tolist())
+            yield values
+        written += len(batch)
+        if limit is not None and written >= limit:
+            return
+
+
+def _escape_markdown(value):
+    return value.replace('|', '\\|')
+
+
+def _widths(source, columns, headers, limit, sample, seed, show_index, chunk_size,
+            convert=None):
+    widths = [len(header if convert is None else convert(header)) for header in headers]
+    for values in _chunks(source, columns, limit, sample, seed, show_index, chunk_size):
+        for i, column_values in enumerate(values):
+            if column_values:
+                if convert is not None:
+                    column_values = map(convert, column_values)
+                widths[i] = max(widths[i], max(map(len, column_values)))
+    return widths
+
+
+def write_table(f, source, columns, headers=None, fmt='pretty', limit=None, sample=None,
+                seed=0, show_index=True, chunk_size=CHUNK_ROWS):
+    """
+    Записывает таблицу в открытый текстовый файл.
+
+    Входные данные:
+    - f: Файл, открытый на запись.
+    - source: pandas.DataFrame или функция без аргументов, возвращающая
+      итератор пачек строк (pandas.DataFrame), например
+      lambda: dataset.iter_batches(data_dir, columns). Функция вызывается
+      дважды (для форматов с выравниванием столбцов).
+    - columns: Список выводимых столбцов.
+    - headers: Заголовки столбцов (по умолчанию названия столбцов).
+    - fmt: Формат из FORMATS.
+    - limit: Максимальное количество строк (None - без ограничения).
+    - sample: Доля случайно выбранных строк от 0 до 1 (None - все строки).
+    - seed: Начальное значение генератора случайных чисел для sample.
+    - show_index: Выводить ли номер строки первым столбцом без заголовка
+      (для DataFrame - индекс, как в tabulate).
+    - chunk_size: Количество строк, записываемых за один раз.
+
+    Выходные данные:
+    - Количество записанных строк.
+
+    Исключения:
+    - ValueError: Неизвестный формат.
+
+    Автор:
+    - Чибиров Руслан
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат отчета: {fmt}")
+    headers = [str(header) for header in (headers or columns)]
+    if show_index:
+        headers = [''] + headers
+    options = (columns, limit, sample, seed, show_index, chunk_size)
+    count = 0
+
+    if fmt in ('csv', 'tsv'):
+        writer = csv.writer(f, delimiter=',' if fmt == 'csv' else '\t', lineterminator='\n')
+        writer.writerow(headers)
+        for values in _chunks(source, *options):
+            writer.writerows(zip(*values))
+            count += len(values[0])
+        return count
+
+    widths = _widths(source, columns, headers, limit, sample, seed, show_index, chunk_size,
+                     _escape_markdown if fmt == 'markdown' else None)
+    if fmt == 'pretty':
+        border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+\n'
+
+        def line(values):
+            return '| ' + ' | '.join(f"{value:^{width}}"
+                                     for value, width in zip(values, widths)) + ' |\n'
+        head, tail = border + line(headers) + border, border
+    elif fmt == 'markdown':
+        def line(values):
+            return '| ' + ' | '.join(f"{_escape_markdown(value):<{width}}"
+                                     for value, width in zip(values, widths)) + ' |\n'
+        head = line(headers) + '|' + '|'.join('-' * (width + 2) for width in widths) + '|\n'
+        tail = ''
+    else:
+        def line(values):
+            return '  '.join(f"{value:<{width}}"
+                             for value, width in zip(values, widths)).rstrip() + '\n'
+        head = line(headers) + '  '.join('-' * width for width in widths) + '\n'
+        tail = ''
+
+    f.write(head)
+    for values in _chunks(source, *options):
+        f.write(''.join(line(row) for row in zip(*values)))
+        count += len(values[0])
+    f.write(tail)
+    return count
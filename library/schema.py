@@ -0,0 +1,175 @@
+"""
+Модуль с описанием типов столбцов таблицы вакансий.
+
+Типы столбцов задаются в одном месте и применяются один раз при загрузке
+таблицы (library.dataset, library.history), поэтому графики и отчеты
+получают уже типизированные данные:
+- столбцы с небольшим набором значений (город, опыт работы, тип занятости,
+  график работы, наличие теста, валюта) хранятся как категории: каждое
+  значение хранится один раз, а строки таблицы - целочисленными кодами;
+  группировка и подсчет частот по кодам выполняются быстрее, чем по строкам;
+- зарплаты и идентификатор вакансии хранятся как целые числа с пропусками
+  (Int64), а не как float или object;
+- свободный текст (названия, требования, описание) хранится в строковом
+  типе на основе Arrow, который занимает меньше памяти, чем object.
+
+Словарь DTYPES проверяется при импорте модуля: каждый столбец должен
+относиться ровно к одной группе, а тип - быть известен pandas.
+
+Группируя категориальные столбцы, следует передавать observed=True, иначе
+pandas добавляет в результат все сочетания категорий с нулевым количеством.
+
+Файлы Parquet сразу читаются в нужные типы: категориальные столбцы - как
+словари Arrow (read_dictionary), остальные - через arrow_dtype, поэтому
+apply_schema их уже не преобразует.
+
+Функции:
+- arrow_dtype(arrow_type): Возвращает тип pandas для типа столбца Arrow.
+- dictionary_columns(names): Возвращает столбцы, читаемые из Parquet как словари.
+- apply_schema(df): Приводит столбцы таблицы к типам DTYPES.
+- mismatches(df): Возвращает столбцы, тип которых отличается от DTYPES.
+
+Автор:
+- Глинник Егор
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+
+CATEGORY_COLUMNS = (
+    'Город', 'Опыт работы', 'Тип занятости', 'Наличие теста для кандидатов',
+    'График работы', 'Валюта',
+)
+INTEGER_COLUMNS = ('Зарплата', 'ПК', 'Зарплата до')
+STRING_COLUMNS = (
+    'Название вакансии', 'Название работодателя', 'Требования', 'Ключевые навыки',
+    'Описание',
+)
+
+CATEGORY_DTYPE = 'category'
+INTEGER_DTYPE = 'Int64'
+STRING_DTYPE = 'string[pyarrow]'
+
+
+def _build_dtypes():
+    """
+    Собирает и проверяет словарь {столбец: тип}.
+    """
+    dtypes = {}
+    for columns, dtype in ((CATEGORY_COLUMNS, CATEGORY_DTYPE),
+                           (INTEGER_COLUMNS, INTEGER_DTYPE),
+                           (STRING_COLUMNS, STRING_DTYPE)):
+        resolved = pd.api.types.pandas_dtype(dtype)
+        for column in columns:
+            if column in dtypes:
+                raise ValueError(f"Столбец {column} указан в схеме несколько раз")
+            dtypes[column] = resolved
+    return dtypes
+
+
+DTYPES = _build_dtypes()
+
+# Типы pandas для типов столбцов Arrow (категории задаются через read_dictionary)
+ARROW_DTYPES = {
+    pa.string(): DTYPES[STRING_COLUMNS[0]],
+    pa.large_string(): DTYPES[STRING_COLUMNS[0]],
+    pa.int64(): DTYPES[INTEGER_COLUMNS[0]],
+}
+
+
+def arrow_dtype(arrow_type):
+    """
+    Возвращает тип pandas для типа столбца Arrow
+    (аргумент types_mapper метода pyarrow.Table.to_pandas).
+
+    Входные данные:
+    - arrow_type: Тип столбца Arrow.
+
+    Выходные данные:
+    - Тип pandas или None (преобразование pyarrow по умолчанию).
+
+    Автор:
+    - Глинник Егор
+    """
+    return ARROW_DTYPES.get(arrow_type)
+
+
+def dictionary_columns(names):
+    """
+    Возвращает категориальные столбцы из списка, которые следует читать
+    из Parquet как словари (аргумент read_dictionary библиотеки pyarrow).
+
+    Входные данные:
+    - names: Список названий столбцов файла.
+
+    Выходные данные:
+    - Список названий столбцов.
+
+    Автор:
+    - Глинник Егор
+    """
+    return [column for column in names if column in CATEGORY_COLUMNS]
+
+
+def _matches(actual, dtype):
+    # Категориальный тип подходит с любым набором категорий
+    if isinstance(dtype, pd.CategoricalDtype):
+        return isinstance(actual, pd.CategoricalDtype)
+    return actual == dtype
+
+
+def _convert(series, dtype):
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series.astype(dtype)
+    if pd.api.types.is_integer_dtype(dtype):
+        values = pd.to_numeric(series, errors='coerce')
+        if pd.api.types.is_float_dtype(values.dtype):
+            values = values.round()
+        return values.astype(dtype)
+    # Пропуски остаются пропусками, а не строкой 'nan'
+    return series.astype(object).where(series.notna(), None).astype(dtype)
+
+
+def apply_schema(df):
+    """
+    Приводит столбцы таблицы вакансий к типам DTYPES.
+
+    Столбцы, которых нет в DTYPES, не меняются. Нечисловые значения
+    целочисленных столбцов заменяются пропусками.
+
+    Входные данные:
+    - df (pandas.DataFrame): Таблица вакансий.
+
+    Выходные данные:
+    - df (pandas.DataFrame): Таблица с преобразованными столбцами.
+
+    Автор:
+    - Глинник Егор
+    """
+    converted = {
+        column: _convert(df[column], dtype)
+        for column, dtype in DTYPES.items()
+        if column in df.columns and not _matches(df[column].dtype, dtype)
+    }
+    return df.assign(**converted) if converted else df
+
+
+def mismatches(df):
+    """
+    Возвращает столбцы таблицы, тип которых отличается от DTYPES.
+
+    Входные данные:
+    - df (pandas.DataFrame): Таблица вакансий.
+
+    Выходные данные:
+    - Словарь {столбец: (ожидаемый тип, фактический тип)}.
+
+    Автор:
+    - Глинник Егор
+    """
+    return {
+        column: (str(dtype), str(df[column].dtype))
+        for column, dtype in DTYPES.items()
+        if column in df.columns and not _matches(df[column].dtype, dtype)
+    }
@@ -0,0 +1,78 @@
+"""
+Модуль для выполнения поиска вакансий в фоновом потоке.
+
+Поток загружает данные (library.parser.main), затем читает сохраненную
+таблицу (library.graph_generator.main) и сообщает о ходе работы через
+потокобезопасную очередь. Графический интерфейс периодически читает
+очередь и обновляет надпись статуса и индикатор выполнения, поэтому окно
+не "зависает" во время поиска.
+
+Сообщения в очереди - словари с ключом "type":
+- "progress": stage (этап), pages (загружено страниц), rows (отобрано вакансий);
+- "done": grades, posts, df - результаты поиска, данные сохранены;
+- "cancelled": поиск отменен, сохраненные ранее данные не изменены;
+- "error": message - текст ошибки.
+
+Классы:
+- SearchWorker: Поток, выполняющий поиск вакансий.
+
+Автор:
+- Глинник Егор
+"""
+
+import queue
+import threading
+import library.parser
+import library.graph_generator
+
+
+class SearchWorker(threading.Thread):
+    """
+    Поток, выполняющий поиск вакансий.
+
+    Входные данные:
+    - query: Строка с запросом для поиска вакансий.
+    - city: Строка с названием города.
+    - search_options: Дополнительные параметры library.parser.main
+      (target_count, per_page, max_depth, incremental, enrich).
+
+    Атрибуты:
+    - messages: Очередь queue.Queue с сообщениями о ходе поиска.
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, query, city, **search_options):
+        super().__init__(daemon=True)
+        self.query = query
+        self.city = city
+        self.search_options = search_options
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.last_progress = {"stage": "", "pages": 0, "rows": 0}
+
+    def cancel(self):
+        """
+        Запрашивает отмену поиска.
+        """
+        self.cancel_event.set()
+
+    def _progress(self, info):
+        self.last_progress = info
+        self.messages.put(dict(info, type="progress"))
+
+    def run(self):
+        try:
+            grades, posts = library.parser.main(
+                self.query, self.city, progress=self._progress,
+                cancel_event=self.cancel_event, **self.search_options
+            )
+            self._progress(dict(self.last_progress, stage="Загрузка таблицы"))
+            df = library.graph_generator.main()
+        except library.parser.SearchCancelled:
+            self.messages.put({"type": "cancelled"})
+        except Exception as e:
+            self.messages.put({"type": "error", "message": str(e)})
+        else:
+            self.messages.put({"type": "done", "grades": grades, "posts": posts, "df": df})
@@ -0,0 +1,209 @@
+"""
+Модуль с приемниками (sinks) строк таблицы вакансий.
+
+Парсер передает строки приемникам пачками по мере загрузки страниц, поэтому
+объем используемой памяти не зависит от количества вакансий. Каждый
+приемник пишет во временный файл '<имя>.part' и при закрытии атомарно
+переименовывает его в итоговый файл; прерванная (abort) выгрузка не портит
+результаты предыдущего поиска. Временный файл прерванной выгрузки можно
+оставить на диске (keep_partial): он дописывается и содержит все строки,
+полученные до прерывания.
+
+Классы:
+- ExcelSink: Запись в файл Excel в потоковом режиме openpyxl (write_only).
+- CsvSink: Запись в файл CSV.
+- JsonLinesSink: Запись в файл JSON Lines (одна вакансия на строку).
+- ParquetSink: Запись в колоночный файл Parquet по группам строк.
+
+Функции:
+- create_sinks(outputs, data_dir, columns, metadata): Создает приемники по списку форматов.
+
+Автор:
+- Глинник Егор
+"""
+
+import os
+import csv
+import json
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from library import dataset
+
+
+class Sink:
+    """
+    Базовый приемник строк таблицы вакансий.
+
+    Входные данные:
+    - path: Путь к итоговому файлу.
+    - columns: Список названий столбцов.
+    - metadata: Словарь с дополнительными сведениями (запрос, город).
+
+    Автор:
+    - Глинник Егор
+    """
+
+    def __init__(self, path, columns, metadata=None):
+        self.path = path
+        self.part_path = path + '.part'
+        self.columns = list(columns)
+        self.metadata = metadata or {}
+        self.closed = False
+
+    def write(self, rows):
+        """
+        Записывает пачку строк.
+        """
+        raise NotImplementedError
+
+    def _finish(self):
+        """
+        Завершает запись во временный файл.
+        """
+
+    def close(self):
+        """
+        Завершает запись и заменяет итоговый файл временным.
+        """
+        self._finish()
+        os.replace(self.part_path, self.path)
+        self.closed = True
+
+    def abort(self, keep_partial=False):
+        """
+        Прерывает запись; итоговый файл не меняется. Временный файл удаляется,
+        а при keep_partial остается на диске готовым к чтению файлом с уже
+        записанными строками. Для уже закрытого приемника ничего не делает.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._finish()
+        finally:
+            if not keep_partial and os.path.exists(self.part_path):
+                os.remove(self.part_path)
+
+
+class ExcelSink(Sink):
+    """
+    Приемник, записывающий строки в файл Excel в потоковом режиме.
+    """
+
+    def __init__(self, path, columns, metadata=None):
+        super().__init__(path, columns, metadata)
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(self.columns)
+
+    def write(self, rows):
+        for row in rows:
+            self.sheet.append(row)
+
+    def _finish(self):
+        with open(self.part_path, 'wb') as f:
+            self.workbook.save(f)
+
+
+class CsvSink(Sink):
+    """
+    Приемник, записывающий строки в файл CSV.
+    """
+
+    def __init__(self, path, columns, metadata=None):
+        super().__init__(path, columns, metadata)
+        self.file = open(self.part_path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def _finish(self):
+        self.file.close()
+
+
+class JsonLinesSink(Sink):
+    """
+    Приемник, записывающий каждую вакансию отдельной строкой JSON.
+    """
+
+    def __init__(self, path, columns, metadata=None):
+        super().__init__(path, columns, metadata)
+        self.file = open(self.part_path, 'w', encoding='utf-8')
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False))
+            self.file.write('\n')
+        self.file.flush()
+
+    def _finish(self):
+        self.file.close()
+
+
+class ParquetSink(Sink):
+    """
+    Приемник, записывающий каждую пачку строк отдельной группой строк Parquet.
+    """
+
+    def __init__(self, path, columns, metadata=None):
+        super().__init__(path, columns, metadata)
+        self.schema = dataset.make_schema(self.columns, self.metadata)
+        self.writer = pq.ParquetWriter(self.part_path, self.schema)
+
+    def write(self, rows):
+        if not rows:
+            return
+        data = {column: list(values) for column, values in zip(self.columns, zip(*rows))}
+        self.writer.write_table(pa.Table.from_pydict(
+            dataset.coerce_columns(data), schema=self.schema
+        ))
+
+    def _finish(self):
+        self.writer.close()
+
+    def close(self):
+        super().close()
+        dataset.invalidate(os.path.dirname(self.path))
+
+
+# Форматы выгрузки: расширение файла и класс приемника
+SINKS = {
+    'xlsx': ExcelSink,
+    'parquet': ParquetSink,
+    'csv': CsvSink,
+    'jsonl': JsonLinesSink,
+}
+
+
+def create_sinks(outputs, data_dir, columns, metadata=None):
+    """
+    Создает приемники по списку форматов.
+
+    Входные данные:
+    - outputs: Список форматов из SINKS (например, ['xlsx', 'parquet']).
+    - data_dir: Директория для сохранения файлов.
+    - columns: Список названий столбцов.
+    - metadata: Словарь с дополнительными сведениями (запрос, город).
+
+    Выходные данные:
+    - Список приемников.
+
+    Автор:
+    - Глинник Егор
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    created = []
+    try:
+        for name in outputs:
+            path = os.path.join(data_dir, f"data.{name}")
+            created.append(SINKS[name](path, columns, metadata))
+    except Exception:
+        # Уже открытые временные файлы не должны оставаться после ошибки
+        for sink in created:
+            sink.abort()
+        raise
+    return created
@@ -0,0 +1,361 @@
+"""
+Модуль для подсчета статистики по таблице вакансий за один проход.
+
+Таблица обрабатывается пачками строк (pandas.DataFrame): для каждой пачки
+обновляются накопители, после чего пачка больше не нужна. Поэтому расход
+памяти не зависит от количества вакансий, а накопители, посчитанные по
+разным частям данных (файлам, поискам, потокам), можно объединить методом
+merge и получить ту же статистику, что и по всем данным сразу.
+
+Накопители:
+- RunningStats: количество, среднее и дисперсия (алгоритм Уэлфорда
+  с объединением пачек по формуле Чана), минимум и максимум.
+- QuantileSketch: приближенные квантили с ограниченной относительной
+  ошибкой (логарифмические корзины, как в DDSketch).
+- FrequencyCounter: таблица частот значений.
+- TableStats: набор накопителей для нескольких столбцов.
+
+Функции:
+- collect(batches, numeric_columns, categorical_columns): Считает статистику по пачкам строк.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import math
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+
+# Относительная ошибка квантилей по умолчанию (1%)
+QUANTILE_ACCURACY = 0.01
+
+
+class RunningStats:
+    """
+    Накопитель количества, среднего, дисперсии, минимума и максимума.
+
+    Автор:
+    - Чибиров Руслан
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+
+    def update(self, values):
+        """
+        Учитывает пачку значений (пропуски не учитываются).
+
+        Входные данные:
+        - values: Последовательность чисел.
+        """
+        values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(float)
+        if len(values) == 0:
+            return
+        mean = values.mean()
+        self._combine(len(values), mean, float(((values - mean) ** 2).sum()),
+                      values.min(), values.max())
+
+    def merge(self, other):
+        """
+        Добавляет статистику другого накопителя.
+
+        Входные данные:
+        - other: Объект RunningStats.
+        """
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    @property
+    def variance(self):
+        """
+        Выборочная дисперсия (как pandas.Series.var) или NaN, если значений меньше двух.
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        """
+        Выборочное стандартное отклонение.
+        """
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+
+class QuantileSketch:
+    """
+    Накопитель приближенных квантилей.
+
+    Положительное значение x попадает в корзину ceil(log_gamma(x)), где
+    gamma = (1 + accuracy) / (1 - accuracy); квантиль оценивается серединой
+    корзины, поэтому относительная ошибка не больше accuracy. Количество
+    корзин растет как логарифм диапазона значений, а не как количество
+    значений. Отрицательные значения хранятся в отдельных корзинах, нули -
+    отдельным счетчиком.
+
+    Входные данные:
+    - accuracy: Допустимая относительная ошибка квантилей.
+
+    Автор:
+    - Чибиров Руслан
+    """
+
+    def __init__(self, accuracy=QUANTILE_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = Counter()
+        self.negative = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def _bins(self, values):
+        indexes = np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+        unique, counts = np.unique(indexes, return_counts=True)
+        return dict(zip(unique.tolist(), counts.tolist()))
+
+    def update(self, values):
+        """
+        Учитывает пачку значений (пропуски не учитываются).
+
+        Входные данные:
+        - values: Последовательность чисел.
+        """
+        values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(float)
+        if len(values) == 0:
+            return
+        positive, negative = values[values > 0], -values[values < 0]
+        if len(positive):
+            self.positive.update(self._bins(positive))
+        if len(negative):
+            self.negative.update(self._bins(negative))
+        self.zeros += int((values == 0).sum())
+        self.count += len(values)
+
+    def merge(self, other):
+        """
+        Добавляет значения другого накопителя с той же точностью.
+
+        Входные данные:
+        - other: Объект QuantileSketch.
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError("Нельзя объединить накопители квантилей с разной точностью")
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def _value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Возвращает приближенный квантиль.
+
+        Входные данные:
+        - q: Уровень квантиля от 0 до 1.
+
+        Выходные данные:
+        - Значение квантиля или NaN, если значений нет.
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self._value(index)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self._value(index)
+        return self._value(max(self.positive))
+
+
+class FrequencyCounter:
+    """
+    Накопитель таблицы частот значений.
+
+    Автор:
+    - Чибиров Руслан
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+
+    @property
+    def total(self):
+        """
+        Количество учтенных значений.
+        """
+        return sum(self.counts.values())
+
+    def update(self, values):
+        """
+        Учитывает пачку значений (пропуски не учитываются).
+
+        Входные данные:
+        - values: Последовательность значений.
+        """
+        counts = pd.Series(values).value_counts()
+        # Категориальный столбец возвращает и неиспользуемые категории с нулями
+        self.counts.update(counts[counts > 0].to_dict())
+
+    def merge(self, other):
+        """
+        Добавляет частоты другого накопителя.
+
+        Входные данные:
+        - other: Объект FrequencyCounter.
+        """
+        self.counts.update(other.counts)
+
+    def most_common(self, n=None):
+        """
+        Возвращает значения по убыванию частоты.
+
+        Входные данные:
+        - n: Количество значений (None - все).
+
+        Выходные данные:
+        - Список пар (значение, частота).
+        """
+        return self.counts.most_common(n)
+
+
+class TableStats:
+    """
+    Набор накопителей для столбцов таблицы вакансий.
+
+    Для каждого количественного столбца считаются RunningStats и
+    QuantileSketch, для каждого качественного - FrequencyCounter.
+
+    Входные данные:
+    - numeric_columns: Список количественных столбцов.
+    - categorical_columns: Список качественных столбцов.
+    - accuracy: Относительная ошибка квантилей.
+
+    Автор:
+    - Чибиров Руслан
+    """
+
+    def __init__(self, numeric_columns=(), categorical_columns=(), accuracy=QUANTILE_ACCURACY):
+        self.numeric = {column: RunningStats() for column in numeric_columns}
+        self.quantiles = {column: QuantileSketch(accuracy) for column in numeric_columns}
+        self.frequencies = {column: FrequencyCounter() for column in categorical_columns}
+        self.rows = 0
+
+    def update(self, batch):
+        """
+        Учитывает пачку строк. Столбцы, которых нет в пачке, пропускаются.
+
+        Входные данные:
+        - batch: pandas.DataFrame или словарь {столбец: список значений}.
+        """
+        if not isinstance(batch, pd.DataFrame):
+            batch = pd.DataFrame(batch)
+        for column, stats in self.numeric.items():
+            if column in batch:
+                stats.update(batch[column])
+                self.quantiles[column].update(batch[column])
+        for column, counter in self.frequencies.items():
+            if column in batch:
+                counter.update(batch[column])
+        self.rows += len(batch)
+
+    def merge(self, other):
+        """
+        Добавляет статистику другого набора накопителей с теми же столбцами.
+
+        Входные данные:
+        - other: Объект TableStats.
+        """
+        for column, stats in self.numeric.items():
+            stats.merge(other.numeric[column])
+            self.quantiles[column].merge(other.quantiles[column])
+        for column, counter in self.frequencies.items():
+            counter.merge(other.frequencies[column])
+        self.rows += other.rows
+
+    def summary(self):
+        """
+        Возвращает таблицу статистик количественных столбцов.
+
+        Выходные данные:
+        - pandas.DataFrame с индексом по столбцам и колонками
+          count, min, max, mean, std, variance, q25, median, q75.
+        """
+        return pd.DataFrame({
+            column: {
+                'count': stats.count,
+                'min': stats.min if stats.count else math.nan,
+                'max': stats.max if stats.count else math.nan,
+                'mean': stats.mean if stats.count else math.nan,
+                'std': stats.std,
+                'variance': stats.variance,
+                'q25': self.quantiles[column].quantile(0.25),
+                'median': self.quantiles[column].quantile(0.5),
+                'q75': self.quantiles[column].quantile(0.75),
+            }
+            for column, stats in self.numeric.items()
+        }).T
+
+    def frequency_table(self, column):
+        """
+        Возвращает таблицу частот качественного столбца.
+
+        Входные данные:
+        - column: Название столбца.
+
+        Выходные данные:
+        - pandas.DataFrame со столбцами [column, 'Частота', 'Процент']
+          по убыванию частоты.
+        """
+        counter = self.frequencies[column]
+        table = pd.DataFrame(counter.most_common(), columns=[column, 'Частота'])
+        total = counter.total
+        table['Процент'] = (table['Частота'] / total * 100 if total else 0.0)
+        return table
+
+
+def collect(batches, numeric_columns=(), categorical_columns=(), accuracy=QUANTILE_ACCURACY):
+    """
+    Считает статистику по пачкам строк за один проход.
+
+    Входные данные:
+    - batches: Итерируемый объект с пачками строк (pandas.DataFrame или
+      словарь {столбец: список значений}), например dataset.iter_batches
+      или history.iter_batches.
+    - numeric_columns: Список количественных столбцов.
+    - categorical_columns: Список качественных столбцов.
+    - accuracy: Относительная ошибка квантилей.
+
+    Выходные данные:
+    - stats: Объект TableStats.
+
+    Автор:
+    - Чибиров Руслан
+    """
+    stats = TableStats(numeric_columns, categorical_columns, accuracy)
+    for batch in batches:
+        stats.update(batch)
+    return stats
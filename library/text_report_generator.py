@@ -1,16 +1,19 @@
 """
-Модуль для генерации текстовых отчетов о вакансиях на основе данных из файла Excel.
+Модуль для генерации текстовых отчетов о вакансиях на основе сохраненной таблицы вакансий.
 
 Этот модуль включает функции для:
 - Генерации текстовых отчетов о вакансиях по различным параметрам.
 - Создания и сохранения сводных таблиц по данным о вакансиях.
 - Создания статистического отчета по данным о вакансиях.
+- Создания отчета по истории поисков (динамика зарплат и активность работодателей).
 - Открытия сгенерированных отчетов в текстовом редакторе операционной системы.
 
 Функции:
-- generate_vacancy_reports(): Генерирует текстовые отчеты о вакансиях на основе данных из файла.
-- generate_pivot_table_report(): Генерирует сводную таблицу на основе данных из файла.
-- generate_statistical_report(): Генерирует статистический отчет на основе данных из файла.
+- generate_vacancy_reports(data_dir, directory, open_report, fmt, limit, sample): Генерирует текстовые отчеты о вакансиях
+  с потоковой записью в файл.
+- generate_pivot_table_report(data_dir, directory, open_report, top_n, batches): Генерирует сводные таблицы за один проход по данным.
+- generate_statistical_report(data_dir, directory, open_report, batches): Генерирует статистический отчет за один проход по данным.
+- generate_history_report(data_dir, directory, open_report, query): Генерирует отчет по истории поисков.
 - open_file(output_file: str): Открывает указанный файл в текстовом редакторе операционной системы.
 
 Автор:
@@ -19,149 +22,183 @@
 import os
 import sys
 import subprocess
-import pandas as pd
 from tabulate import tabulate
+from library import dataset
+from library import history
+from library import streaming_stats
+from library import pivot
+from library import report_writer
 
 
-def generate_vacancy_reports():
+# Директория для сохранения отчетов
+output_dir = os.path.join(os.path.dirname(__file__), '..', 'output')
+# Количество строк в каждой сводной таблице; остальные объединяются в строку "Другие"
+PIVOT_TOP_N = 30
+
+
+def generate_vacancy_reports(data_dir=dataset.DATA_DIR, directory=None, open_report=True,
+                             fmt='pretty', limit=None, sample=None):
     """
-    Генерирует текстовые отчеты о вакансиях на основе данных из файла Excel.
+    Генерирует текстовые отчеты о вакансиях на основе сохраненной таблицы вакансий.
+    Таблица читается пачками строк, и каждый отчет записывается в файл по частям
+    (library.report_writer), поэтому расход памяти не зависит от количества вакансий.
+    В форматах csv и tsv у таблиц нет заголовков разделов, поэтому каждый отчет
+    записывается в отдельный файл (vacancies_report_<раздел>.csv).
 
     Входные данные:
-    -
+    - data_dir: Директория с данными.
+    - directory: Директория для сохранения отчета (по умолчанию 'output').
+    - open_report: Открывать ли отчет в текстовом редакторе.
+    - fmt: Формат таблиц ('pretty', 'fixed', 'markdown', 'csv', 'tsv').
+    - limit: Максимальное количество строк в каждом отчете (None - все строки).
+    - sample: Доля случайно выбранных строк от 0 до 1 (None - все строки).
 
     Выходные данные:
-    -
+    - output_file: Путь к сохраненному отчету (для csv и tsv - путь к файлу
+      первого отчета).
 
     Автор:
     - Чибиров Руслан
     """
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.xlsx')
-    df = pd.read_excel(file_path)
-    os.makedirs(os.path.join(os.path.dirname(__file__), '..', 'output'), exist_ok=True)
-    output_file = os.path.join(os.path.dirname(__file__), '..', 'output', 'vacancies_report.txt')
-    reports = []
-
-    # Отчет по зарплате и работодателям
-    salary_employer_columns = ['Название вакансии', 'Зарплата', 'Название работодателя']
-    salary_employer_headers = ['Название вакансии', 'Зарплата', 'Название работодателя']
-    salary_employer_report = tabulate(
-        df[salary_employer_columns],
-        headers=salary_employer_headers,
-        tablefmt="pretty"
-    )
-    reports.append("Отчет по зарплате и работодателям\n" + salary_employer_report)
-
-    # Отчет по опыту работы и типу занятости
-    experience_employment_columns = ['Название вакансии', 'Опыт работы', 'Тип занятости']
-    experience_employment_headers = ['Название вакансии', 'Опыт работы', 'Тип занятости']
-    experience_employment_report = tabulate(
-        df[experience_employment_columns],
-        headers=experience_employment_headers,
-        tablefmt="pretty"
-    )
-    reports.append("Отчет по опыту работы и типу занятости\n" + experience_employment_report)
-
-    # Отчет по наличию теста и графику работы
-    test_schedule_columns = ['Название вакансии', 'Наличие теста для кандидатов', 'График работы']
-    test_schedule_headers = ['Название вакансии', 'Наличие теста для кандидатов', 'График работы']
-    test_schedule_report = tabulate(
-        df[test_schedule_columns],
-        headers=test_schedule_headers,
-        tablefmt="pretty"
-    )
-    reports.append("Отчет по наличию теста и графику работы\n" + test_schedule_report)
-
-    # Объединение всех отчетов в один файл
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n\n".join(reports))
-    open_file(output_file)
-
-
-def generate_pivot_table_report():
+    os.makedirs(directory or output_dir, exist_ok=True)
+    extension = report_writer.EXTENSIONS[fmt]
+    reports = [
+        # Отчет по зарплате и работодателям
+        ("salary", "Отчет по зарплате и работодателям",
+         ['Название вакансии', 'Зарплата', 'Название работодателя']),
+        # Отчет по опыту работы и типу занятости
+        ("experience", "Отчет по опыту работы и типу занятости",
+         ['Название вакансии', 'Опыт работы', 'Тип занятости']),
+        # Отчет по наличию теста и графику работы
+        ("schedule", "Отчет по наличию теста и графику работы",
+         ['Название вакансии', 'Наличие теста для кандидатов', 'График работы']),
+    ]
+    if fmt in ('csv', 'tsv'):
+        # Один файл - одна таблица, иначе файл не читается как csv
+        files = [(os.path.join(directory or output_dir, f"vacancies_report_{name}.{extension}"),
+                  [(None, columns)])
+                 for name, title, columns in reports]
+    else:
+        files = [(os.path.join(directory or output_dir, f"vacancies_report.{extension}"),
+                  [(title, columns) for name, title, columns in reports])]
+
+    # Отчеты записываются в файл по мере чтения таблицы
+    for output_file, sections in files:
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            for number, (title, columns) in enumerate(sections):
+                if number:
+                    f.write("\n")
+                if title:
+                    f.write(f"{title}\n")
+                report_writer.write_table(
+                    f, lambda columns=columns: dataset.iter_batches(data_dir, columns),
+                    columns, fmt=fmt, limit=limit, sample=sample
+                )
+        if open_report:
+            open_file(output_file)
+    return files[0][0]
+
+
+def generate_pivot_table_report(data_dir=dataset.DATA_DIR, directory=None, open_report=True,
+                                top_n=PIVOT_TOP_N, batches=None):
     """
-    Генерирует отчет в формате сводной таблицы на основе данных из файла Excel.
-    Читает данные из файла Excel, создает сводную таблицу и сохраняет её в текстовый файл.
+    Генерирует отчет в формате сводной таблицы на основе сохраненной таблицы вакансий.
+    Читает таблицу вакансий пачками строк, считает все сводные таблицы за один
+    проход (library.pivot) и записывает их в текстовый файл по мере готовности.
+    В каждой таблице остаются top_n строк с наибольшим количеством вакансий,
+    остальные объединяются в строку "Другие".
 
-    Входные данные: 
-    -
+    Входные данные:
+    - data_dir: Директория с данными.
+    - directory: Директория для сохранения отчета (по умолчанию 'output').
+    - open_report: Открывать ли отчет в текстовом редакторе.
+    - top_n: Количество строк в каждой сводной таблице (None - все строки).
+    - batches: Пачки строк для отчета (по умолчанию таблица вакансий из data_dir).
 
     Выходные данные:
-    -
+    - output_file: Путь к сохраненному отчету.
 
     Автор:
     - Чибиров Руслан
     """
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.xlsx')
-    df = pd.read_excel(file_path)
-    os.makedirs(os.path.join(os.path.dirname(__file__), '..', 'output'), exist_ok=True)
-    output_file = os.path.join(os.path.dirname(__file__), '..', 'output', 'pivot_table_report.txt')
-    agg_func = 'size'
+    os.makedirs(directory or output_dir, exist_ok=True)
+    output_file = os.path.join(directory or output_dir, 'pivot_table_report.txt')
     attributes = [
     ('Название работодателя', 'Тип занятости'),
     ('График работы', 'Опыт работы'),
     ('Название вакансии', 'График работы')
     ]
-    report_lines = []
-
-    for row_attr, col_attr in attributes:
-        pivot_table = pd.pivot_table(df, index=row_attr, columns=col_attr,
-                                     aggfunc=agg_func, fill_value=0)
-        pivot_table = pivot_table.reset_index()
-
-        report_lines.append(f"Сводная таблица для '{row_attr}' и '{col_attr}':\n")
-        report_lines.append(tabulate(pivot_table, headers='keys', tablefmt="pretty"))
-        report_lines.append("\n")
+    columns = list(dict.fromkeys(column for pair in attributes for column in pair))
+    if batches is None:
+        batches = dataset.iter_batches(data_dir, columns)
+    counter = pivot.count_pairs(batches, attributes)
 
-    # Сохранение отчета в файл
+    # Таблицы записываются в файл по одной, без сборки всего отчета в памяти
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("\n".join(report_lines))
-    open_file(output_file)
-
-
-def generate_statistical_report():
+        for row_attr, col_attr in attributes:
+            pivot_table = counter.table((row_attr, col_attr), top_n)
+            f.write(f"Сводная таблица для '{row_attr}' и '{col_attr}':\n\n")
+            report_writer.write_table(f, pivot_table, list(pivot_table.columns))
+            f.write("\n\n")
+    if open_report:
+        open_file(output_file)
+    return output_file
+
+
+def generate_statistical_report(data_dir=dataset.DATA_DIR, directory=None, open_report=True,
+                                batches=None):
     """
-    Генерирует статистический отчет на основе данных из файла Excel.
-    Читает данные из файла Excel, вычисляет статистику и сохраняет её в текстовый файл.
+    Генерирует статистический отчет на основе сохраненной таблицы вакансий.
+    Читает таблицу вакансий пачками строк, вычисляет статистику за один проход
+    (library.streaming_stats) и сохраняет её в текстовый файл. Расход памяти
+    не зависит от количества вакансий.
 
     Входные данные:
-    -
+    - data_dir: Директория с данными.
+    - directory: Директория для сохранения отчета (по умолчанию 'output').
+    - open_report: Открывать ли отчет в текстовом редакторе.
+    - batches: Пачки строк для отчета (по умолчанию таблица вакансий из
+      data_dir, см. dataset.iter_batches; например, history.iter_batches
+      для отчета по всей истории поисков).
 
     Выходные данные:
-    -
+    - output_file: Путь к сохраненному отчету.
 
     Автор:
     - Чибиров Руслан
     """
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.xlsx')
-    df = pd.read_excel(file_path)
-    os.makedirs(os.path.join(os.path.dirname(__file__), '..', 'output'), exist_ok=True)
-    output_file = os.path.join(os.path.dirname(__file__), '..', 'output', 'statistical_report.txt')
+    os.makedirs(directory or output_dir, exist_ok=True)
+    output_file = os.path.join(directory or output_dir, 'statistical_report.txt')
     columns = ['Зарплата', 'Опыт работы', 'Тип занятости',
                'Наличие теста для кандидатов', 'График работы']
+    quantitative_columns = [column for column in columns if column in dataset.INTEGER_COLUMNS]
+    qualitative_columns = [column for column in columns if column not in quantitative_columns]
+    if batches is None:
+        batches = dataset.iter_batches(data_dir, columns)
+    stats = streaming_stats.collect(batches, quantitative_columns, qualitative_columns)
     report_lines = []
 
     # Для количественных переменных
-    quantitative_columns = df[columns].select_dtypes(include=['number']).columns.tolist()
     if quantitative_columns:
+        summary = stats.summary()
         report_lines.append("Статистики для количественных переменных:\n")
-        stats = df[quantitative_columns].describe().T
-        stats['variance'] = df[quantitative_columns].var()
-        stats = stats[['min', 'max', 'mean', 'std', 'variance']]
         report_lines.append(
-            tabulate(stats, headers=['Переменная', 'Мин', 'Макс', 'Среднее',
-                                    'Ст. отклонение', 'Дисперсия'], tablefmt="pretty"))
+            tabulate(summary[['min', 'max', 'mean', 'std', 'variance']],
+                     headers=['Переменная', 'Мин', 'Макс', 'Среднее',
+                              'Ст. отклонение', 'Дисперсия'], tablefmt="pretty"))
+        report_lines.append("\n")
+        report_lines.append("Квантили (приближенно, с точностью до 1%):\n")
+        report_lines.append(
+            tabulate(summary[['q25', 'median', 'q75']].round(),
+                     headers=['Переменная', '25%', 'Медиана', '75%'], tablefmt="pretty"))
         report_lines.append("\n")
 
     # Для качественных переменных
-    qualitative_columns = df[columns].select_dtypes(exclude=['number']).columns.tolist()
     if qualitative_columns:
         report_lines.append("Таблица частот для качественных переменных:\n")
         for column in qualitative_columns:
             report_lines.append(f"Переменная: {column}\n")
-            freq_table = df[column].value_counts().reset_index()
-            freq_table.columns = [column, 'Частота']
-            freq_table['Процент'] = (freq_table['Частота'] / freq_table['Частота'].sum()) * 100
+            freq_table = stats.frequency_table(column)
             freq_table['Процент'] = freq_table['Процент'].apply(lambda x: f"{x:.2f}%")
             report_lines.append(tabulate(freq_table, headers=[column, 'Частота', 'Процент'],
                                         tablefmt="pretty"))
@@ -170,7 +207,75 @@ def generate_statistical_report():
     # Сохранение отчета в файл
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write("\n".join(report_lines))
-    open_file(output_file)
+    if open_report:
+        open_file(output_file)
+    return output_file
+
+
+def generate_history_report(data_dir=dataset.DATA_DIR, directory=None, open_report=True,
+                            query=None):
+    """
+    Генерирует отчет по истории поисков.
+    Сводки считаются запросами к базе данных истории (library.history),
+    без загрузки всей истории в память.
+
+    Входные данные:
+    - data_dir: Директория с данными.
+    - directory: Директория для сохранения отчета (по умолчанию 'output').
+    - open_report: Открывать ли отчет в текстовом редакторе.
+    - query: Строка с запросом (по умолчанию запрос последнего поиска).
+
+    Выходные данные:
+    - output_file: Путь к сохраненному отчету.
+
+    Автор:
+    - Чибиров Руслан
+    """
+    path = os.path.join(data_dir, history.HISTORY_NAME)
+    os.makedirs(directory or output_dir, exist_ok=True)
+    output_file = os.path.join(directory or output_dir, 'history_report.txt')
+    if query is None:
+        last_runs = history.runs(path, limit=1)
+        query = last_runs[0]['query'] if last_runs else ''
+    report_lines = [f"История поисков по запросу '{history.normalize_query(query)}'\n"]
+
+    # Поиски
+    runs = history.runs(path, query)
+    report_lines.append("Последние поиски:\n")
+    report_lines.append(tabulate(
+        [[run['fetched_at'], run['city'] or 'Любой', run['rows']] for run in runs],
+        headers=['Время', 'Город', 'Вакансий'], tablefmt="pretty"))
+    report_lines.append("\n")
+
+    # Количество вакансий и зарплаты по дням
+    counts = {row['period']: row for row in history.vacancy_counts(path, query)}
+    report_lines.append("Вакансии и зарплаты по дням:\n")
+    report_lines.append(tabulate(
+        [[row['period'], row['vacancies'], counts[row['period']]['new_vacancies'],
+          row['salary_min'], f"{row['salary_avg']:.0f}" if row['salary_avg'] else '-',
+          row['salary_max']]
+         for row in history.salary_trend(path, query)],
+        headers=['День', 'Вакансий', 'Новых', 'Мин. зарплата', 'Средняя зарплата',
+                 'Макс. зарплата'], tablefmt="pretty"))
+    report_lines.append("\n")
+
+    # Работодатели с наибольшим количеством вакансий
+    report_lines.append("Работодатели с наибольшим количеством вакансий:\n")
+    report_lines.append(tabulate(
+        [[row['employer'], row['new_vacancies'],
+          f"{row['salary_avg']:.0f}" if row['salary_avg'] else '-',
+          row['first_seen'], row['last_seen']]
+         for row in history.employer_activity(path, query)],
+        headers=['Работодатель', 'Вакансий', 'Средняя зарплата', 'Впервые', 'Последний раз'],
+        tablefmt="pretty"))
+    report_lines.append("\n")
+
+    # Сохранение отчета в файл
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(report_lines))
+    if open_report:
+        open_file(output_file)
+    return output_file
 
 
 def open_file(output_file: str):
@@ -8,33 +8,228 @@
 - Построения категоризированной диаграммы рассеивания.
 
 Функции:
-- plot_clustered_bar(df, col1, col2):
+- aggregate_*(df, col1, col2): Сводят таблицу к небольшим таблицам для графиков
+(clustered_bar, categorized_histogram, categorized_boxplot, scatter) с помощью
+library.chart_data; числовые столбцы разбиваются на корзины.
+- draw_*(data, col1, col2, ax): Рисуют графики на переданных осях (library.chart_panel)
+или на новой фигуре по подготовленным данным
+примитивами matplotlib (clustered_bar, categorized_histogram, categorized_boxplot,
+categorized_scatter), поэтому время рисования не зависит от количества вакансий.
+- plot_clustered_bar(df, col1, col2, directory, show):
 Построение кластеризованной столбчатой диаграммы.
-- plot_categorized_histogram(df, col1, col2):
+- plot_categorized_histogram(df, col1, col2, directory, show):
 Построение категоризированной гистограммы.
-- plot_categorized_boxplot(df, col1, col2):
+- plot_categorized_boxplot(df, col1, col2, directory, show):
 Построение категоризированной диаграммы Бокса-Вискера.
-- plot_categorized_scatter(df, col1, col2):
+- plot_categorized_scatter(df, col1, col2, directory, show):
 Построение категоризированной диаграммы рассеивания.
-- main(col1, col2, plot_type):
+- chart_task(df, col1, col2, plot_type):
+Подготавливает задание на построение графика для library.chart_renderer.
+- main(col1, col2, plot_type, data_dir, directory, show):
 Основная функция для построения графиков в зависимости от выбранного типа.
 
+Оформление графиков (стиль whitegrid и увеличенный шрифт seaborn) задается
+словарем STYLE и действует только на время рисования (matplotlib.rc_context),
+поэтому не влияет на другие графики, построенные в том же процессе. Оси,
+переданные функциям draw_*, следует создавать в том же оформлении
+(см. ChartPanel.show).
+
 Авторы:
 - Елисеев Иван
 """
 import os
-import pandas as pd
+import numpy as np
+from library import dataset
+from library import chart_data
+from library import chart_cache
 import seaborn as sns
 import matplotlib.pyplot as plt
 
 
+# Оформление пользовательских графиков (настройки matplotlib rcParams)
+STYLE = {**sns.axes_style('whitegrid'), **sns.plotting_context('notebook', font_scale=1.2)}
+
 # Создание директории для сохранения графиков, если её нет
 output_dir = os.path.join(os.path.dirname(__file__), '..', 'graphics')
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
 
-def plot_clustered_bar(df, col1, col2):
+def _cached_plot(filename, key_parts, directory, show, draw):
+    """
+    Строит график с использованием кэша графиков (library.chart_cache).
+
+    Входные данные:
+    filename (str): Имя файла графика (определяет тип графика).
+    key_parts (tuple): Агрегированные данные и параметры, от которых зависит график.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
+    draw: Функция без аргументов, которая рисует график.
+
+    Выходные данные:
+    str: Путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    output_path = os.path.join(directory or output_dir, filename)
+
+    def build():
+        draw()
+        plt.savefig(output_path)
+        if show:
+            plt.show()
+        plt.close()
+        return output_path
+
+    key = chart_cache.make_key(filename, *key_parts)
+    return chart_cache.cached_plot(key, output_path, show, build)
+
+
+def _style():
+    """
+    Возвращает контекст, в котором действует оформление STYLE.
+    """
+    return plt.rc_context(STYLE)
+
+
+def _axes(ax=None, figsize=(12, 8)):
+    """
+    Возвращает оси для рисования графика: переданные оси (например, оси
+    встроенной в окно фигуры library.chart_panel) или оси новой фигуры pyplot.
+
+    Входные данные:
+    ax (matplotlib.axes.Axes): Оси или None.
+    figsize (tuple): Размер новой фигуры в дюймах.
+
+    Выходные данные:
+    matplotlib.axes.Axes: Оси для рисования.
+
+    Автор:
+    - Елисеев Иван
+    """
+    if ax is None:
+        plt.figure(figsize=figsize)
+        ax = plt.gca()
+    return ax
+
+
+def _style_ticks(ax, axis, ha=None, **params):
+    """
+    Оформляет подписи делений оси (как plt.xticks/plt.yticks без позиций):
+    params передаются в Axes.tick_params, ha - выравнивание подписей.
+    """
+    ax.tick_params(axis=axis, **params)
+    if ha is not None:
+        plt.setp(ax.get_xticklabels() if axis == 'x' else ax.get_yticklabels(), ha=ha)
+
+
+def _category_axis(ax, axis, labels):
+    """
+    Подписывает деления оси категорий (позиции 0, 1, 2, ...).
+    """
+    positions = np.arange(len(labels))
+    if axis == 'x':
+        ax.set_xticks(positions, [str(label) for label in labels])
+    else:
+        ax.set_yticks(positions, [str(label) for label in labels])
+
+
+def _value_axes(df, col1, col2):
+    """
+    Выбирает столбец значений и столбец категорий, как seaborn для x=col2, y=col1:
+    по умолчанию категории по оси x (col2), значения - по оси y (col1).
+    """
+    if chart_data.is_numeric(df[col1]):
+        return col1, col2
+    if chart_data.is_numeric(df[col2]):
+        return col2, col1
+    return None, None
+
+
+def aggregate_clustered_bar(df, col1, col2):
+    """
+    Подготавливает данные для кластеризованной столбчатой диаграммы.
+
+    Если один из столбцов числовой, считается его среднее значение для каждой
+    категории другого столбца (числовой столбец категорий разбивается на
+    корзины). Если оба столбца качественные, считается количество вакансий
+    для каждой пары категорий.
+
+    Входные данные:
+    df (DataFrame): База данных.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для оси x.
+
+    Выходные данные:
+    DataFrame: Индекс - категории столбца, по которому строятся столбики;
+    один столбец средних значений или (для двух качественных столбцов)
+    по столбцу на каждую категорию col1.
+
+    Автор:
+    - Елисеев Иван
+    """
+    value, group = _value_axes(df, col1, col2)
+    if value is None:
+        return chart_data.crosstab(df, col2, col1)
+    return chart_data.group_means(df, value, group)
+
+
+def draw_clustered_bar(data, col1, col2, ax=None):
+    """
+    Рисует кластеризованную столбчатую диаграмму на переданных осях или новой фигуре.
+
+    Входные данные:
+    data (DataFrame): Результат aggregate_clustered_bar.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для оси x.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    with _style():
+        ax = _axes(ax)
+        positions = np.arange(len(data))
+        horizontal = data.index.name == col1
+        if data.columns.name == col1:
+            # Оба столбца качественные: столбики из частей по категориям col1
+            bottom = np.zeros(len(data))
+            colors = sns.color_palette('husl', len(data.columns))
+            for color, category in zip(colors, data.columns):
+                values = data[category].to_numpy()
+                ax.bar(positions, values, bottom=bottom, color=color, alpha=0.8,
+                       label=str(category))
+                bottom += values
+            ax.legend(title=col1, fontsize=12)
+            value_label = chart_data.COUNT_LABEL
+        else:
+            colors = sns.color_palette('husl', len(data))
+            values = data.iloc[:, 0].to_numpy()
+            if horizontal:
+                ax.barh(positions, values, color=colors, alpha=0.8)
+            else:
+                ax.bar(positions, values, color=colors, alpha=0.8)
+            value_label = col1
+        _category_axis(ax, 'y' if horizontal else 'x', data.index)
+        ax.set_title('Кластеризованная столбчатая диаграмма', fontsize=18,
+                     fontweight='bold')  # Увеличиваем размер заголовка и делаем его жирным
+        ax.set_xlabel(col2, fontsize=14, fontweight='bold')  # Делаем подпись оси x жирной
+        ax.set_ylabel(col1 if horizontal else value_label, fontsize=14, fontweight='bold')
+        _style_ticks(ax, 'x', ha='center' if horizontal else 'right',
+                     labelrotation=0 if horizontal else 30)
+        _style_ticks(ax, 'y', labelsize=12)
+
+        ax.yaxis.grid(True)
+        ax.xaxis.grid(True)
+
+        ax.figure.tight_layout()
+
+
+def plot_clustered_bar(df, col1, col2, directory=None, show=True):
     """
     Построение кластеризованной столбчатой диаграммы.
 
@@ -42,35 +237,81 @@ def plot_clustered_bar(df, col1, col2):
     df (DataFrame): База данных.
     col1 (str): Название столбца для оси x.
     col2 (str): Название столбца для оси y.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
     Выходные данные:
-    -
+    str: Путь к сохраненному файлу.
+
+    Автор:
+    - Елисеев Иван
+    """
+    # Построение графика (из кэша, если агрегированные данные не изменились)
+    data = aggregate_clustered_bar(df, col1, col2)
+    return _cached_plot('clustered_bar.png', (data, col1, col2), directory, show,
+                        lambda: draw_clustered_bar(data, col1, col2))
+
+
+def aggregate_categorized_histogram(df, col1, col2):
+    """
+    Подсчитывает количество вакансий для каждой пары категорий col1 и col2
+    (числовые столбцы разбиваются на корзины).
+
+    Входные данные:
+    df (DataFrame): База данных.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для оси x.
+
+    Выходные данные:
+    DataFrame: Количество вакансий; индекс - категории col1, столбцы - категории col2.
 
     Автор:
     - Елисеев Иван
     """
-    plt.figure(figsize=(12, 8))
-    sns.set(style="whitegrid", font_scale=1.2)  # Увеличиваем размер шрифта
-    ax = sns.barplot(
-        data=df, x=col2, y=col1, hue=col1, dodge=False,
-        palette='husl', legend=False, alpha=0.8, errorbar=None
-    )
-    plt.title('Кластеризованная столбчатая диаграмма', fontsize=18,
-              fontweight='bold')  # Увеличиваем размер заголовка и делаем его жирным
-    plt.xlabel(col2, fontsize=14, fontweight='bold')  # Делаем подпись оси x жирной
-    plt.ylabel(col1, fontsize=14, fontweight='bold')  # Делаем подпись оси y жирной
-    plt.yticks(fontsize=12)
+    return chart_data.crosstab(df, col1, col2)
 
-    ax.yaxis.grid(True)
-    ax.xaxis.grid(True)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'clustered_bar.png'))
-    plt.show()
-    plt.close()
+def draw_categorized_histogram(counts, col1, col2, ax=None):
+    """
+    Рисует категоризированную (двумерную) гистограмму на переданных осях или новой фигуре:
+    цвет клетки - количество вакансий с парой значений col1 и col2.
 
+    Входные данные:
+    counts (DataFrame): Результат aggregate_categorized_histogram.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для оси x.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
 
-def plot_categorized_histogram(df, col1, col2):
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    with _style():
+        ax = _axes(ax)
+        # Пустые клетки не закрашиваются; центры клеток - в целых позициях категорий
+        values = np.ma.masked_equal(counts.to_numpy(), 0)
+        mesh = ax.pcolormesh(np.arange(len(counts.columns) + 1) - 0.5,
+                             np.arange(len(counts) + 1) - 0.5, values, cmap='Blues', alpha=0.8)
+        ax.figure.colorbar(mesh, ax=ax, label=chart_data.COUNT_LABEL)
+        _category_axis(ax, 'x', counts.columns)
+        _category_axis(ax, 'y', counts.index)
+        ax.set_title(
+            'Категоризированная гистограмма',
+            fontsize=18, fontweight='bold', color='navy'
+        )
+        ax.set_xlabel(col2, fontsize=14, fontweight='bold', color='darkblue')
+        ax.set_ylabel(col1, fontsize=14, fontweight='bold', color='darkblue')
+        _style_ticks(ax, 'x', ha='right', labelsize=12, labelrotation=30, labelcolor='gray')
+        _style_ticks(ax, 'y', labelsize=12, labelcolor='gray')
+
+        ax.grid(False)
+
+        ax.figure.tight_layout()
+
+
+def plot_categorized_histogram(df, col1, col2, directory=None, show=True):
     """
     Построение категоризированной гистограммы.
 
@@ -78,35 +319,90 @@ def plot_categorized_histogram(df, col1, col2):
     df (DataFrame): База данных.
     col1 (str): Название столбца для оси y.
     col2 (str): Название столбца для оси x.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
     Выходные данные:
-    -
+    str: Путь к сохраненному файлу.
 
     Автор:
     - Елисеев Иван
     """
-    plt.figure(figsize=(12, 8))
-    sns.set(style="whitegrid", font_scale=1.2)
-    ax = sns.histplot(data=df, y=col1, x=col2, multiple='stack', alpha=0.8)
-    plt.title(
-        'Категоризированная гистограмма',
-        fontsize=18, fontweight='bold', color='navy'
-    )
-    plt.xlabel(col2, fontsize=14, fontweight='bold', color='darkblue')
-    plt.ylabel(col1, fontsize=14, fontweight='bold', color='darkblue')
-    plt.xticks(fontsize=12, ha='right', color='gray')
-    plt.yticks(fontsize=12, color='gray')
+    # Построение графика (из кэша, если агрегированные данные не изменились)
+    counts = aggregate_categorized_histogram(df, col1, col2)
+    return _cached_plot('categorized_histogram.png', (counts, col1, col2), directory, show,
+                        lambda: draw_categorized_histogram(counts, col1, col2))
 
-    ax.yaxis.grid(True)
-    ax.xaxis.grid(True)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'categorized_histogram.png'))
-    plt.show()
-    plt.close()
+def aggregate_categorized_boxplot(df, col1, col2):
+    """
+    Считает статистики диаграммы Бокса-Вискера числового столбца
+    для каждой категории другого столбца.
+
+    Входные данные:
+    df (DataFrame): База данных.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для оси x.
 
+    Выходные данные:
+    DataFrame: Результат library.chart_data.box_stats (индекс - категории)
+    или None, если оба столбца качественные.
 
-def plot_categorized_boxplot(df, col1, col2):
+    Автор:
+    - Елисеев Иван
+    """
+    value, group = _value_axes(df, col1, col2)
+    if value is None:
+        return None
+    return chart_data.box_stats(df, value, group)
+
+
+def draw_categorized_boxplot(stats, col1, col2, ax=None):
+    """
+    Рисует категоризированную диаграмму Бокса-Вискера на переданных осях или новой фигуре
+    по заранее посчитанным квартилям (без выбросов).
+
+    Входные данные:
+    stats (DataFrame): Результат aggregate_categorized_boxplot.
+    col1 (str): Название столбца для оси y.
+    сol2 (str): Название столбца для оси x.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    with _style():
+        ax = _axes(ax)
+        horizontal = stats.index.name == col1
+        boxes = [dict(row, label=str(label)) for label, row in stats.iterrows()]
+        artists = ax.bxp(boxes, positions=np.arange(len(boxes)), widths=0.8, vert=not horizontal,
+                         showfliers=False, patch_artist=True,
+                         boxprops={'linewidth': 2.5}, whiskerprops={'linewidth': 2.5},
+                         capprops={'linewidth': 2.5}, medianprops={'linewidth': 2.5, 'color': 'k'})
+        # Увеличиваем толщину линий и ширину коробок
+        for box, color in zip(artists['boxes'], sns.color_palette('pastel', len(boxes))):
+            box.set_facecolor(color)
+        ax.set_title('Категоризированная диаграмма Бокса-Вискера', fontsize=22, fontweight='bold',
+                     color='navy')  # Увеличиваем размер заголовка и делаем его жирным
+        ax.set_xlabel(col2, fontsize=16, fontweight='bold', color='darkblue')
+        ax.set_ylabel(col1, fontsize=16, fontweight='bold', color='darkblue')
+        # Поворачиваем и выравниваем подписи оси x
+        _style_ticks(ax, 'x', ha='center' if horizontal else 'right', labelsize=14,
+                     labelrotation=0 if horizontal else 30, labelcolor='gray')
+        _style_ticks(ax, 'y', labelsize=14, labelcolor='gray')  # Делаем подписи оси y серыми
+        ax.grid(True, linestyle='--', alpha=0.7)  # Добавляем пунктирную сетку
+
+        # Добавляем сетку
+        ax.yaxis.grid(True)
+        ax.xaxis.grid(True)
+
+        ax.figure.tight_layout()
+
+
+def plot_categorized_boxplot(df, col1, col2, directory=None, show=True):
     """
     Построение категоризированной диаграммы Бокса-Вискера.
 
@@ -114,38 +410,87 @@ def plot_categorized_boxplot(df, col1, col2):
     df (DataFrame): База данных.
     col1 (str): Название столбца для оси y.
     сol2 (str): Название столбца для оси x.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
     Выходные данные:
-    -
+    str: Путь к сохраненному файлу или None, если оба столбца качественные.
 
     Автор:
     - Елисеев Иван 
     """
-    plt.figure(figsize=(12, 8))
-    sns.set(style="whitegrid", font_scale=1.2)  # Увеличиваем размер шрифта
-    ax = sns.boxplot(
-        data=df, x=col2, y=col1, hue=col1, dodge=False,
-        palette='pastel', legend=False, linewidth=2.5, width=0.8
-    )  # Увеличиваем толщину линий и ширину коробок
-    plt.title('Категоризированная диаграмма Бокса-Вискера', fontsize=22, fontweight='bold',
-              color='navy')  # Увеличиваем размер заголовка и делаем его жирным
-    plt.xlabel(col2, fontsize=16, fontweight='bold', color='darkblue')
-    plt.ylabel(col1, fontsize=16, fontweight='bold', color='darkblue')
-    plt.xticks(fontsize=14, ha='right', color='gray')  # Поворачиваем и выравниваем подписи оси x
-    plt.yticks(fontsize=14, color='gray')  # Делаем подписи оси y серыми
-    plt.grid(True, linestyle='--', alpha=0.7)  # Добавляем пунктирную сетку
+    # Построение графика (из кэша, если агрегированные данные не изменились)
+    stats = aggregate_categorized_boxplot(df, col1, col2)
+    if stats is None:
+        return None
+    return _cached_plot('categorized_boxplot.png', (stats, col1, col2), directory, show,
+                        lambda: draw_categorized_boxplot(stats, col1, col2))
+
+
+def aggregate_scatter(df, col1, col2):
+    """
+    Подсчитывает количество вакансий для каждой пары значений col1 и col2
+    (числовые столбцы разбиваются на корзины).
 
-    # Добавляем сетку
-    ax.yaxis.grid(True)
-    ax.xaxis.grid(True)
+    Входные данные:
+    df (DataFrame): База данных.
+    col1 (str): Название столбца для оси y.
+    col2 (str): Название столбца для категоризации данных.
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'categorized_boxplot.png'))
-    plt.show()
-    plt.close()
+    Выходные данные:
+    DataFrame: Столбцы col1, col2 и 'Количество вакансий' (только
+    встречающиеся пары, в порядке категорий col1).
 
+    Автор:
+    - Елисеев Иван
+    """
+    # Аггрегирование данных для подсчета количества вакансий
+    counts = chart_data.crosstab(df, col1, col2).stack().rename(chart_data.COUNT_LABEL)
+    return counts[counts > 0].reset_index()
 
-def plot_categorized_scatter(df, col1, col2):
+
+def draw_categorized_scatter(agg_df, col1, col2, ax=None):
+    """
+    Рисует категоризированную диаграмму рассеивания на переданных осях или новой фигуре.
+
+    Входные данные:
+    agg_df (DataFrame): Результат aggregate_scatter.
+    col1 (str): Название столбца для оси x.
+    col2 (str): Название столбца для категоризации данных.
+    ax (matplotlib.axes.Axes): Оси для рисования (по умолчанию - оси новой фигуры).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Елисеев Иван
+    """
+    with _style():
+        ax = _axes(ax)
+        rows = list(dict.fromkeys(agg_df[col1]))
+        row_position = {label: position for position, label in enumerate(rows)}
+        hues = list(dict.fromkeys(agg_df[col2]))
+        for color, hue in zip(sns.color_palette('viridis', len(hues)), hues):
+            part = agg_df[agg_df[col2] == hue]
+            ax.scatter(part['Количество вакансий'], part[col1].map(row_position), s=150,
+                       color=color, alpha=0.8, edgecolors='k', linewidths=1.5, label=str(hue))
+        _category_axis(ax, 'y', rows)
+        ax.set_title('Категоризированная диаграмма рассеивания', fontsize=22,
+                     fontweight='bold', color='navy')
+        ax.set_xlabel('Количество вакансий', fontsize=16, fontweight='bold', color='darkblue')
+        ax.set_ylabel(col1, fontsize=16, fontweight='bold', color='darkblue')
+        _style_ticks(ax, 'x', labelsize=14, labelcolor='gray')  # Делаем подписи оси x серыми
+        _style_ticks(ax, 'y', labelsize=14, labelcolor='gray')  # Делаем подписи оси y серыми
+        ax.legend(title=col2, fontsize=12, title_fontsize=14)
+
+        # Добавляем сетку
+        ax.yaxis.grid(True)
+        ax.xaxis.grid(True)
+
+        ax.figure.tight_layout()
+
+
+def plot_categorized_scatter(df, col1, col2, directory=None, show=True):
     """
     Построение категоризированной диаграммы рассеивания.
 
@@ -153,40 +498,62 @@ def plot_categorized_scatter(df, col1, col2):
     df (DataFrame): База данных.
     col1 (str): Название столбца для оси x.
     col2 (str): Название столбца для категоризации данных.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
     Выходные данные:
-    -
+    str: Путь к сохраненному файлу.
 
     Автор:
     - Елисеев Иван
     """
-    # Аггрегирование данных для подсчета количества вакансий
-    agg_df = df.groupby([col1, col2]).size().reset_index(name='Количество вакансий')
+    # Построение графика (из кэша, если агрегированные данные не изменились)
+    agg_df = aggregate_scatter(df, col1, col2)
+    return _cached_plot('categorized_scatter.png', (agg_df, col1, col2), directory, show,
+                        lambda: draw_categorized_scatter(agg_df, col1, col2))
+
+
+PLOT_TYPES = {
+    'Столбчатая диаграмма':
+        (aggregate_clustered_bar, draw_clustered_bar, 'clustered_bar.png'),
+    'Категоризированная гистограмма':
+        (aggregate_categorized_histogram, draw_categorized_histogram, 'categorized_histogram.png'),
+    'Диаграмма Бокса-Вискера':
+        (aggregate_categorized_boxplot, draw_categorized_boxplot, 'categorized_boxplot.png'),
+    'Диаграмма рассеивания':
+        (aggregate_scatter, draw_categorized_scatter, 'categorized_scatter.png'),
+}
 
-    plt.figure(figsize=(12, 8))
-    sns.set(style="whitegrid", font_scale=1.2)  # Увеличиваем размер шрифта
-    ax = sns.scatterplot(data=agg_df, y=col1, x='Количество вакансий',
-                        hue=col2, s=150, palette='viridis', alpha=0.8,
-                        edgecolor='k', linewidth=1.5)
-    plt.title('Категоризированная диаграмма рассеивания', fontsize=22,
-              fontweight='bold', color='navy')
-    plt.xlabel('Количество вакансий', fontsize=16, fontweight='bold', color='darkblue')
-    plt.ylabel(col1, fontsize=16, fontweight='bold', color='darkblue')
-    plt.xticks(fontsize=14, color='gray')  # Делаем подписи оси x серыми
-    plt.yticks(fontsize=14, color='gray')  # Делаем подписи оси y серыми
-    plt.legend(title=col2, fontsize=12, title_fontsize=14)
 
-    # Добавляем сетку
-    ax.yaxis.grid(True)
-    ax.xaxis.grid(True)
+def chart_task(df, col1, col2, plot_type):
+    """
+    Подготавливает задание на построение графика выбранного типа.
+
+    В задание попадают только агрегированные данные (функции aggregate_*),
+    поэтому его можно передать в другой процесс (см. library.chart_renderer).
+
+    Входные данные:
+    df (DataFrame): База данных.
+    col1 (str): Название столбца для оси x.
+    col2 (str): Название столбца для оси y или категоризации данных.
+    plot_type (str): Тип графика для построения.
+
+    Выходные данные:
+    tuple: (функция draw_*, аргументы, имя файла) или None, если график не строится.
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'categorized_scatter.png'))
-    plt.show()
-    plt.close()
+    Автор:
+    - Елисеев Иван
+    """
+    if col1 == col2 or plot_type not in PLOT_TYPES:
+        return None
+    aggregate, draw, filename = PLOT_TYPES[plot_type]
+    data = aggregate(df, col1, col2)
+    if data is None:
+        return None
+    return draw, (data, col1, col2), filename
 
 
-def main(col1, col2, plot_type):
+def main(col1, col2, plot_type, data_dir=dataset.DATA_DIR, directory=None, show=True):
     """
     Основная функция для построения графиков в зависимости от выбранного типа.
 
@@ -194,26 +561,27 @@ def main(col1, col2, plot_type):
     col1 (str): Название столбца для оси x.
     col2 (str): Название столбца для оси y или категоризации данных.
     plot_type (str): Тип графика для построения.
+    data_dir (str): Директория с данными.
+    directory (str): Директория для сохранения графика (по умолчанию 'graphics').
+    show (bool): Показывать ли график на экране.
 
     Выходные данные:
-    -
+    str: Путь к сохраненному файлу или None, если график не построен.
 
     Автор:
     - Елисеев Иван
     """
     if col1 != col2:
-        # Путь к файлу данных
-        file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'data.xlsx')
-
         # Загрузка данных
-        df = pd.read_excel(file_path)
+        df = dataset.get_dataset(data_dir)
 
         # Построение графиков в зависимости от типа
         if plot_type == 'Столбчатая диаграмма':
-            plot_clustered_bar(df, col1, col2)
+            return plot_clustered_bar(df, col1, col2, directory, show)
         elif plot_type == 'Категоризированная гистограмма':
-            plot_categorized_histogram(df, col1, col2)
+            return plot_categorized_histogram(df, col1, col2, directory, show)
         elif plot_type == 'Диаграмма Бокса-Вискера':
-            plot_categorized_boxplot(df, col1, col2)
+            return plot_categorized_boxplot(df, col1, col2, directory, show)
         elif plot_type == 'Диаграмма рассеивания':
-            plot_categorized_scatter(df, col1, col2)
+            return plot_categorized_scatter(df, col1, col2, directory, show)
+    return None
@@ -6,20 +6,104 @@
 - Глинник Егор
 """
 
+import queue
+import threading
 from tkinter import Tk, LEFT, RIGHT, BOTTOM, NORMAL, DISABLED
 from tkinter import ttk
 from ttkbootstrap import Style
-import library.parser
-import library.graph_generator
-import library.user_graph
-import library.text_report_generator
 from scripts.config import read_config, change_theme, change_font
 
 
+# Фоновый поток текущего поиска
+worker = None
+# Интервал опроса очереди сообщений фонового потока, в миллисекундах
+POLL_INTERVAL = 100
+# Задержка перед фоновой загрузкой модулей анализа после показа окна, в миллисекундах
+PREWARM_DELAY = 200
+
+# Модули анализа данных (pandas, matplotlib, seaborn, openpyxl) загружаются
+# не при запуске, а в фоне после показа окна или при первом поиске
+modules_loaded = False
+modules_lock = threading.Lock()
+
+
+def load_modules():
+    """
+    Загружает модули сбора и анализа данных и применяет настройки кэшей.
+
+    Вызывается из фонового потока после показа окна; при поиске вызывается
+    повторно и ждет окончания загрузки, если она еще не завершена.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global library, modules_loaded
+    with modules_lock:
+        if modules_loaded:
+            return
+        import library.search_worker
+        import library.graph_generator
+        import library.user_graph
+        import library.text_report_generator
+        import library.http_cache
+        import library.chart_cache
+        import library.chart_data
+        import library.chart_panel
+        import library.hh_client
+        import library.details
+
+        library.hh_client.configure(
+            rate=config.getfloat('Client', 'rate', fallback=None),
+            burst=config.getint('Client', 'burst', fallback=None),
+            max_concurrency=config.getint('Client', 'max_concurrency', fallback=None),
+            connect_timeout=config.getfloat('Client', 'connect_timeout', fallback=None),
+            read_timeout=config.getfloat('Client', 'read_timeout', fallback=None),
+            max_retries=config.getint('Client', 'max_retries', fallback=None)
+        )
+        library.http_cache.configure(
+            ttl=config.getint('Cache', 'ttl', fallback=3600),
+            max_size=config.getint('Cache', 'max_size_mb', fallback=50) * 1024 * 1024
+        )
+        library.details.configure(
+            ttl=config.getint('Cache', 'details_ttl', fallback=7 * 24 * 3600),
+            max_size=config.getint('Cache', 'details_max_size_mb', fallback=100) * 1024 * 1024
+        )
+        library.chart_cache.configure(
+            max_size=config.getint('Charts', 'cache_size_mb', fallback=100) * 1024 * 1024
+        )
+        if config.has_option('Charts', 'salary_bins'):
+            library.chart_data.configure(
+                salary_edges=library.chart_data.parse_edges(config.get('Charts', 'salary_bins'))
+            )
+        modules_loaded = True
+
+
+def prewarm_modules():
+    """
+    Запускает загрузку модулей анализа данных в фоновом потоке.
+
+    Входные данные:
+    -
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    threading.Thread(target=load_modules, daemon=True).start()
+
+
 def search():
     """
-    Сообщает об обработке запроса, обновляет интерфейс и вызывает
-    функцию для сбора данных
+    Сообщает об обработке запроса, блокирует кнопки результатов и запускает
+    поиск в фоновом потоке
 
     Входные данные:
     -
@@ -30,19 +114,35 @@ def search():
     Автор:
     Глинник Егор
     """
+    global worker
+    if not modules_loaded:
+        final_label.configure(text="Загрузка модулей...", bootstyle="info")
+        root.update_idletasks()
+        load_modules()
+    target_count = config.getint('Search', 'count', fallback=100)
+    worker = library.search_worker.SearchWorker(
+        query_entry.get(), city_entry.get(),
+        target_count=target_count,
+        per_page=config.getint('Search', 'per_page', fallback=100),
+        max_depth=config.getint('Search', 'max_depth', fallback=2000),
+        incremental=config.getboolean('Search', 'incremental', fallback=False),
+        enrich=config.getboolean('Search', 'enrich', fallback=False)
+    )
     final_label.configure(text="Ваш запрос обрабатывается...", bootstyle="info")
-    root.update_idletasks()  # обновить интерфейс
-    root.after(50, lambda: pars(query_entry.get(), city_entry.get()))
+    progress_bar.configure(maximum=target_count, value=0)
+    set_results_state(DISABLED)
+    search_button.configure(state=DISABLED)
+    cancel_button.configure(state=NORMAL)
+    worker.start()
+    root.after(POLL_INTERVAL, poll_worker, worker)
 
 
-def pars(query, city):
+def cancel_search():
     """
-    Обрабатывает запрос пользователя, вызывает функцию, собирающую данные о вакансиях.
-    Включает кнопки.
+    Отменяет текущий поиск.
 
     Входные данные:
-    - query: Строка с запросом пользователя.
-    - city: Строка с названием города.
+    -
 
     Выходные данные:
     -
@@ -50,35 +150,227 @@ def pars(query, city):
     Автор:
     - Глинник Егор
     """
-    grades, posts = library.parser.main(query, city)
-    df = library.graph_generator.main()
+    if worker is not None:
+        worker.cancel()
+        cancel_button.configure(state=DISABLED)
+        final_label.configure(text="Отмена поиска...", bootstyle="warning")
 
-    # Выдача команд для кнопок Графики
-    salary_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_salary_vs_vacancies_plot(df),
-        state=NORMAL
-    )
-    experience_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_experience_vs_vacancies_plot(df),
-        state=NORMAL
-    )
-    employment_type_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_employment_type_vs_vacancies_plot(df),
-        state=NORMAL
-    )
-    requirements_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_requirements_vs_vacancies_plot(
-            df, query.lower()
-        ), state=NORMAL
-    )
-    level_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_level_vs_vacancies_plot(grades),
-        state=NORMAL
-    )
-    specialty_vs_vacancies_button.configure(
-        command=lambda: library.graph_generator.create_specialty_vs_vacancies_plot(posts),
-        state=NORMAL
+
+def poll_worker(current):
+    """
+    Читает сообщения фонового потока и обновляет статус и индикатор выполнения.
+
+    Входные данные:
+    - current: Объект SearchWorker, сообщения которого обрабатываются.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    while True:
+        try:
+            message = current.messages.get_nowait()
+        except queue.Empty:
+            break
+
+        if message["type"] == "progress":
+            if message["rows"]:
+                progress_bar.configure(value=message["rows"])
+            final_label.configure(
+                text=f"{message['stage']}: страниц - {message['pages']}, "
+                     f"вакансий - {message['rows']}",
+                bootstyle="info"
+            )
+            continue
+
+        search_button.configure(state=NORMAL)
+        cancel_button.configure(state=DISABLED)
+        if message["type"] == "done":
+            pars(current.query, current.city, message["grades"], message["posts"], message["df"])
+        else:
+            if message["type"] == "cancelled":
+                final_label.configure(text="Поиск отменен", bootstyle="warning")
+            else:
+                final_label.configure(text=f"Ошибка: {message['message']}", bootstyle="danger")
+            # Сохраненные ранее данные не изменились
+            if results_ready:
+                set_results_state(NORMAL)
+        return
+
+    root.after(POLL_INTERVAL, poll_worker, current)
+
+
+def set_results_state(state):
+    """
+    Включает или выключает кнопки графиков и текстовых отчётов.
+
+    Входные данные:
+    - state: NORMAL или DISABLED.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global results_state
+    results_state = state
+    for button in result_buttons.values():
+        button.configure(state=state)
+
+
+def add_result_button(frame, name, text):
+    """
+    Создает кнопку результата с текущей командой и состоянием.
+
+    Входные данные:
+    - frame: Фрейм, в котором размещается кнопка.
+    - name: Имя кнопки в словарях result_buttons и result_commands.
+    - text: Надпись на кнопке.
+
+    Выходные данные:
+    - button: Созданная кнопка.
+
+    Автор:
+    - Глинник Егор
+    """
+    button = ttk.Button(frame, text=text, state=results_state)
+    if name in result_commands:
+        button.configure(command=result_commands[name])
+    button.pack(side=LEFT, padx=5, pady=5)
+    result_buttons[name] = button
+    return button
+
+
+def chart_panel(tab):
+    """
+    Возвращает панель графика вкладки, создавая ее при первом показе графика.
+
+    Панель создается не вместе с вкладкой, а при первом графике, чтобы
+    matplotlib не загружался при запуске приложения.
+
+    Входные данные:
+    - tab: Имя вкладки в словаре chart_frames.
+
+    Выходные данные:
+    - panel: Объект library.chart_panel.ChartPanel.
+
+    Автор:
+    - Глинник Егор
+    """
+    panel = chart_panels.get(tab)
+    if panel is None:
+        panel = library.chart_panel.ChartPanel(chart_frames[tab])
+        chart_panels[tab] = panel
+    return panel
+
+
+def show_chart(tab, key, prepare, style=None):
+    """
+    Показывает график на панели вкладки вместо предыдущего.
+
+    Данные графика агрегируются один раз для каждого результата поиска.
+    Готовое изображение графика хранится в кэше графиков (library.chart_cache)
+    по данным графика и размеру панели, поэтому повторный показ графика
+    (в том числе после перезапуска приложения) не строит его заново.
+
+    Входные данные:
+    - tab: Имя вкладки в словаре chart_frames.
+    - key: Ключ графика (название и параметры).
+    - prepare: Функция без аргументов, возвращающая пару (функция draw_*,
+      кортеж ее аргументов) или None, если график не строится.
+    - style: Оформление графика (см. ChartPanel.show).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    if key not in chart_args:
+        chart_args[key] = prepare()
+    if chart_args[key] is None:
+        final_label.configure(text="Для выбранных столбцов график не строится",
+                              bootstyle="warning")
+        return
+    draw, args = chart_args[key]
+    panel = chart_panel(tab)
+    cache_key = library.chart_cache.make_key(
+        "panel", panel.size, draw.__module__, draw.__name__, *args
     )
+    panel.show(key, draw, *args, style=style, cache_key=cache_key)
+
+
+def show_user_graph(df, col1, col2, plot_type):
+    """
+    Показывает пользовательский график на панели вкладки Пользовательские графики.
+
+    Входные данные:
+    - df: Таблица вакансий.
+    - col1, col2: Названия выбранных столбцов.
+    - plot_type: Тип графика (ключ library.user_graph.PLOT_TYPES).
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    def prepare():
+        task = library.user_graph.chart_task(df, col1, col2, plot_type)
+        return None if task is None else task[:2]
+
+    show_chart("user_graph", ("user_graph", col1, col2, plot_type), prepare,
+               library.user_graph.STYLE)
+
+
+def pars(query, city, grades, posts, df):
+    """
+    Выдает кнопкам команды для построения графиков и отчётов по результатам
+    поиска и включает кнопки. Вызывается после сохранения данных.
+    Кнопки вкладок, которые еще не открывались, получат команды при создании.
+
+    Входные данные:
+    - query: Строка с запросом пользователя.
+    - city: Строка с названием города.
+    - grades: Список с количеством вакансий по уровням.
+    - posts: Список с количеством вакансий по специальностям.
+    - df: Таблица вакансий.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global results_ready, user_graph_columns
+    results_ready = True
+
+    # Графики прежнего поиска больше не нужны
+    chart_args.clear()
+    for panel in chart_panels.values():
+        panel.clear()
+
+    # Команды для кнопок Графики: графики показываются на панели вкладки
+    graphs = library.graph_generator
+    charts = {
+        "salary": (graphs.draw_salary, lambda: graphs.aggregate_salary(df)),
+        "experience": (graphs.draw_experience, lambda: graphs.aggregate_experience(df)),
+        "employment_type":
+            (graphs.draw_employment_type, lambda: graphs.aggregate_employment_type(df)),
+        "requirements":
+            (graphs.draw_requirements, lambda: graphs.aggregate_requirements(df, query.lower())),
+        "level": (graphs.draw_levels, lambda: graphs.aggregate_levels(grades)),
+        "specialty": (graphs.draw_specialties, lambda: graphs.aggregate_specialties(posts)),
+    }
+    result_commands.update({
+        name: lambda name=name, draw=draw, aggregate=aggregate: show_chart(
+            "graphs", name, lambda: (draw, (aggregate(),))
+        )
+        for name, (draw, aggregate) in charts.items()
+    })
 
     # Изменение выпадающих списков Пользовательские графики
     user_graph_columns = [
@@ -87,34 +379,191 @@ def pars(query, city):
         ]
     if city == "":
         user_graph_columns.insert(0, "Город")
-    user_col1_combobox.configure(values=user_graph_columns)
-
-    # Выдача команд для кнопки Пользовательские графики
-    user_graph_button.configure(
-        command=lambda: library.user_graph.main(
-            user_col1_combobox.get(),
-            user_col2_combobox.get(),
-            user_type_combobox.get()
-        ), state=NORMAL
+    if "user_col1_combobox" in widgets:
+        widgets["user_col1_combobox"].configure(values=user_graph_columns)
+
+    # Команда для кнопки Пользовательские графики
+    result_commands["user_graph"] = lambda: show_user_graph(
+        df,
+        widgets["user_col1_combobox"].get(),
+        widgets["user_col2_combobox"].get(),
+        widgets["user_type_combobox"].get()
+    )
+
+    # Команды для кнопок Текстовые отчёты
+    sample = config.getfloat('Reports', 'sample', fallback=1.0)
+    vacancy_report_options = {
+        "fmt": config.get('Reports', 'format', fallback='pretty'),
+        "limit": config.getint('Reports', 'max_rows', fallback=0) or None,
+        "sample": sample if sample < 1 else None,
+    }
+    result_commands.update({
+        "text_report1": lambda: library.text_report_generator.generate_vacancy_reports(
+            **vacancy_report_options
+        ),
+        "text_report2": library.text_report_generator.generate_pivot_table_report,
+        "text_report3": library.text_report_generator.generate_statistical_report,
+        "text_report4": lambda: library.text_report_generator.generate_history_report(
+            query=query
+        ),
+    })
+
+    for name, button in result_buttons.items():
+        button.configure(command=result_commands[name])
+    set_results_state(NORMAL)
+
+    # Обновление надписи Статус
+    final_label.configure(text="Готово!", bootstyle="success")
+
+
+def build_graphs_tab(frame):
+    """
+    Создает содержимое вкладки Графики.
+
+    Входные данные:
+    - frame: Фрейм вкладки.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    graphs_label = ttk.Label(frame, text="Графики", bootstyle="primary", font=font)
+    graphs_label.pack(pady=10)
+    widgets["graphs_label"] = graphs_label
+
+    # Фрейм для кнопок графиков (внутри фрейма графиков)
+    buttons_frame = ttk.Frame(frame)
+    buttons_frame.pack(pady=10)
+
+    add_result_button(buttons_frame, "salary", "Зарплата")
+    add_result_button(buttons_frame, "experience", "Опыт")
+    add_result_button(buttons_frame, "employment_type", "Тип занятости")
+    add_result_button(buttons_frame, "requirements", "Требования")
+    add_result_button(buttons_frame, "level", "Уровень")
+    add_result_button(buttons_frame, "specialty", "Специальность")
+
+    # Место для панели графика (создается при первом показе графика)
+    chart_frames["graphs"] = ttk.Frame(frame)
+    chart_frames["graphs"].pack(fill="both", expand=True)
+
+
+def build_user_graph_tab(frame):
+    """
+    Создает содержимое вкладки Пользовательские графики.
+
+    Входные данные:
+    - frame: Фрейм вкладки.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    user_graph_label = ttk.Label(
+        frame, text="Пользовательские графики", bootstyle="primary", font=font
     )
+    user_graph_label.pack(pady=5)
+    widgets["user_graph_label"] = user_graph_label
 
-    # Выдача команд для кнопок Текстовые отчёты
-    text_report1_button.configure(
-        command=library.text_report_generator.generate_vacancy_reports,
-        state=NORMAL
+    # Фрейм для выпадающих списков (внутри фрейма пользовательских графиков)
+    user_graph_combobox_frame = ttk.Frame(frame)
+    user_graph_combobox_frame.pack(pady=10)
+
+    user_col1_combobox = ttk.Combobox(
+        user_graph_combobox_frame, values=user_graph_columns, font=font
     )
-    text_report2_button.configure(
-        command=library.text_report_generator.generate_pivot_table_report,
-        state=NORMAL
+    user_col1_combobox.pack(side=LEFT, padx=5, pady=5)
+    widgets["user_col1_combobox"] = user_col1_combobox
+
+    user_col2_combobox = ttk.Combobox(
+        user_graph_combobox_frame, values=user_graph_columns, font=font
     )
-    text_report3_button.configure(
-        command=library.text_report_generator.generate_statistical_report,
-        state=NORMAL
+    user_col2_combobox.pack(side=LEFT, padx=5, pady=5)
+    widgets["user_col2_combobox"] = user_col2_combobox
+
+    user_type_combobox = ttk.Combobox(
+        user_graph_combobox_frame, values=[
+            "Столбчатая диаграмма", "Категоризированная гистограмма",
+            "Диаграмма Бокса-Вискера", "Диаграмма рассеивания"
+        ], font=font
     )
+    user_type_combobox.pack(side=LEFT, padx=5, pady=5)
+    widgets["user_type_combobox"] = user_type_combobox
 
-    # Обновление надписи Статус
-    final_label.configure(text="Готово!", bootstyle="success")
+    add_result_button(user_graph_combobox_frame, "user_graph", "Построить")
 
+    # Место для панели графика (создается при первом показе графика)
+    chart_frames["user_graph"] = ttk.Frame(frame)
+    chart_frames["user_graph"].pack(fill="both", expand=True)
+
+
+def build_text_report_tab(frame):
+    """
+    Создает содержимое вкладки Текстовые отчёты.
+
+    Входные данные:
+    - frame: Фрейм вкладки.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    text_report_label = ttk.Label(
+        frame, text="Текстовые отчёты", bootstyle="primary", font=font
+    )
+    text_report_label.pack(pady=5)
+    widgets["text_report_label"] = text_report_label
+
+    # Фрейм для кнопок текстовых отчётов (внутри фрейма текстовых отчётов)
+    text_report_buttons_frame = ttk.Frame(frame)
+    text_report_buttons_frame.pack(pady=10)
+
+    add_result_button(text_report_buttons_frame, "text_report1", "Простой текстовый отчёт")
+    add_result_button(text_report_buttons_frame, "text_report2", "Сводная таблица")
+    add_result_button(text_report_buttons_frame, "text_report3", "Статистический отчёт")
+    add_result_button(text_report_buttons_frame, "text_report4", "История поисков")
+
+
+def build_selected_tab(event=None):
+    """
+    Создает содержимое выбранной вкладки при первом открытии.
+
+    Входные данные:
+    - event: Событие <<NotebookTabChanged>>.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    frame = root.nametowidget(notebook.select())
+    build = tab_builders.pop(frame, None)
+    if build is not None:
+        build(frame)
+
+
+def set_font(family):
+    """
+    Изменяет шрифт интерфейса, в том числе для вкладок, которые будут созданы позже.
+
+    Входные данные:
+    - family: Строка, название шрифта.
+
+    Выходные данные:
+    -
+
+    Автор:
+    - Глинник Егор
+    """
+    global font
+    font = (family, 14)
+    change_font(root, 14, family, widgets)
 
 
 # Считывание данных их config.ini
@@ -156,65 +605,50 @@ city_entry = ttk.Entry(city_frame, font=font)
 city_entry.pack(side=LEFT, fill="x", expand=True, padx=5)
 
 
-# Кнопка поиска
-search_button = ttk.Button(root, text="Поиск", command=search, style='primary.TButton')
-search_button.pack(pady=20)
+# Кнопки поиска и отмены
+search_buttons_frame = ttk.Frame(root)
+search_buttons_frame.pack(pady=20)
+
+search_button = ttk.Button(
+    search_buttons_frame, text="Поиск", command=search, style='primary.TButton'
+)
+search_button.pack(side=LEFT, padx=5)
+
+cancel_button = ttk.Button(
+    search_buttons_frame, text="Отмена", command=cancel_search,
+    style='secondary.TButton', state=DISABLED
+)
+cancel_button.pack(side=LEFT, padx=5)
 
 
-# Надпись статуса
+# Надпись статуса и индикатор выполнения
 final_label = ttk.Label(root, text="", font=font)
 final_label.pack(pady=10)
 
+progress_bar = ttk.Progressbar(root, mode="determinate", bootstyle="info")
+progress_bar.pack(padx=10, fill="x")
+
 
 # Виджет Notebook для вкладок
 notebook = ttk.Notebook(root)
 notebook.pack(pady=10, padx=10, fill="both", expand=True)
 
-
-# Фрейм для графиков
+# Содержимое вкладок создается при первом открытии вкладки
 graphs_frame = ttk.Frame(notebook)
 notebook.add(graphs_frame, text="Графики")
 
-graphs_label = ttk.Label(graphs_frame, text="Графики", bootstyle="primary", font=font)
-graphs_label.pack(pady=10)
-
-# Фрейм для кнопок графиков (внутри фрейма графиков)
-buttons_frame = ttk.Frame(graphs_frame)
-buttons_frame.pack(pady=10)
-
-salary_vs_vacancies_button = ttk.Button(buttons_frame, text="Зарплата", state=DISABLED)
-salary_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-experience_vs_vacancies_button = ttk.Button(buttons_frame, text="Опыт", state=DISABLED)
-experience_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-employment_type_vs_vacancies_button = ttk.Button(
-    buttons_frame, text="Тип занятости", state=DISABLED
-)
-employment_type_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-requirements_vs_vacancies_button = ttk.Button(buttons_frame, text="Требования", state=DISABLED)
-requirements_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-level_vs_vacancies_button = ttk.Button(buttons_frame, text="Уровень", state=DISABLED)
-level_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-specialty_vs_vacancies_button = ttk.Button(buttons_frame, text="Специальность", state=DISABLED)
-specialty_vs_vacancies_button.pack(side=LEFT, padx=5, pady=5)
-
-
-# Фрейм пользовательских графиков
 user_graph_frame = ttk.Frame(notebook)
 notebook.add(user_graph_frame, text="Пользовательские графики")
 
-user_graph_label = ttk.Label(
-    user_graph_frame, text="Пользовательские графики", bootstyle="primary", font=font
-)
-user_graph_label.pack(pady=5)
+text_report_frame = ttk.Frame(notebook)
+notebook.add(text_report_frame, text="Текстовые отчёты")
 
-# Фрейм для выпадающих списков (внутри фрейма пользовательских графиков)
-user_graph_combobox_frame = ttk.Frame(user_graph_frame)
-user_graph_combobox_frame.pack(pady=10)
+tab_builders = {
+    graphs_frame: build_graphs_tab,
+    user_graph_frame: build_user_graph_tab,
+    text_report_frame: build_text_report_tab,
+}
+notebook.bind("<<NotebookTabChanged>>", build_selected_tab)
 
 # Список хранит пункты выпадающих списков
 user_graph_columns = [
@@ -222,49 +656,18 @@ user_graph_columns = [
     "Наличие теста для кандидатов", "График работы"
 ]
 
-user_col1_combobox = ttk.Combobox(user_graph_combobox_frame, values=user_graph_columns, font=font)
-user_col1_combobox.pack(side=LEFT, padx=5, pady=5)
-
-user_col2_combobox = ttk.Combobox(user_graph_combobox_frame, values=user_graph_columns, font=font)
-user_col2_combobox.pack(side=LEFT, padx=5, pady=5)
+# Кнопки, которые включаются только после сохранения результатов поиска:
+# созданные кнопки и команды для них (в том числе для еще не созданных)
+result_buttons = {}
+result_commands = {}
+results_state = DISABLED
+results_ready = False
 
-user_type_combobox = ttk.Combobox(
-    user_graph_combobox_frame, values=[
-        "Столбчатая диаграмма", "Категоризированная гистограмма",
-        "Диаграмма Бокса-Вискера", "Диаграмма рассеивания"
-    ], font=font
-)
-user_type_combobox.pack(side=LEFT, padx=5, pady=5)
-
-user_graph_button = ttk.Button(user_graph_combobox_frame, text="Построить", state=DISABLED)
-user_graph_button.pack(side=LEFT, padx=5, pady=5)
-
-
-# Фрейм текстовых отчётов
-text_report_frame = ttk.Frame(notebook)
-notebook.add(text_report_frame, text="Текстовые отчёты")
-
-text_report_label = ttk.Label(
-    text_report_frame, text="Текстовые отчёты", bootstyle="primary", font=font
-)
-text_report_label.pack(pady=5)
-
-# Фрейм для кнопок текстовых отчётов (внутри фрейма текстовых отчётов)
-text_report_buttons_frame = ttk.Frame(text_report_frame)
-text_report_buttons_frame.pack(pady=10)
-
-text_report1_button = ttk.Button(
-    text_report_buttons_frame, text="Простой текстовый отчёт", state=DISABLED
-)
-text_report1_button.pack(side=LEFT, padx=5, pady=5)
-
-text_report2_button = ttk.Button(text_report_buttons_frame, text="Сводная таблица", state=DISABLED)
-text_report2_button.pack(side=LEFT, padx=5, pady=5)
-
-text_report3_button = ttk.Button(
-    text_report_buttons_frame, text="Статистический отчёт", state=DISABLED
-)
-text_report3_button.pack(side=LEFT, padx=5, pady=5)
+# Панели графиков вкладок (одна фигура на вкладку), фреймы для них
+# и агрегированные данные показанных графиков текущего результата поиска
+chart_panels = {}
+chart_frames = {}
+chart_args = {}
 
 
 # Кнопки для изменения стиля интерфейса
@@ -296,6 +699,7 @@ theme4_button = ttk.Button(
 theme4_button.pack(side=LEFT, padx=5)
 
 # Словарь хранит виджеты, в которых меняется шрифт
+# (виджеты вкладок добавляются при создании вкладок)
 widgets = {
     "head_label": head_label,
     "query_label": query_label,
@@ -303,25 +707,21 @@ widgets = {
     "city_label": city_label,
     "city_entry": city_entry,
     "final_label": final_label,
-    "graphs_label": graphs_label,
-    "user_graph_label": user_graph_label,
-    "user_col1_combobox": user_col1_combobox,
-    "user_col2_combobox": user_col2_combobox,
-    "user_type_combobox": user_type_combobox,
-    "text_report_label": text_report_label,
 }
 
 font1_button = ttk.Button(
     theme_buttons_frame, text="Arial",
-    command=lambda: change_font(root, 14, "Arial", widgets)
+    command=lambda: set_font("Arial")
 )
 font1_button.pack(side=RIGHT, padx=5)
 
 font2_button = ttk.Button(
     theme_buttons_frame, text="Times New Roman",
-    command=lambda: change_font(root, 14, "Times New Roman", widgets)
+    command=lambda: set_font("Times New Roman")
 )
 font2_button.pack(side=RIGHT, padx=5)
 
 
+build_selected_tab()
+root.after(PREWARM_DELAY, prewarm_modules)
 root.mainloop()
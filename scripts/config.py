@@ -7,9 +7,7 @@
 Функции:
 - read_config(filename): Считывает конфигурационный файл и возвращает объект ConfigParser.
 - change_theme(root, style, theme): Изменяет тему интерфейса программы.
-- change_font(root, size, family, head_label, query_label, query_entry, city_label, city_entry,
-        final_label, user_graph_label, user_col1_combobox, user_col2_combobox, user_type_combobox,
-        text_report_label): Изменяет шрифт для различных элементов интерфейса.
+- change_font(root, size, family, widgets): Изменяет шрифт для различных элементов интерфейса.
 """
 
 import configparser
@@ -61,17 +59,12 @@ def change_font(root, size: int, family: str, widgets: dict):
     - root: Объект корневого окна Tkinter.
     - size: Целое число, размер шрифта.
     - family: Строка, название шрифта.
-    - head_label: Объект метки заголовка.
-    - query_label: Объект метки для запроса.
-    - query_entry: Объект поля ввода для запроса.
-    - city_label: Объект метки для города.
-    - city_entry: Объект поля ввода для города.
-    - final_label: Объект метки для отображения завершения операции.
-    - user_graph_label: Объект метки для пользовательского графика.
-    - user_col1_combobox: Объект выпадающего списка для выбора колонки 1.
-    - user_col2_combobox: Объект выпадающего списка для выбора колонки 2.
-    - user_type_combobox: Объект выпадающего списка для выбора типа графика.
-    - text_report_label: Объект метки для текстовых отчетов.
+    - widgets: Словарь виджетов, в которых меняется шрифт. Может содержать
+      не все виджеты: вкладки создаются при первом открытии, и их виджеты
+      попадают в словарь только после этого. Возможные ключи:
+      head_label (шрифт заголовка крупнее на 16), query_label, query_entry,
+      city_label, city_entry, final_label, graphs_label, user_graph_label,
+      user_col1_combobox, user_col2_combobox, user_type_combobox, text_report_label.
 
     Выходные данные:
     -
@@ -84,18 +77,11 @@ def change_font(root, size: int, family: str, widgets: dict):
     """
     font = (family, size)
 
-    widgets["head_label"].configure(font=(family, size + 16))
-    widgets["query_label"].configure(font=font)
-    widgets["query_entry"].configure(font=font)
-    widgets["city_label"].configure(font=font)
-    widgets["city_entry"].configure(font=font)
-    widgets["final_label"].configure(font=font)
-    widgets["graphs_label"].configure(font=font)
-    widgets["user_graph_label"].configure(font=font)
-    widgets["user_col1_combobox"].configure(font=font)
-    widgets["user_col2_combobox"].configure(font=font)
-    widgets["user_type_combobox"].configure(font=font)
-    widgets["text_report_label"].configure(font=font)
+    for name, widget in widgets.items():
+        if name == "head_label":
+            widget.configure(font=(family, size + 16))
+        else:
+            widget.configure(font=font)
 
     root.update_idletasks()
     root.update()
@@ -0,0 +1,74 @@
+"""
+Проверки поиска ключевых слов library.keyword_matcher по сравнению
+с поиском подстрок без учета регистра.
+
+Автор:
+- Елисеев Иван
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from library import keyword_matcher
+
+
+KEYWORDS = ['Java', 'JavaScript', 'SQL', 'PostgreSQL', 'C++', 'C#', 'Go', 'a.b', '1С', 'sql']
+
+TEXTS = [
+    'Опыт разработки на Java и JavaScript',
+    'Знание PostgreSQL, умение писать SQL-запросы',
+    'C++ или C#, желателен опыт с Go',
+    'Требуется axb, а не a.b',
+    'Программист 1С',
+    None,
+    float('nan'),
+    '',
+    'javascript only',
+    'JAVA' * 3,
+]
+
+
+def _naive_counts(texts, keywords):
+    return {keyword: sum(isinstance(text, str) and keyword.lower() in text.lower()
+                         for text in texts)
+            for keyword in keywords}
+
+
+def test_counts_match_substring_search():
+    assert keyword_matcher.keyword_counts(TEXTS, KEYWORDS) == _naive_counts(TEXTS, KEYWORDS)
+
+
+def test_counts_match_substring_search_on_random_texts():
+    rng = np.random.default_rng(0)
+    alphabet = list('abcjavsqlgo+# ')
+    texts = [''.join(rng.choice(alphabet, rng.integers(0, 40))) for _ in range(500)]
+    keywords = ['java', 'ja', 'a', 'sql', 'sq', 'go', 'c++', 'c#', 'av', 'va']
+    assert keyword_matcher.keyword_counts(texts, keywords) == _naive_counts(texts, keywords)
+
+
+def test_empty_keywords_are_never_found():
+    counts = keyword_matcher.keyword_counts(TEXTS, ['', 'sql', ''])
+    assert counts[''] == 0
+    assert counts['sql'] == _naive_counts(TEXTS, ['sql'])['sql']
+
+
+def test_matrix_matches_counts():
+    texts = pd.Series(TEXTS, index=range(100, 100 + len(TEXTS)))
+    matrix = keyword_matcher.keyword_matrix(texts, KEYWORDS)
+    assert list(matrix.index) == list(texts.index)
+    assert list(matrix.columns) == KEYWORDS
+    for keyword in KEYWORDS:
+        column = matrix[keyword].sparse.to_dense()
+        expected = [int(isinstance(text, str) and keyword.lower() in text.lower())
+                    for text in TEXTS]
+        assert column.tolist() == expected
+
+
+@pytest.mark.parametrize('text, found', [
+    ('JavaScript', {'Java', 'JavaScript'}),
+    ('postgresql', {'PostgreSQL', 'SQL', 'sql'}),
+    ('нет совпадений', set()),
+])
+def test_find_keywords_reports_overlapping_matches(text, found):
+    compiled = keyword_matcher.compile_keywords(tuple(KEYWORDS))
+    assert {KEYWORDS[i] for i in keyword_matcher.find_keywords(text, compiled)} == found
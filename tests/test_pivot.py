@@ -0,0 +1,70 @@
+"""
+Проверки сводных таблиц library.pivot по сравнению с pandas.crosstab.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from library import pivot
+
+
+PAIRS = [('Город', 'Опыт работы'), ('Город', 'Тип занятости'), ('Опыт работы', 'Тип занятости')]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    size = 2000
+    frame = pd.DataFrame({
+        'Город': rng.choice(['Москва', 'Санкт-Петербург', 'Казань', 'Томск', 'Омск'], size,
+                            p=[0.5, 0.2, 0.15, 0.1, 0.05]),
+        'Опыт работы': rng.choice(['Нет опыта', 'От 1 года до 3 лет', 'Более 6 лет'], size),
+        'Тип занятости': rng.choice(['Полная занятость', 'Частичная занятость'], size),
+    })
+    frame.loc[rng.random(size) < 0.05, 'Опыт работы'] = None
+    return frame
+
+
+def _crosstab(frame, pair):
+    row, col = pair
+    table = pd.crosstab(frame[row], frame[col])
+    table = table.loc[:, sorted(table.columns)]
+    table[pivot.TOTAL_LABEL] = table.sum(axis=1)
+    order = sorted(table.index, key=lambda label: (-table.loc[label, pivot.TOTAL_LABEL], label))
+    return table.loc[order]
+
+
+def _counted(frame, size):
+    batches = (frame.iloc[start:start + size] for start in range(0, len(frame), size))
+    return pivot.count_pairs(batches, PAIRS)
+
+
+@pytest.mark.parametrize('size', [7, 333, 5000])
+@pytest.mark.parametrize('pair', PAIRS)
+def test_table_matches_crosstab(frame, pair, size):
+    result = _counted(frame, size).table(pair).set_index(pair[0])
+    expected = _crosstab(frame, pair)
+    assert list(result.index) == list(expected.index)
+    assert list(result.columns) == list(expected.columns)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+
+def test_top_n_merges_other_rows(frame):
+    pair = PAIRS[0]
+    result = _counted(frame, 500).table(pair, top_n=2)
+    expected = _crosstab(frame, pair)
+    assert list(result[pair[0]]) == list(expected.index[:2]) + [pivot.OTHER_LABEL]
+    other = result.iloc[-1, 1:].to_numpy()
+    np.testing.assert_array_equal(other, expected.iloc[2:].sum().to_numpy())
+    # Строки с пропуском в столбце пары не учитываются
+    assert result[pivot.TOTAL_LABEL].sum() == frame[list(pair)].notna().all(axis=1).sum()
+
+
+def test_empty_counter():
+    counter = pivot.count_pairs([], PAIRS)
+    table = counter.table(PAIRS[0])
+    assert table.empty
+    assert list(table.columns) == [PAIRS[0][0], pivot.TOTAL_LABEL]
@@ -0,0 +1,89 @@
+"""
+Проверки потоковой записи таблиц library.report_writer: таблицы,
+записанные в файл, читаются обратно без потери значений.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import csv
+import io
+import pandas as pd
+import pytest
+from library import report_writer
+
+
+COLUMNS = ['Название', 'Зарплата', 'Требования']
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'Название': ['Python-разработчик', 'Аналитик | BI', 'Тестировщик', 'DevOps'],
+        'Зарплата': [150000.0, None, 90000.5, 210000.0],
+        'Требования': ['SQL, pandas', 'Excel\nPower BI', 'a|b|c', None],
+    })
+
+
+def _expected(frame):
+    return [report_writer._strings(frame[column]) for column in COLUMNS]
+
+
+def _write(source, **options):
+    f = io.StringIO()
+    count = report_writer.write_table(f, source, COLUMNS, **options)
+    return count, f.getvalue()
+
+
+def _split_markdown(line):
+    # Разбиение строки таблицы Markdown по неэкранированным символам |
+    cells, cell, chars = [], '', iter(line.strip()[1:-1])
+    for char in chars:
+        if char == '\\':
+            cell += next(chars)
+        elif char == '|':
+            cells.append(cell.strip())
+            cell = ''
+        else:
+            cell += char
+    return cells + [cell.strip()]
+
+
+@pytest.mark.parametrize('fmt, delimiter', [('csv', ','), ('tsv', '\t')])
+def test_delimited_round_trip(frame, fmt, delimiter):
+    count, text = _write(frame, fmt=fmt, show_index=False)
+    rows = list(csv.reader(io.StringIO(text), delimiter=delimiter))
+    assert count == len(frame)
+    assert rows[0] == COLUMNS
+    assert [list(column) for column in zip(*rows[1:])] == _expected(frame)
+
+
+def test_markdown_round_trip(frame):
+    count, text = _write(frame, fmt='markdown', show_index=False, chunk_size=3)
+    lines = text.splitlines()
+    assert count == len(frame)
+    assert _split_markdown(lines[0]) == COLUMNS
+    assert set(lines[1]) == {'|', '-'}
+    rows = [_split_markdown(line) for line in lines[2:]]
+    assert [list(column) for column in zip(*rows)] == _expected(frame)
+    # Все строки таблицы выровнены по одной ширине
+    assert len({len(line) for line in lines}) == 1
+
+
+@pytest.mark.parametrize('fmt', ['pretty', 'fixed', 'markdown'])
+def test_batches_give_same_text_as_frame(frame, fmt):
+    def batches():
+        yield frame.iloc[:3]
+        yield frame.iloc[3:]
+
+    assert _write(batches, fmt=fmt) == _write(frame.reset_index(drop=True), fmt=fmt)
+
+
+def test_limit_and_sample(frame):
+    count, text = _write(frame, fmt='csv', limit=2, show_index=False)
+    assert count == 2
+    assert len(text.splitlines()) == 3
+    sampled = _write(frame, fmt='csv', sample=0.5, seed=3)
+    assert _write(frame, fmt='csv', sample=0.5, seed=3) == sampled
+    with pytest.raises(ValueError):
+        _write(frame, fmt='html')
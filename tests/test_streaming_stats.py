@@ -0,0 +1,110 @@
+"""
+Проверки накопителей статистики library.streaming_stats по сравнению
+с расчетом numpy/pandas по всем данным сразу.
+
+Автор:
+- Чибиров Руслан
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from library import streaming_stats
+
+
+def _batches(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    return np.concatenate([rng.lognormal(11, 0.6, 5000), -rng.uniform(1, 50, 100), np.zeros(50)])
+
+
+@pytest.mark.parametrize('size', [3, 1000, 10000])
+def test_running_stats_matches_numpy(values, size):
+    stats = streaming_stats.RunningStats()
+    for batch in _batches(values, size):
+        stats.update(batch)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.variance == pytest.approx(values.var(ddof=1), rel=1e-9)
+    assert stats.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_running_stats_merge_equals_single_pass(values):
+    whole = streaming_stats.RunningStats()
+    whole.update(values)
+    merged = streaming_stats.RunningStats()
+    for batch in _batches(values, 999):
+        part = streaming_stats.RunningStats()
+        part.update(batch)
+        merged.merge(part)
+    merged.merge(streaming_stats.RunningStats())
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-9)
+
+
+def test_running_stats_skips_missing_values():
+    stats = streaming_stats.RunningStats()
+    stats.update([1.0, None, 'нет', 3.0])
+    assert stats.count == 2
+    assert stats.mean == 2.0
+    assert stats.variance == pd.Series([1.0, 3.0]).var()
+    single = streaming_stats.RunningStats()
+    single.update([5])
+    assert math.isnan(single.variance)
+
+
+@pytest.mark.parametrize('q', [0.0, 0.01, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0])
+def test_quantile_sketch_relative_error(values, q):
+    sketch = streaming_stats.QuantileSketch()
+    for batch in _batches(values, 777):
+        sketch.update(batch)
+    # Оценка лежит в пределах accuracy от одного из соседних значений выборки
+    rank = q * (len(values) - 1)
+    ordered = np.sort(values)
+    expected = ordered[int(math.floor(rank))], ordered[int(math.ceil(rank))]
+    estimate = sketch.quantile(q)
+    assert any(abs(estimate - value) <= sketch.accuracy * abs(value) + 1e-12
+               for value in expected), (estimate, expected)
+
+
+def test_quantile_sketch_merge_equals_single_pass(values):
+    whole = streaming_stats.QuantileSketch()
+    whole.update(values)
+    merged = streaming_stats.QuantileSketch()
+    for batch in _batches(values, 1234):
+        part = streaming_stats.QuantileSketch()
+        part.update(batch)
+        merged.merge(part)
+    for q in (0.1, 0.5, 0.9):
+        assert merged.quantile(q) == whole.quantile(q)
+    with pytest.raises(ValueError):
+        merged.merge(streaming_stats.QuantileSketch(accuracy=0.05))
+    assert math.isnan(streaming_stats.QuantileSketch().quantile(0.5))
+
+
+def test_collect_matches_pandas():
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame({
+        'Зарплата': np.where(rng.random(3000) < 0.2, np.nan, rng.uniform(30000, 300000, 3000)),
+        'Опыт работы': rng.choice(['Нет опыта', 'От 1 года до 3 лет', 'Более 6 лет'], 3000),
+    })
+    stats = streaming_stats.collect(_batches(frame, 500), ['Зарплата'], ['Опыт работы'])
+    summary = stats.summary().loc['Зарплата']
+    salary = frame['Зарплата']
+    assert stats.rows == len(frame)
+    assert summary['count'] == salary.count()
+    assert summary['mean'] == pytest.approx(salary.mean())
+    assert summary['std'] == pytest.approx(salary.std())
+    assert summary['median'] == pytest.approx(salary.median(), rel=0.02)
+
+    table = stats.frequency_table('Опыт работы')
+    expected = frame['Опыт работы'].value_counts()
+    assert dict(zip(table['Опыт работы'], table['Частота'])) == expected.to_dict()
+    assert table['Процент'].sum() == pytest.approx(100)